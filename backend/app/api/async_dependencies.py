@@ -0,0 +1,30 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import (
+    cached_principal,
+    credentials_exception,
+    decode_token_subject,
+    oauth2_scheme,
+    remember_principal,
+)
+from app.db.async_session import get_async_db
+from app.services.async_user_service import AsyncUserService
+
+user_service = AsyncUserService()
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    user = cached_principal(token, db)
+    if user is not None:
+        return user
+
+    email, expires_at = decode_token_subject(token)
+    user = await user_service.get_user_by_email(db, email=email)
+    if not user:
+        raise credentials_exception()
+    remember_principal(token, user, expires_at)
+    return user
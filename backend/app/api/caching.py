@@ -0,0 +1,18 @@
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.catalog_version import catalog_version
+
+
+def catalog_etag(request: Request, response: Response) -> None:
+    """Tag a vehicle read with the catalog version, or answer 304 if the client has it.
+
+    Runs before the handler queries anything, so a matching If-None-Match
+    costs no database work. The tag is taken before the read; a change
+    landing in between only makes the next poll fetch again.
+    """
+    etag = catalog_version.etag()
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
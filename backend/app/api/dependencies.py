@@ -1,32 +1,64 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.principal_cache import principal_cache
 from app.core.security import decode_access_token
 from app.db.session import get_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
+PRINCIPAL_COLUMNS = ("id", "username", "email", "full_name", "hashed_password", "is_active")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
-    credentials_exception = HTTPException(
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token_subject(token: str) -> tuple[str, float | None]:
+    """Return the token's subject (email) and expiry timestamp, or raise 401."""
     try:
         payload = decode_access_token(token)
         email: str | None = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except Exception:
-        raise credentials_exception
+        raise credentials_exception()
+    if email is None:
+        raise credentials_exception()
+    return email, payload.get("exp")
+
+
+def cached_principal(token: str, db) -> User | None:
+    """Rebuild the user for a cached token inside ``db`` without querying it."""
+    snapshot = principal_cache.get(token)
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    # Mark it as an already-persisted row so the session issues UPDATEs, not INSERTs.
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
+
+def remember_principal(token: str, user: User, expires_at: float | None) -> None:
+    principal_cache.put(token, {name: getattr(user, name) for name in PRINCIPAL_COLUMNS}, expires_at)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    user = cached_principal(token, db)
+    if user is not None:
+        return user
 
+    email, expires_at = decode_token_subject(token)
     user = db.query(User).filter(User.email == email).first()
     if not user:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        raise credentials_exception()
+    remember_principal(token, user, expires_at)
+    return user
@@ -0,0 +1,43 @@
+from typing import Sequence
+
+from fastapi import HTTPException, Query, status
+
+from app.models.rental import Rental
+from app.schemas.rental import Rental as RentalSchema, RentalExpanded
+from app.services.rental_service import EXPANDABLE
+
+
+def rental_expansions(
+    expand: str | None = Query(None, description="Comma-separated related rows to embed: vehicle, user"),
+) -> tuple[str, ...]:
+    """Parse ``?expand=vehicle,user``; unknown names are a 400."""
+    if not expand:
+        return ()
+    names = tuple(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+    unknown = [name for name in names if name not in EXPANDABLE]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot expand {', '.join(unknown)}; choose from {', '.join(EXPANDABLE)}",
+        )
+    return names
+
+
+def expand_rentals(rentals: Sequence[Rental], expand: tuple[str, ...]) -> list[RentalSchema]:
+    """Serialize rentals, embedding only the relationships that were eagerly loaded.
+
+    Routes using this declare ``RentalExpanded`` with
+    ``response_model_exclude_unset``, so unexpanded rentals keep their
+    original shape. ORM objects are never handed to the response model
+    directly: it would touch every relationship and lazy-load the rows the
+    client did not ask for, one query per rental.
+    """
+    if not expand:
+        return [RentalSchema.model_validate(rental) for rental in rentals]
+    return [
+        RentalExpanded(
+            **dict(RentalSchema.model_validate(rental)),
+            **{name: getattr(rental, name) for name in expand},
+        )
+        for rental in rentals
+    ]
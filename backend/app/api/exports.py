@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Literal
+
+from app.db.session import SessionLocal
+from app.services.rental_service import RentalService
+
+ExportFormat = Literal["ndjson", "csv"]
+
+RENTAL_EXPORT_COLUMNS = ("id", "user_id", "vehicle_id", "start_time", "end_time", "total_cost")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_BATCH_SIZE = 1000
+
+rental_service = RentalService()
+
+
+def _cell(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def stream_rental_export(
+    fmt: ExportFormat,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> Iterator[str]:
+    """Encode the rental ledger batch by batch, so memory stays flat at any table size.
+
+    The generator owns its session: request-scoped sessions are closed before
+    a StreamingResponse starts sending.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(RENTAL_EXPORT_COLUMNS)
+    with SessionLocal() as db:
+        rows = rental_service.iter_rentals(
+            db, start_from=start_from, start_to=start_to, batch_size=EXPORT_BATCH_SIZE
+        )
+        for count, row in enumerate(rows, start=1):
+            values = [_cell(value) for value in row]
+            if writer is not None:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(RENTAL_EXPORT_COLUMNS, values))))
+                buffer.write("\n")
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
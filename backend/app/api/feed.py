@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+
+from app.core.catalog_version import CatalogVersion
+from app.core.config import settings
+from app.core.live_feed import FeedEvent, LiveFeed
+
+# Events written per chunk when a subscriber is catching up.
+FEED_BATCH_SIZE = 500
+FEED_RETRY_MS = 3000
+
+logger = logging.getLogger(__name__)
+
+
+def parse_event_id(feed: LiveFeed, event_id: str | None) -> int | None:
+    """Map an SSE ``Last-Event-ID`` back to a sequence; ids from another run cannot be resumed."""
+    if not event_id:
+        return None
+    epoch, _, seq = event_id.partition("-")
+    if epoch != feed.epoch or not seq.isdigit():
+        return -1
+    return int(seq)
+
+
+def _format(feed: LiveFeed, event: FeedEvent) -> str:
+    return f"id: {feed.epoch}-{event.seq}\nevent: {event.kind}\ndata: {event.data}\n\n"
+
+
+async def stream_feed(feed: LiveFeed, last_seq: int | None) -> AsyncIterator[str]:
+    """Server-Sent Events for ``feed``, starting after ``last_seq`` (or at the head).
+
+    Each wake-up drains everything published since the last write, so a busy
+    feed goes out in a few large chunks rather than one write per event. The
+    transport applies backpressure: a slow client simply stops pulling, and
+    if it falls off the end of the ring it gets a ``reset`` on its next pull.
+    """
+    feed.subscribers += 1
+    try:
+        yield f"retry: {FEED_RETRY_MS}\n\n"
+        if last_seq is None:
+            last_seq = feed.head
+            yield f"id: {feed.epoch}-{last_seq}\nevent: ready\ndata: {{}}\n\n"
+        while True:
+            events = feed.since(last_seq, FEED_BATCH_SIZE)
+            if events is None:
+                feed.resets += 1
+                last_seq = feed.head
+                yield f"id: {feed.epoch}-{last_seq}\nevent: reset\ndata: {{}}\n\n"
+            elif events:
+                last_seq = events[-1].seq
+                yield "".join(_format(feed, event) for event in events)
+            else:
+                await feed.wait(last_seq, settings.LIVE_FEED_KEEPALIVE_SECONDS)
+                if feed.head == last_seq:
+                    yield ": keepalive\n\n"
+    finally:
+        feed.subscribers -= 1
+
+
+async def relay_other_workers(
+    feed: LiveFeed,
+    version: CatalogVersion,
+    interval: float,
+    on_change: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """Tell this worker's subscribers to ``reset`` when another worker changed the catalog.
+
+    Deltas are only published in the process that committed them. With a
+    shared catalog version, a rise larger than this process's own bumps
+    means another worker wrote, and its subscribers re-fetch instead of
+    silently missing the change. ``on_change`` lets other per-process state
+    resync at the same moment. Runs until cancelled.
+    """
+    seen, local = version.snapshot()
+    while True:
+        await asyncio.sleep(interval)
+        value, bumps = version.snapshot()
+        if value - seen > bumps - local:
+            feed.publish("reset", {})
+            if on_change is not None:
+                try:
+                    await on_change()
+                except Exception:
+                    logger.exception("resync after another worker's change failed")
+        seen, local = value, bumps
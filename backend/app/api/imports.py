@@ -0,0 +1,46 @@
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.schemas.imports import ImportReport
+from app.services.import_service import ImportBatcher, ImportFormat, ImportKind, ImportService
+
+import_service = ImportService()
+
+
+def request_format(request: Request, fmt: ImportFormat | None) -> ImportFormat:
+    if fmt is not None:
+        return fmt
+    return "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+
+async def _request_lines(request: Request):
+    pending = b""
+    async for block in request.stream():
+        pending += block
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if pending:
+        yield pending.decode("utf-8-sig").rstrip("\r")
+
+
+async def import_request_body(
+    request: Request,
+    db: Session,
+    kind: ImportKind,
+    fmt: ImportFormat,
+    chunk_size: int,
+) -> ImportReport:
+    """Parse the body as it arrives and hand each full chunk to the DB in a worker thread."""
+    report = ImportReport()
+    batcher = ImportBatcher(fmt, chunk_size, report)
+    async for line in _request_lines(request):
+        chunk = batcher.add(line)
+        if chunk:
+            await run_in_threadpool(import_service.import_chunk, db, kind, chunk, report)
+    chunk = batcher.flush()
+    if chunk:
+        await run_in_threadpool(import_service.import_chunk, db, kind, chunk, report)
+    report.errors.sort(key=lambda error: error.line)
+    return report
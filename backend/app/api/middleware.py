@@ -0,0 +1,196 @@
+import asyncio
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import RequestStats, current_request, metrics
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's template including router prefixes, e.g. ``/vehicles/{vehicle_id}``."""
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    # The route only knows its own template; the prefixes it was included
+    # under are the leading segments of the concrete path.
+    parts = scope["path"].split("/")
+    return "/".join(parts[: len(parts) - template.count("/")]) + template
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and attributes its SQL and bcrypt time to the route.
+
+    With ``SQL_QUERY_BUDGET`` set, each request may issue at most that many
+    statements; the next one raises ``QueryBudgetExceeded`` so tests catch
+    N+1 query patterns as failures rather than slowdowns.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats(settings.SQL_QUERY_BUDGET)
+        token = current_request.set(stats)
+        metrics.request_started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.request_finished(
+                scope["method"], route_template(scope), status, time.perf_counter() - started, stats
+            )
+            current_request.reset(token)
+
+
+# Routes that hash passwords; they are slow by design and get their own cap.
+AUTH_ROUTES = {("POST", "/users/login"), ("POST", "/users/register"), ("POST", "/users/me/password")}
+# Never queued or shed: the health check, metrics scrapes and long-lived streams.
+UNGATED_PATHS = {"/", "/metrics", "/vehicles/feed"}
+
+
+def route_class(scope: Scope) -> str | None:
+    """``auth``, ``reads`` or ``writes`` for admission control, or None if the request is not gated."""
+    path = scope["path"]
+    if path in UNGATED_PATHS:
+        return None
+    method = scope["method"]
+    if (method, path.rstrip("/")) in AUTH_ROUTES:
+        return "auth"
+    return "reads" if method in ("GET", "HEAD", "OPTIONS") else "writes"
+
+
+class AdmissionGate:
+    """Concurrency cap for one route class with a FIFO queue bounded by waiting time.
+
+    A request waits at most ``target`` seconds for a slot. Once the oldest
+    waiter has been queued longer than that, new arrivals are turned away
+    immediately instead of joining a queue that is already too slow.
+    Released slots pass straight to the next waiter. Used from a single
+    event loop, so no locking is needed.
+    """
+
+    def __init__(self, limit: int, target: float):
+        self.limit = limit
+        self.target = target
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._waiters: deque[tuple[float, asyncio.Future]] = deque()
+
+    async def acquire(self) -> float | None:
+        """Wait for a slot; returns the time spent queued, or None if the request should be shed."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+        queued_at = time.monotonic()
+        if self._waiters and queued_at - self._waiters[0][0] > self.target:
+            self.shed += 1
+            return None
+        entry = (queued_at, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait((entry[1],), timeout=self.target)
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+        if not entry[1].done():
+            self._abandon(entry)
+            self.shed += 1
+            return None
+        waited = time.monotonic() - queued_at
+        self.admitted += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return waited
+
+    def _abandon(self, entry: tuple[float, asyncio.Future]) -> None:
+        if entry[1].done():
+            # The slot was handed over just as we gave up; pass it on.
+            self.release()
+        else:
+            entry[1].cancel()
+            self._waiters.remove(entry)
+
+    def release(self) -> None:
+        while self._waiters:
+            _, future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "wait_seconds_total": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class AdmissionControlMiddleware:
+    """Caps in-flight requests per route class and sheds load with a fast 503.
+
+    Logins and writes saturate different resources (bcrypt workers, the
+    SQLite writer) than catalog reads, so each class queues separately and
+    a spike in one cannot starve the others of threadpool slots or
+    connections. Classes without a gate are passed straight through.
+    """
+
+    def __init__(self, app: ASGIApp, gates: dict[str, AdmissionGate]):
+        self.app = app
+        self.gates = gates
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        gate = self.gates.get(route_class(scope)) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        waited = await gate.acquire()
+        if waited is None:
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        stats = current_request.get()
+        if stats is not None:
+            stats.queue_seconds += waited
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+def admission_gates(limits: dict[str, int], target: float) -> dict[str, AdmissionGate]:
+    """One gate per route class with a positive limit."""
+    return {name: AdmissionGate(limit, target) for name, limit in limits.items() if limit > 0}
+
+
+def admission_stats(gates: dict[str, AdmissionGate]) -> dict:
+    return {f"{name}_{key}": value for name, gate in gates.items() for key, value in gate.stats().items()}
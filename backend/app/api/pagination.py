@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import HTTPException, Response, status
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the keyset position of the last row on a page as an opaque token."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a token produced by encode_cursor; raises 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        values = None
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def decode_keyset_cursor(cursor: str | None, *types: type | tuple[type, ...]) -> tuple | None:
+    """Decode a cursor and check that it holds one value per keyset column."""
+    if cursor is None:
+        return None
+    values = decode_cursor(cursor)
+    # JSON true/false decode to bool, which isinstance() would also accept as int.
+    if len(values) != len(types) or not all(
+        not isinstance(v, bool) and isinstance(v, t) for v, t in zip(values, types)
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return tuple(values)
+
+
+def decode_id_cursor(cursor: str | None) -> int | None:
+    position = decode_keyset_cursor(cursor, int)
+    return position[0] if position else None
+
+
+def decode_time_id_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    position = decode_keyset_cursor(cursor, str, int)
+    if position is None:
+        return None
+    try:
+        return datetime.fromisoformat(position[0]), position[1]
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate(
+    response: Response,
+    rows: Sequence[T],
+    limit: int,
+    key: Callable[[T], tuple] = lambda row: (row.id,),
+) -> Sequence[T]:
+    """Trim a ``limit + 1`` fetch to one page and advertise the next cursor.
+
+    The body stays a plain list so existing clients keep working; the cursor
+    for the following page is sent in the ``X-Next-Cursor`` header and is
+    omitted on the last page.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
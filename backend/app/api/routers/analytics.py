@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.dependencies import get_current_user
+from app.api.routers.users import require_admin
+from app.db.session import get_db
+from app.models.user import User
+from app.schemas.analytics import RevenueBucket, UtilizationBucket
+from app.services.rollup_service import BUCKET_SECONDS, Granularity, RollupService
+
+router = APIRouter()
+rollup_service = RollupService()
+
+DEFAULT_WINDOW = {"hour": timedelta(days=7), "day": timedelta(days=30)}
+# Caps the rows a dashboard query can return per vehicle.
+MAX_WINDOW = {"hour": timedelta(days=31), "day": timedelta(days=366)}
+
+
+def _window(granularity: Granularity, start: datetime | None, end: datetime | None) -> tuple[datetime, datetime]:
+    end = end or datetime.utcnow()
+    start = start or end - DEFAULT_WINDOW[granularity]
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if end - start > MAX_WINDOW[granularity]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Window too large for {granularity} buckets (max {MAX_WINDOW[granularity].days} days)",
+        )
+    return start, end
+
+
+@router.get("/revenue", response_model=List[RevenueBucket])
+def revenue(
+    granularity: Granularity = "day",
+    group_by: Literal["vehicle", "type"] = "vehicle",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    vehicle_id: int | None = None,
+    vehicle_type: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Rentals, revenue and rented hours per bucket, read from the rollup tables."""
+    require_admin(current_user)
+    start, end = _window(granularity, start, end)
+    rows = rollup_service.summarize(
+        db,
+        granularity=granularity,
+        start=start,
+        end=end,
+        group_by=group_by,
+        vehicle_id=vehicle_id,
+        vehicle_type=vehicle_type,
+    )
+    return [
+        RevenueBucket(
+            bucket_start=row.bucket_start,
+            vehicle_type=row.vehicle_type,
+            vehicle_id=row.vehicle_id if group_by == "vehicle" else None,
+            rentals=row.rentals,
+            revenue=round(row.revenue, 2),
+            rented_hours=round(row.rented_seconds / 3600, 3),
+        )
+        for row in rows
+    ]
+
+
+@router.get("/utilization", response_model=List[UtilizationBucket])
+def utilization(
+    granularity: Granularity = "hour",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    vehicle_type: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Rented share of each vehicle type's fleet time per bucket."""
+    require_admin(current_user)
+    start, end = _window(granularity, start, end)
+    rows = rollup_service.summarize(
+        db, granularity=granularity, start=start, end=end, group_by="type", vehicle_type=vehicle_type
+    )
+    fleet = rollup_service.fleet_sizes(db)
+    buckets = []
+    for row in rows:
+        fleet_size = fleet.get(row.vehicle_type, 0)
+        capacity = fleet_size * BUCKET_SECONDS[granularity]
+        buckets.append(UtilizationBucket(
+            bucket_start=row.bucket_start,
+            vehicle_type=row.vehicle_type,
+            rented_hours=round(row.rented_seconds / 3600, 3),
+            fleet_size=fleet_size,
+            utilization=round(row.rented_seconds / capacity, 4) if capacity else 0.0,
+        ))
+    return buckets
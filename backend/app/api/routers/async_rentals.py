@@ -0,0 +1,103 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.async_dependencies import get_current_user
+from app.api.expansion import expand_rentals, rental_expansions
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_id_cursor, paginate
+from app.api.serialization import RowEncoder
+from app.db.async_session import get_async_db
+from app.schemas.rental import RentalCreate, RentalExpanded, RentalUpdate, Rental as RentalSchema
+from app.services.active_rentals import UserHasOpenRentalError
+from app.services.async_rental_service import AsyncRentalService
+from app.services.rental_service import RentalReopenError, VehicleNotFoundError, VehicleUnavailableError
+from app.models.rental import Rental as RentalModel
+from app.models.user import User
+
+router = APIRouter()
+rental_rows = RowEncoder(RentalSchema, RentalModel)
+rental_service = AsyncRentalService()
+
+
+@router.get("/", response_model=List[RentalExpanded], response_model_exclude_unset=True)
+async def list_rentals(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_id: int | None = None,
+    vehicle_id: int | None = None,
+    active: bool | None = None,
+    expand: tuple[str, ...] = Depends(rental_expansions),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rentals = await rental_service.get_all_rentals(
+        db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        user_id=user_id,
+        vehicle_id=vehicle_id,
+        active=active,
+        expand=expand,
+        columns=None if expand else rental_rows.columns,
+    )
+    page = paginate(response, rentals, limit)
+    if expand:
+        return expand_rentals(page, expand)
+    return rental_rows.response(request, response, page)
+
+
+@router.post("/", response_model=RentalSchema, status_code=status.HTTP_201_CREATED)
+async def create_rental(
+    rental: RentalCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    rental.user_id = current_user.id
+    try:
+        return await rental_service.create_rental(db, rental=rental)
+    except VehicleNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except (VehicleUnavailableError, UserHasOpenRentalError) as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.get("/{rental_id:int}", response_model=RentalExpanded, response_model_exclude_unset=True)
+async def read_rental(
+    rental_id: int,
+    expand: tuple[str, ...] = Depends(rental_expansions),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rental = await rental_service.get_rental(db, rental_id=rental_id, expand=expand)
+    if rental is None:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    return expand_rentals([rental], expand)[0]
+
+
+@router.put("/{rental_id:int}", response_model=RentalSchema)
+async def update_rental(
+    rental_id: int,
+    rental: RentalUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        updated_rental = await rental_service.update_rental(db, rental_id=rental_id, rental_update=rental)
+    except RentalReopenError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if updated_rental is None:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    return updated_rental
+
+
+@router.delete("/{rental_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rental(
+    rental_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    success = await rental_service.delete_rental(db, rental_id=rental_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Rental not found")
+    return None
@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.async_dependencies import get_current_user
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_id_cursor, decode_time_id_cursor, paginate
+from app.api.routers.users import forbid_admin_mutation, require_admin
+from app.api.serialization import RowEncoder
+from app.core.config import settings
+from app.db.async_session import get_async_db
+from app.models.rental import Rental
+from app.models.user import User
+from app.schemas.rental import Rental as RentalSchema
+from app.schemas.user import UserRead, UserUpdate
+from app.services.async_rental_service import AsyncRentalService
+from app.services.async_user_service import AsyncUserService
+
+# /register, /login and /me/password hash with bcrypt and are served by the
+# sync users router, which is mounted behind this one.
+router = APIRouter()
+user_rows = RowEncoder(UserRead, User)
+rental_rows = RowEncoder(RentalSchema, Rental)
+user_service = AsyncUserService()
+rental_service = AsyncRentalService()
+
+
+@router.get("/me", response_model=UserRead)
+async def get_user_profile(current_user: User = Depends(get_current_user)):
+    return current_user
+
+
+@router.patch("/me", response_model=UserRead)
+async def update_user_profile(
+    payload: UserUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    forbid_admin_mutation(current_user)
+    try:
+        updated = await user_service.update_user(
+            db,
+            current_user,
+            email=payload.email,
+            username=payload.username,
+            full_name=payload.full_name,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return updated
+
+
+@router.get("/me/rentals", response_model=List[RentalSchema])
+async def list_my_rentals(
+    request: Request,
+    response: Response,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The caller's rentals, newest first, optionally limited to rentals starting in [start_from, start_to)."""
+    rentals = await rental_service.get_user_rentals(
+        db,
+        current_user.id,
+        start_from=start_from,
+        start_to=start_to,
+        before=decode_time_id_cursor(cursor),
+        limit=limit + 1,
+        columns=rental_rows.columns,
+    )
+    page = paginate(response, rentals, limit, key=lambda r: (r.start_time.isoformat(), r.id))
+    return rental_rows.response(request, response, page)
+
+
+@router.get("/", response_model=List[UserRead])
+async def list_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    is_active: bool | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_admin(current_user)
+    users = await user_service.get_all_users(
+        db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        is_active=is_active,
+        columns=user_rows.columns,
+    )
+    return user_rows.response(request, response, paginate(response, users, limit))
+
+
+@router.delete("/{user_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_admin(current_user)
+    target = await user_service.get_user_by_id(db, user_id)
+    if not target:
+        raise HTTPException(status_code=404, detail="User not found")
+    if target.email == settings.ADMIN_EMAIL:
+        raise HTTPException(status_code=400, detail="Cannot delete admin user")
+    await user_service.delete_user(db, user_id)
+    return None
@@ -0,0 +1,137 @@
+from typing import List, Literal
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.async_dependencies import get_current_user
+from app.api.caching import catalog_etag
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_id_cursor,
+    decode_keyset_cursor,
+    paginate,
+)
+from app.api.serialization import RowEncoder
+from app.api.routers.vehicles import require_admin
+from app.db.async_session import get_async_db
+from app.schemas.vehicle import VehicleCreate, VehicleUpdate, Vehicle, VehicleNearby
+from app.services.async_vehicle_service import AsyncVehicleService
+from app.models.user import User
+from app.models.vehicle import Vehicle as VehicleModel
+
+router = APIRouter()
+vehicle_rows = RowEncoder(Vehicle, VehicleModel)
+vehicle_service = AsyncVehicleService()
+
+
+@router.get("/", response_model=List[Vehicle], dependencies=[Depends(catalog_etag)])
+async def list_vehicles(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    vehicle_type: str | None = None,
+    available: bool | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    vehicles = await vehicle_service.get_all_vehicles(
+        db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        vehicle_type=vehicle_type,
+        available=available,
+        columns=vehicle_rows.columns,
+    )
+    return vehicle_rows.response(request, response, paginate(response, vehicles, limit))
+
+
+@router.get("/search", response_model=List[Vehicle])
+async def search_vehicles(
+    request: Request,
+    response: Response,
+    vehicle_type: str | None = None,
+    available: bool | None = True,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    sort: Literal["price_asc", "price_desc"] = "price_asc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    vehicles = await vehicle_service.search_vehicles(
+        db,
+        vehicle_type=vehicle_type,
+        available=available,
+        min_price=min_price,
+        max_price=max_price,
+        descending=sort == "price_desc",
+        after=decode_keyset_cursor(cursor, (int, float), int),
+        limit=limit + 1,
+        columns=vehicle_rows.columns,
+    )
+    page = paginate(response, vehicles, limit, key=lambda v: (v.price_per_hour, v.id))
+    return vehicle_rows.response(request, response, page)
+
+
+@router.get("/nearby", response_model=List[VehicleNearby])
+async def nearby_vehicles(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    radius_km: float = Query(2.0, gt=0, le=50),
+    available: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+):
+    nearby = await vehicle_service.get_nearby_vehicles(
+        db, lat=lat, lng=lng, k=k, radius_km=radius_km, available_only=available
+    )
+    return [
+        VehicleNearby(**Vehicle.model_validate(vehicle).model_dump(), distance_km=round(distance, 3))
+        for vehicle, distance in nearby
+    ]
+
+
+@router.post("/", response_model=Vehicle, status_code=status.HTTP_201_CREATED)
+async def create_vehicle(
+    vehicle: VehicleCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_admin(current_user)
+    return await vehicle_service.create_vehicle(db, vehicle=vehicle)
+
+
+@router.get("/{vehicle_id:int}", response_model=Vehicle, dependencies=[Depends(catalog_etag)])
+async def get_vehicle(vehicle_id: int, db: AsyncSession = Depends(get_async_db)):
+    vehicle = await vehicle_service.get_vehicle(db, vehicle_id=vehicle_id)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return vehicle
+
+
+@router.put("/{vehicle_id:int}", response_model=Vehicle)
+async def update_vehicle(
+    vehicle_id: int,
+    vehicle: VehicleUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_admin(current_user)
+    updated_vehicle = await vehicle_service.update_vehicle(db, vehicle_id=vehicle_id, vehicle=vehicle)
+    if not updated_vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return updated_vehicle
+
+
+@router.delete("/{vehicle_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_vehicle(
+    vehicle_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    require_admin(current_user)
+    success = await vehicle_service.delete_vehicle(db, vehicle_id=vehicle_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    return None
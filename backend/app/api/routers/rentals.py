@@ -1,20 +1,63 @@
+from datetime import datetime
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user
+from app.api.expansion import expand_rentals, rental_expansions
+from app.api.exports import EXPORT_MEDIA_TYPES, ExportFormat, stream_rental_export
+from app.api.imports import import_request_body, request_format
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_id_cursor, paginate
+from app.api.serialization import RowEncoder
+from app.api.routers.users import require_admin
 from app.db.session import get_db
-from app.schemas.rental import RentalCreate, RentalUpdate, Rental as RentalSchema
-from app.services.rental_service import RentalService
+from app.schemas.imports import ImportReport
+from app.schemas.rental import (
+    ActiveRental,
+    ActiveRentalCheck,
+    RentalCreate,
+    RentalExpanded,
+    RentalUpdate,
+    Rental as RentalSchema,
+)
+from app.services.active_rentals import UserHasOpenRentalError, active_rentals
+from app.services.import_service import DEFAULT_CHUNK_SIZE, ImportFormat
+from app.services.rental_service import RentalReopenError, RentalService, VehicleNotFoundError, VehicleUnavailableError
+from app.models.rental import Rental as RentalModel
 from app.models.user import User
 
 router = APIRouter()
+rental_rows = RowEncoder(RentalSchema, RentalModel)
 rental_service = RentalService()
 
-@router.get("/", response_model=List[RentalSchema])
-def list_rentals(db: Session = Depends(get_db)):
-    return rental_service.get_all_rentals(db=db)
+@router.get("/", response_model=List[RentalExpanded], response_model_exclude_unset=True)
+def list_rentals(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    user_id: int | None = None,
+    vehicle_id: int | None = None,
+    active: bool | None = None,
+    expand: tuple[str, ...] = Depends(rental_expansions),
+    db: Session = Depends(get_db),
+):
+    rentals = rental_service.get_all_rentals(
+        db=db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        user_id=user_id,
+        vehicle_id=vehicle_id,
+        active=active,
+        expand=expand,
+        columns=None if expand else rental_rows.columns,
+    )
+    page = paginate(response, rentals, limit)
+    if expand:
+        return expand_rentals(page, expand)
+    return rental_rows.response(request, response, page)
 
 
 @router.post("/", response_model=RentalSchema, status_code=status.HTTP_201_CREATED)
@@ -24,15 +67,88 @@ def create_rental(
     current_user: User = Depends(get_current_user),
 ):
     rental.user_id = current_user.id
-    return rental_service.create_rental(db=db, rental=rental)
+    try:
+        return rental_service.create_rental(db=db, rental=rental)
+    except VehicleNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except (VehicleUnavailableError, UserHasOpenRentalError) as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_rentals(
+    request: Request,
+    fmt: ImportFormat | None = Query(None, alias="format"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Bulk-load rentals from an NDJSON or CSV body; bad lines are reported, not fatal."""
+    require_admin(current_user)
+    return await import_request_body(request, db, "rentals", request_format(request, fmt), chunk_size)
+
+
+@router.get("/export")
+def export_rentals(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Stream the rental ledger, optionally limited to rentals starting in [start_from, start_to)."""
+    require_admin(current_user)
+    return StreamingResponse(
+        stream_rental_export(fmt, start_from=start_from, start_to=start_to),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="rentals.{fmt}"'},
+    )
 
 
-@router.get("/{rental_id}", response_model=RentalSchema)
-def read_rental(rental_id: int, db: Session = Depends(get_db)):
-    rental = rental_service.get_rental(db=db, rental_id=rental_id)
+@router.get("/active", response_model=List[ActiveRental])
+def list_active_rentals(vehicle_id: int | None = None, user_id: int | None = None):
+    """Fleet status: every open rental, served from the in-memory registry without touching the database."""
+    if vehicle_id is not None:
+        entries = active_rentals.for_vehicle(vehicle_id)
+        if user_id is not None:
+            entries = [entry for entry in entries if entry.user_id == user_id]
+    elif user_id is not None:
+        entries = active_rentals.for_user(user_id)
+    else:
+        entries = active_rentals.snapshot()
+    return [entry._asdict() for entry in entries]
+
+
+@router.get("/active/check", response_model=ActiveRentalCheck)
+def check_active_rentals(
+    repair: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Compare this process's active-rental registry with the database.
+
+    ``repair`` rebuilds the registry and takes back vehicles marked available
+    while rented; duplicate open rentals are only reported, since the unique
+    open-rental indexes keep new ones from being written.
+    """
+    require_admin(current_user)
+    drift = rental_service.check_active_registry(db)
+    report = ActiveRentalCheck(consistent=drift.consistent, registry=len(active_rentals), **drift._asdict())
+    if repair and not drift.consistent:
+        report.registry = rental_service.repair_active_registry(db, drift)
+        report.repaired = True
+    return report
+
+
+@router.get("/{rental_id}", response_model=RentalExpanded, response_model_exclude_unset=True)
+def read_rental(
+    rental_id: int,
+    expand: tuple[str, ...] = Depends(rental_expansions),
+    db: Session = Depends(get_db),
+):
+    rental = rental_service.get_rental(db=db, rental_id=rental_id, expand=expand)
     if rental is None:
         raise HTTPException(status_code=404, detail="Rental not found")
-    return rental
+    return expand_rentals([rental], expand)[0]
 
 
 @router.put("/{rental_id}", response_model=RentalSchema)
@@ -42,7 +158,10 @@ def update_rental(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    updated_rental = rental_service.update_rental(db=db, rental_id=rental_id, rental_update=rental)
+    try:
+        updated_rental = rental_service.update_rental(db=db, rental_id=rental_id, rental_update=rental)
+    except RentalReopenError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     if updated_rental is None:
         raise HTTPException(status_code=404, detail="Rental not found")
     return updated_rental
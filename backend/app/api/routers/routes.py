@@ -0,0 +1,42 @@
+import math
+
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.route import RouteQuoteRequest, RouteQuote
+from app.services.route_service import fare, route_service
+from app.services.vehicle_service import VehicleService
+
+router = APIRouter()
+vehicle_service = VehicleService()
+
+
+def resolve_node(node_id: str | None, point) -> str:
+    if node_id is not None:
+        if not route_service.has_node(node_id):
+            raise HTTPException(status_code=400, detail=f"Unknown node: {node_id}")
+        return node_id
+    return route_service.nearest_node(point.lat, point.lng)
+
+
+@router.post("/quote", response_model=RouteQuote)
+def quote_route(request: RouteQuoteRequest, db: Session = Depends(get_db)):
+    vehicle = vehicle_service.get_vehicle(db=db, vehicle_id=request.vehicle_id)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+    from_node = resolve_node(request.from_node, request.origin)
+    to_node = resolve_node(request.to_node, request.destination)
+    distance = route_service.distance_km(from_node, to_node)
+    if math.isinf(distance):
+        raise HTTPException(status_code=400, detail="No route between these points")
+    hours = route_service.eta_hours(distance, vehicle.vehicle_type)
+    return RouteQuote(
+        vehicle_id=vehicle.id,
+        from_node=from_node,
+        to_node=to_node,
+        distance_km=round(distance, 3),
+        eta_minutes=round(hours * 60, 1),
+        price_per_hour=vehicle.price_per_hour,
+        cost=fare(vehicle.price_per_hour, hours),
+    )
@@ -1,20 +1,28 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user
+from app.api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_id_cursor, decode_time_id_cursor, paginate
+from app.api.serialization import RowEncoder
 from app.core.config import settings
 from app.core.security import create_access_token
 from app.db.session import get_db
+from app.models.rental import Rental
 from app.models.user import User
+from app.schemas.rental import Rental as RentalSchema
 from app.schemas.user import UserCreate, UserRead, UserUpdate, PasswordChange
+from app.services.rental_service import RentalService
 from app.services.user_service import UserService
 
 router = APIRouter()
+user_rows = RowEncoder(UserRead, User)
+rental_rows = RowEncoder(RentalSchema, Rental)
 user_service = UserService()
+rental_service = RentalService()
 
 
 def require_admin(current_user: User):
@@ -89,14 +97,50 @@ def change_password(
         raise HTTPException(status_code=400, detail="Current password incorrect")
     return None
 
+@router.get("/me/rentals", response_model=List[RentalSchema])
+def list_my_rentals(
+    request: Request,
+    response: Response,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """The caller's rentals, newest first, optionally limited to rentals starting in [start_from, start_to)."""
+    rentals = rental_service.get_user_rentals(
+        db,
+        current_user.id,
+        start_from=start_from,
+        start_to=start_to,
+        before=decode_time_id_cursor(cursor),
+        limit=limit + 1,
+        columns=rental_rows.columns,
+    )
+    page = paginate(response, rentals, limit, key=lambda r: (r.start_time.isoformat(), r.id))
+    return rental_rows.response(request, response, page)
+
 
 @router.get("/", response_model=List[UserRead])
 def list_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    is_active: bool | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     require_admin(current_user)
-    return user_service.get_all_users(db)
+    users = user_service.get_all_users(
+        db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        is_active=is_active,
+        columns=user_rows.columns,
+    )
+    return user_rows.response(request, response, paginate(response, users, limit))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,16 +1,37 @@
-from typing import List
+from typing import List, Literal
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.api.caching import catalog_etag
 from app.api.dependencies import get_current_user
+from app.api.imports import import_request_body, request_format
+from app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_id_cursor,
+    decode_keyset_cursor,
+    paginate,
+)
+from app.api.serialization import RowEncoder
 from app.core.config import settings
 from app.db.session import get_db
-from app.schemas.vehicle import VehicleCreate, VehicleUpdate, Vehicle
+from app.schemas.imports import ImportReport
+from app.schemas.vehicle import (
+    Vehicle,
+    VehicleBatchResult,
+    VehicleBatchUpdate,
+    VehicleCreate,
+    VehicleNearby,
+    VehicleUpdate,
+)
+from app.services.import_service import DEFAULT_CHUNK_SIZE, ImportFormat
 from app.services.vehicle_service import VehicleService
 from app.models.user import User
+from app.models.vehicle import Vehicle as VehicleModel
 
 router = APIRouter()
+vehicle_rows = RowEncoder(Vehicle, VehicleModel)
 vehicle_service = VehicleService()
 
 
@@ -20,9 +41,71 @@ def require_admin(current_user: User):
     return current_user
 
 
-@router.get("/", response_model=List[Vehicle])
-def list_vehicles(db: Session = Depends(get_db)):
-    return vehicle_service.get_all_vehicles(db=db)
+@router.get("/", response_model=List[Vehicle], dependencies=[Depends(catalog_etag)])
+def list_vehicles(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    vehicle_type: str | None = None,
+    available: bool | None = None,
+    db: Session = Depends(get_db),
+):
+    vehicles = vehicle_service.get_all_vehicles(
+        db=db,
+        after_id=decode_id_cursor(cursor),
+        limit=limit + 1,
+        vehicle_type=vehicle_type,
+        available=available,
+        columns=vehicle_rows.columns,
+    )
+    return vehicle_rows.response(request, response, paginate(response, vehicles, limit))
+
+
+@router.get("/search", response_model=List[Vehicle])
+def search_vehicles(
+    request: Request,
+    response: Response,
+    vehicle_type: str | None = None,
+    available: bool | None = True,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    sort: Literal["price_asc", "price_desc"] = "price_asc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
+    vehicles = vehicle_service.search_vehicles(
+        db=db,
+        vehicle_type=vehicle_type,
+        available=available,
+        min_price=min_price,
+        max_price=max_price,
+        descending=sort == "price_desc",
+        after=decode_keyset_cursor(cursor, (int, float), int),
+        limit=limit + 1,
+        columns=vehicle_rows.columns,
+    )
+    page = paginate(response, vehicles, limit, key=lambda v: (v.price_per_hour, v.id))
+    return vehicle_rows.response(request, response, page)
+
+
+@router.get("/nearby", response_model=List[VehicleNearby])
+def nearby_vehicles(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    radius_km: float = Query(2.0, gt=0, le=50),
+    available: bool = True,
+    db: Session = Depends(get_db),
+):
+    nearby = vehicle_service.get_nearby_vehicles(
+        db, lat=lat, lng=lng, k=k, radius_km=radius_km, available_only=available
+    )
+    return [
+        VehicleNearby(**Vehicle.model_validate(vehicle).model_dump(), distance_km=round(distance, 3))
+        for vehicle, distance in nearby
+    ]
 
 
 @router.post("/", response_model=Vehicle, status_code=status.HTTP_201_CREATED)
@@ -35,7 +118,32 @@ def create_vehicle(
     return vehicle_service.create_vehicle(db=db, vehicle=vehicle)
 
 
-@router.get("/{vehicle_id}", response_model=Vehicle)
+@router.post("/import", response_model=ImportReport)
+async def import_vehicles(
+    request: Request,
+    fmt: ImportFormat | None = Query(None, alias="format"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Bulk-load vehicles from an NDJSON or CSV body; bad lines are reported, not fatal."""
+    require_admin(current_user)
+    return await import_request_body(request, db, "vehicles", request_format(request, fmt), chunk_size)
+
+
+@router.patch("/batch", response_model=VehicleBatchResult)
+def batch_update_vehicles(
+    batch: VehicleBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Apply one change to many vehicles, chosen by ``ids`` or ``filter``, in a single UPDATE."""
+    require_admin(current_user)
+    ids = vehicle_service.update_vehicles(db, batch.changes, ids=batch.ids, where=batch.filter)
+    return VehicleBatchResult(updated=len(ids), ids=ids)
+
+
+@router.get("/{vehicle_id}", response_model=Vehicle, dependencies=[Depends(catalog_etag)])
 def get_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     vehicle = vehicle_service.get_vehicle(db=db, vehicle_id=vehicle_id)
     if not vehicle:
@@ -0,0 +1,54 @@
+from typing import Any, Sequence
+
+import msgpack
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Media types clients use for MessagePack in the wild.
+MSGPACK_ACCEPT = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return any(media_type in accept for media_type in MSGPACK_ACCEPT)
+
+
+class RowEncoder:
+    """Encodes query rows as one response schema without building model instances.
+
+    Routes select ``columns`` (the model attributes behind the schema's
+    fields, in field order) so the session returns plain ``Row`` tuples;
+    they are zipped into dicts and written with orjson, or MessagePack when
+    the client asks for it. Rows come straight from the database, so they
+    are trusted and never validated. The TypeAdapter over a TypedDict twin
+    of the schema is built once and only renders values (datetimes) into
+    their JSON form for MessagePack. The route keeps its ``response_model``
+    for the OpenAPI schema; FastAPI skips it because a Response is returned.
+    """
+
+    def __init__(self, schema: type[BaseModel], model: type):
+        self.fields = tuple(schema.model_fields)
+        self.columns = tuple(getattr(model, name) for name in self.fields)
+        row_type = TypedDict(
+            f"{schema.__name__}Row", {name: field.annotation for name, field in schema.model_fields.items()}
+        )
+        self.adapter = TypeAdapter(list[row_type])
+
+    def dicts(self, rows: Sequence[Sequence[Any]]) -> list[dict]:
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+    def response(self, request: Request, response: Response, rows: Sequence[Sequence[Any]]) -> Response:
+        """Encode ``rows`` per the Accept header, keeping headers dependencies set on ``response``."""
+        if wants_msgpack(request):
+            body = msgpack.packb(self.adapter.dump_python(self.dicts(rows), mode="json"))
+            encoded = Response(body, media_type=MSGPACK_MEDIA_TYPE)
+        else:
+            encoded = Response(orjson.dumps(self.dicts(rows)), media_type="application/json")
+        for name, value in response.headers.items():
+            encoded.headers.append(name, value)
+        encoded.headers["Vary"] = "Accept"
+        return encoded
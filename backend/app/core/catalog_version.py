@@ -0,0 +1,87 @@
+import mmap
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows; the shared counter is only used by the POSIX launcher.
+    fcntl = None
+
+from app.core.config import settings
+
+# Layout of a shared version file: 8 epoch bytes, then the counter.
+_SHARED_FORMAT = "<8sQ"
+_SHARED_SIZE = struct.calcsize(_SHARED_FORMAT)
+
+
+class CatalogVersion:
+    """Monotonic counter for the vehicle catalog, bumped after every committed change.
+
+    It backs the ETag on the vehicle read endpoints: a client that presents
+    the current tag gets a 304 without the database being queried. The tag
+    carries an epoch so tags from another run never match by accident.
+
+    On its own the counter is per process. With several workers that would
+    let one worker answer 304 for a catalog another worker just changed, so
+    the production launcher points ``CATALOG_VERSION_PATH`` at a small file
+    that every worker maps: reads stay a memory load, bumps take a file lock.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.local_bumps = 0
+        self._lock = threading.Lock()
+        self._shared: mmap.mmap | None = None
+        self._fd: int | None = None
+        if path:
+            self._open_shared(path)
+        else:
+            self.epoch = os.urandom(4).hex()
+            self._value = 0
+
+    @property
+    def shared(self) -> bool:
+        return self._shared is not None
+
+    def _open_shared(self, path: str) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < _SHARED_SIZE:
+                os.ftruncate(self._fd, _SHARED_SIZE)
+                os.pwrite(self._fd, struct.pack(_SHARED_FORMAT, os.urandom(8), 0), 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._shared = mmap.mmap(self._fd, _SHARED_SIZE)
+        self.epoch = struct.unpack_from(_SHARED_FORMAT, self._shared)[0].hex()
+
+    @property
+    def value(self) -> int:
+        if self._shared is not None:
+            return struct.unpack_from("<Q", self._shared, 8)[0]
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self.local_bumps += 1
+            if self._shared is None:
+                self._value += 1
+                return self._value
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = struct.unpack_from("<Q", self._shared, 8)[0] + 1
+                struct.pack_into("<Q", self._shared, 8, value)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            return value
+
+    def snapshot(self) -> tuple[int, int]:
+        """``(value, local_bumps)`` read together, to tell this process's changes from other workers'."""
+        with self._lock:
+            return self.value, self.local_bumps
+
+    def etag(self) -> str:
+        return f'W/"{self.epoch}-{self.value}"'
+
+
+catalog_version = CatalogVersion(settings.CATALOG_VERSION_PATH)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,12 +9,56 @@ DEFAULT_DB_PATH = PROJECT_ROOT / "db" / "app.db"
 
 class Settings(BaseSettings):
     DATABASE_URL: str = f"sqlite:///{DEFAULT_DB_PATH.as_posix()}"
+    # "production" turns on WAL and the other per-connection SQLite pragmas in app.db.session.
+    DB_PROFILE: Literal["development", "production"] = "development"
+    # Funnel rental start/end writes through one writer thread that commits them in batches.
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_MAX_BATCH: int = 64
+    GROUP_COMMIT_MAX_WAIT_MS: float = 2.0
+    GROUP_COMMIT_TIMEOUT_SECONDS: float = 5.0
+    # Vehicle deltas kept for /vehicles/feed resumes; clients further behind are told to re-fetch.
+    LIVE_FEED_BUFFER_SIZE: int = 10000
+    LIVE_FEED_KEEPALIVE_SECONDS: float = 15.0
+    # Set by start_all.py --production: a file every worker maps to share the catalog version.
+    CATALOG_VERSION_PATH: str | None = None
+    # How often a worker checks for catalog changes made by other workers (then tells its feed clients to reset).
+    CATALOG_WATCH_SECONDS: float = 1.0
+    # Test mode: any request issuing more SQL statements than this fails with QueryBudgetExceeded.
+    SQL_QUERY_BUDGET: int | None = None
+    # Admission control: concurrent requests per route class (0 = ungated). Excess requests
+    # queue for at most the target, and arrivals behind a queue older than that get a 503.
+    ADMISSION_AUTH_LIMIT: int = 4
+    ADMISSION_READ_LIMIT: int = 32
+    ADMISSION_WRITE_LIMIT: int = 8
+    ADMISSION_QUEUE_TARGET_MS: float = 250.0
+    # Demand pricing: a background thread reprices the whole fleet every interval from the
+    # rentals started in the trailing window (see app.services.pricing_service).
+    PRICING_ENABLED: bool = False
+    PRICING_INTERVAL_SECONDS: float = 300.0
+    PRICING_WINDOW_HOURS: int = 24
+    # Share of a vehicle's demand taken from its own rentals; the rest is its type's average.
+    PRICING_VEHICLE_WEIGHT: float = 0.5
+    # Piecewise-linear curves by vehicle_type, rentals per vehicle in the window -> multiplier of the
+    # admin-set base price; "default" covers every other type. Flat beyond the first and last point.
+    PRICING_CURVES: dict[str, list[tuple[float, float]]] = {"default": [(0, 0.9), (2, 1.0), (6, 1.25), (12, 1.5)]}
+    # Caps on the multiplier, and the largest relative change one run may make to a price.
+    PRICING_MIN_MULTIPLIER: float = 0.5
+    PRICING_MAX_MULTIPLIER: float = 2.0
+    PRICING_MAX_STEP: float = 0.25
+    # Serve the core routes from async handlers on an AsyncEngine instead of the sync threadpool.
+    DB_ASYNC: bool = False
     SECRET_KEY: str = "change-me"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Authenticated users are cached per token for up to this long (0 disables the cache).
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
     ADMIN_EMAIL: str = "admin@admin.com"
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD: str = "adminpassword"
+    # bcrypt runs in this many worker processes (0 = inline); excess callers queue up to the limit, then get 503.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,98 @@
+import asyncio
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from app.core.config import settings
+
+
+class FeedEvent(NamedTuple):
+    seq: int
+    kind: str
+    data: str
+
+
+class LiveFeed:
+    """In-process pub/sub for vehicle deltas, shared by every open stream.
+
+    Publishers (the services, from after-commit hooks on any thread) append
+    to one bounded ring of pre-serialised events and wake the event loop.
+    Subscribers keep nothing but their last sequence number and read from the
+    ring, so thousands of connections cost one wake-up per publish and no
+    per-connection buffers. A consumer that falls further behind than the
+    ring holds is told to ``reset`` (re-fetch the catalog) instead of making
+    the server queue for it. Sequence numbers are only meaningful within one
+    process run, hence the ``epoch`` in the ids handed to clients.
+    """
+
+    def __init__(self, buffer_size: int):
+        self.epoch = os.urandom(4).hex()
+        self.published = 0
+        self.subscribers = 0
+        self.resets = 0
+        self._events: deque[FeedEvent] = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed: asyncio.Event | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach to the serving event loop; publishes made before this are only buffered."""
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    @property
+    def head(self) -> int:
+        return self._seq
+
+    def publish(self, kind: str, payload: dict) -> int:
+        data = json.dumps(payload, separators=(",", ":"))
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._events.append(FeedEvent(seq, kind, data))
+            self.published += 1
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake)
+        return seq
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def since(self, seq: int, limit: int) -> list[FeedEvent] | None:
+        """Up to ``limit`` events after ``seq``; None if some of them were already evicted."""
+        with self._lock:
+            if seq >= self._seq:
+                return [] if seq == self._seq else None
+            oldest = self._events[0].seq if self._events else self._seq + 1
+            if seq + 1 < oldest:
+                return None
+            start = seq + 1 - oldest
+            return list(itertools.islice(self._events, start, start + limit))
+
+    async def wait(self, seq: int, timeout: float) -> None:
+        """Return once something newer than ``seq`` is published, or after ``timeout``."""
+        changed = self._changed
+        if self._seq > seq or changed is None:
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "head": self._seq,
+            "buffered": len(self._events),
+            "published": self.published,
+            "subscribers": self.subscribers,
+            "resets": self.resets,
+        }
+
+
+vehicle_feed = LiveFeed(settings.LIVE_FEED_BUFFER_SIZE)
@@ -0,0 +1,184 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable
+
+# Request latency buckets in seconds, Prometheus-style upper bounds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request tried to issue more SQL statements than ``SQL_QUERY_BUDGET`` allows."""
+
+
+class RequestStats:
+    """Work attributed to the request currently being served (see ``current_request``)."""
+
+    __slots__ = ("db_queries", "db_seconds", "hash_seconds", "queue_seconds", "query_budget")
+
+    def __init__(self, query_budget: int | None = None):
+        self.query_budget = query_budget
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.queue_seconds = 0.0
+
+
+# Set by the metrics middleware. Starlette copies the context into the
+# threadpool and the write queue copies it into its writer thread, so the
+# same object is updated wherever the request's work actually runs.
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _RouteTotals:
+    __slots__ = ("latency", "db_queries", "db_seconds", "hash_seconds", "queue_seconds")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.queue_seconds = 0.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Process-wide request and database metrics, rendered as Prometheus text.
+
+    Routes are keyed by their template (``/vehicles/{vehicle_id}``), never
+    the raw path, so the number of series stays bounded. Other components
+    contribute gauges through ``register_collector``.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self._routes: dict[tuple[str, str], _RouteTotals] = {}
+        self._statuses: dict[tuple[str, str, int], int] = {}
+        self._collectors: dict[str, Callable[[], dict]] = {}
+        self._lock = threading.Lock()
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            totals = self._routes.get((method, route))
+            if totals is None:
+                totals = self._routes[(method, route)] = _RouteTotals()
+            totals.latency.observe(seconds)
+            totals.db_queries += stats.db_queries
+            totals.db_seconds += stats.db_seconds
+            totals.hash_seconds += stats.hash_seconds
+            totals.queue_seconds += stats.queue_seconds
+            key = (method, route, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def check_query_budget(self, statement: str) -> None:
+        """Refuse the statement about to run if the request has used up its budget."""
+        stats = current_request.get()
+        if stats is not None and stats.query_budget is not None and stats.db_queries >= stats.query_budget:
+            raise QueryBudgetExceeded(
+                f"request exceeded its budget of {stats.query_budget} SQL statements "
+                f"(likely an N+1 lazy load); refused: {' '.join(statement.split())[:200]}"
+            )
+
+    def record_query(self, seconds: float) -> None:
+        with self._lock:
+            self.db_queries += 1
+            self.db_seconds += seconds
+        stats = current_request.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += seconds
+
+    def record_hash(self, seconds: float) -> None:
+        stats = current_request.get()
+        if stats is not None:
+            stats.hash_seconds += seconds
+
+    def register_collector(self, name: str, collect: Callable[[], dict]) -> None:
+        """Export the numeric values of ``collect()`` as ``app_<name>_<key>`` gauges."""
+        self._collectors[name] = collect
+
+    def render(self) -> str:
+        with self._lock:
+            routes = {key: (totals.latency.counts[:], totals.latency.sum, totals.latency.count,
+                            totals.db_queries, totals.db_seconds, totals.hash_seconds, totals.queue_seconds)
+                      for key, totals in self._routes.items()}
+            statuses = dict(self._statuses)
+            in_flight, db_queries, db_seconds = self.in_flight, self.db_queries, self.db_seconds
+
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), (counts, total, count, *_rest) in sorted(routes.items()):
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS + (float("inf"),), counts):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+            lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {total}")
+            lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {count}")
+
+        for name, index, help_text in (
+            ("http_request_db_queries_total", 3, "SQL statements issued while serving the route."),
+            ("http_request_db_seconds_total", 4, "Time spent executing SQL while serving the route."),
+            ("http_request_password_hash_seconds_total", 5, "Time spent waiting on bcrypt while serving the route."),
+            ("http_request_queue_seconds_total", 6, "Time spent queued for admission before the route ran."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), values in sorted(routes.items()):
+                lines.append(f"{name}{_labels(method=method, route=route)} {values[index]}")
+
+        lines += ["# HELP http_requests_total Responses by route and status code.", "# TYPE http_requests_total counter"]
+        for (method, route, status), count in sorted(statuses.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP db_queries_total SQL statements issued, including outside requests.",
+            "# TYPE db_queries_total counter",
+            f"db_queries_total {db_queries}",
+            "# HELP db_query_seconds_total Time spent executing SQL.",
+            "# TYPE db_query_seconds_total counter",
+            f"db_query_seconds_total {db_seconds}",
+        ]
+
+        for name, collect in sorted(self._collectors.items()):
+            for key, value in sorted(collect().items()):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"app_{name}_{key}"
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,124 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from app.core.metrics import metrics
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing queue is full; the API turns it into a 503."""
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordPoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.queue_wait_seconds_total = 0.0
+        self.queue_wait_seconds_max = 0.0
+
+    def record(self, hash_seconds: float, queue_wait_seconds: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.hash_seconds_total += hash_seconds
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+            self.queue_wait_seconds_total += queue_wait_seconds
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait_seconds)
+
+    def record_rejection(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_avg": self.hash_seconds_total / done,
+                "hash_seconds_max": self.hash_seconds_max,
+                "queue_wait_seconds_total": self.queue_wait_seconds_total,
+                "queue_wait_seconds_avg": self.queue_wait_seconds_total / done,
+                "queue_wait_seconds_max": self.queue_wait_seconds_max,
+            }
+
+
+class PasswordHashPool:
+    """Bounded process pool for CPU-bound password hashing.
+
+    At most ``workers`` hashes run at once and at most ``max_queue`` more may
+    wait for a worker; beyond that ``run`` fails fast with PasswordHashingBusy
+    instead of tying up another request thread. ``workers=0`` hashes inline
+    in the calling thread (handy for scripts), still recording metrics.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.metrics = PasswordPoolMetrics()
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that is already running request threads is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._in_flight >= max(self.workers, 1) + self.max_queue:
+                self.metrics.record_rejection()
+                raise PasswordHashingBusy("Password hashing queue is full")
+            self._in_flight += 1
+            executor = self._get_executor() if self.workers > 0 else None
+        submitted = time.perf_counter()
+        try:
+            if executor is None:
+                result, hash_seconds = _timed_call(fn, *args)
+            else:
+                result, hash_seconds = executor.submit(_timed_call, fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call rather than failing forever.
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        elapsed = time.perf_counter() - submitted
+        queue_wait = max(0.0, elapsed - hash_seconds)
+        self.metrics.record(hash_seconds, queue_wait)
+        metrics.record_hash(elapsed)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            **self.metrics.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
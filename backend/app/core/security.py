@@ -4,20 +4,36 @@ import bcrypt
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.password_pool import PasswordHashPool
 
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 
-def hash_password(password: str) -> str:
+
+def _bcrypt_hash(password: str) -> str:
     password_bytes = password.encode("utf-8")
     hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
     return hashed.decode("utf-8")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _bcrypt_check(plain_password: str, hashed_password: str) -> bool:
     plain_bytes = plain_password.encode("utf-8")
     hashed_bytes = hashed_password.encode("utf-8")
     return bcrypt.checkpw(plain_bytes, hashed_bytes)
 
 
+def hash_password(password: str) -> str:
+    """Hash on the password pool; raises PasswordHashingBusy when it is saturated."""
+    return password_pool.run(_bcrypt_hash, password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Check on the password pool; raises PasswordHashingBusy when it is saturated."""
+    return password_pool.run(_bcrypt_check, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (
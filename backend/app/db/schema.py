@@ -0,0 +1,209 @@
+import hashlib
+import logging
+from datetime import datetime
+from functools import cache
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, func, inspect, insert, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+
+from app.db.base import Base
+from app.models import rental, rental_rollup, user, vehicle  # noqa: F401  (register tables on Base)
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    # Fingerprint of the declared schema once this version was applied; only the latest row's matters.
+    Column("fingerprint", String(64), nullable=True),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Engine], None]
+
+
+def _baseline(engine: Engine) -> None:
+    # Tables and columns declared on the models are reconciled before any
+    # migration runs, so databases created before versioning need nothing.
+    pass
+
+
+def _backfill_rental_rollups(engine: Engine) -> None:
+    from sqlalchemy.orm import Session
+
+    from app.services.rollup_service import RollupService
+
+    with Session(engine) as db:
+        RollupService().rebuild(db)
+
+
+def _backfill_base_prices(engine: Engine) -> None:
+    vehicles = vehicle.Vehicle.__table__
+    with engine.begin() as conn:
+        conn.execute(
+            update(vehicles)
+            .where(vehicles.c.base_price_per_hour.is_(None))
+            .values(base_price_per_hour=vehicles.c.price_per_hour)
+        )
+
+
+def _unique_open_rentals(engine: Engine) -> None:
+    # The unique open-rental indexes cannot be built over duplicates, so all
+    # but the earliest open rental per vehicle, then per user, are closed at
+    # their own start time. Their vehicles are released if nothing else holds
+    # them, and the rollups are rebuilt to count the newly closed rentals.
+    rentals = rental.Rental.__table__
+    vehicles = vehicle.Vehicle.__table__
+    closed: list[int] = []
+    with engine.begin() as conn:
+        for key in (rentals.c.vehicle_id, rentals.c.user_id):
+            rows = conn.execute(
+                select(rentals.c.id, key)
+                .where(rentals.c.end_time.is_(None))
+                .order_by(key, rentals.c.start_time, rentals.c.id)
+            ).all()
+            seen: set[int] = set()
+            duplicates = [rental_id for rental_id, value in rows if value in seen or seen.add(value)]
+            if duplicates:
+                logger.warning("closing duplicate open rentals by %s: %s", key.name, duplicates)
+                conn.execute(update(rentals).where(rentals.c.id.in_(duplicates)).values(end_time=rentals.c.start_time))
+                closed.extend(duplicates)
+        if closed:
+            still_open = select(rentals.c.id).where(rentals.c.vehicle_id == vehicles.c.id, rentals.c.end_time.is_(None))
+            released = select(rentals.c.vehicle_id).where(rentals.c.id.in_(closed))
+            conn.execute(
+                update(vehicles).where(vehicles.c.id.in_(released), ~still_open.exists()).values(available=True)
+            )
+        # Replaced by ix_rentals_open_vehicle and ix_rentals_open_user, which _add_indexes builds next.
+        conn.execute(text("DROP INDEX IF EXISTS ix_rentals_open"))
+    if closed:
+        _backfill_rental_rollups(engine)
+
+
+def _backfill_rental_rates(engine: Engine) -> None:
+    # Open rentals from before rates were stored keep the price they would have been charged.
+    rentals = rental.Rental.__table__
+    vehicles = vehicle.Vehicle.__table__
+    current_price = select(vehicles.c.price_per_hour).where(vehicles.c.id == rentals.c.vehicle_id).scalar_subquery()
+    with engine.begin() as conn:
+        conn.execute(
+            update(rentals)
+            .where(rentals.c.end_time.is_(None), rentals.c.price_per_hour.is_(None))
+            .values(price_per_hour=current_price)
+        )
+
+
+# Append only; never renumber or edit an entry that has shipped.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "backfill_rental_rollups", _backfill_rental_rollups),
+    Migration(3, "backfill_base_prices", _backfill_base_prices),
+    Migration(4, "unique_open_rentals", _unique_open_rentals),
+    Migration(5, "backfill_rental_rates", _backfill_rental_rates),
+]
+
+
+@cache
+def schema_fingerprint() -> str:
+    """Hash of every declared table, column and index plus the latest migration version."""
+    parts = [f"migrations:{MIGRATIONS[-1].version}"]
+    for table in sorted(Base.metadata.sorted_tables, key=lambda t: t.name):
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(f"column:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}")
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            parts.append(f"index:{index.name}:{','.join(c.name for c in index.columns)}:{index.unique}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def stored_fingerprint(engine: Engine) -> str | None:
+    """The fingerprint recorded by the last successful ``migrate``, or None on an unversioned database."""
+    stmt = select(schema_migrations.c.fingerprint).order_by(schema_migrations.c.version.desc()).limit(1)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(stmt).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def migrate(engine: Engine) -> bool:
+    """Bring the database up to the declared schema; returns whether any work was needed.
+
+    When the stored fingerprint matches the models this is a single indexed
+    read, so every worker can call it on start. Otherwise missing tables and
+    columns are added, pending migrations run in order (each recorded as it
+    completes, so a failed run resumes where it stopped), missing indexes
+    are built one at a time, and the new fingerprint is stored last.
+    Nothing is dropped or rewritten except by an explicit migration.
+    """
+    fingerprint = schema_fingerprint()
+    if stored_fingerprint(engine) == fingerprint:
+        return False
+
+    logger.info("schema fingerprint changed, migrating")
+    _add_tables_and_columns(engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+        logger.info("applying migration %d %s", migration.version, migration.name)
+        migration.apply(engine)
+        with engine.begin() as conn:
+            conn.execute(insert(schema_migrations).values(
+                version=migration.version, name=migration.name, applied_at=datetime.utcnow(),
+            ))
+    _add_indexes(engine)
+    with engine.begin() as conn:
+        latest = select(func.max(schema_migrations.c.version)).scalar_subquery()
+        conn.execute(update(schema_migrations).where(schema_migrations.c.version == latest).values(fingerprint=fingerprint))
+    return True
+
+
+def _add_tables_and_columns(engine: Engine) -> None:
+    # create_all leaves existing tables untouched, so columns declared since a
+    # table was created are added with ALTER TABLE ... ADD COLUMN.
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
+
+def _add_indexes(engine: Engine) -> None:
+    """Build declared indexes that are missing, each in its own short transaction.
+
+    On PostgreSQL they are built ``CONCURRENTLY`` so writes carry on; SQLite
+    holds the write lock only for the one index being built while WAL
+    readers continue.
+    """
+    inspector = inspect(engine)
+    concurrently = engine.dialect.name == "postgresql"
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            logger.info("creating index %s", index.name)
+            ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+            if concurrently:
+                ddl = ddl.replace(" INDEX ", " INDEX CONCURRENTLY ", 1)
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    conn.execute(text(ddl))
+            else:
+                with engine.begin() as conn:
+                    conn.execute(text(ddl))
@@ -1,10 +1,67 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import logging
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+
+# Applied to every new connection under DB_PROFILE=production. WAL lets readers
+# run alongside the single writer, and synchronous=NORMAL skips the fsync on
+# each commit (WAL stays durable across application crashes).
+SQLITE_PRODUCTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+)
+
+
+def apply_sqlite_profile(engine: Engine) -> None:
+    if not IS_SQLITE or settings.DB_PROFILE != "production":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRODUCTION_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and time spent in them, globally and for the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        metrics.check_query_budget(statement)
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+        metrics.record_query(time.perf_counter() - conn.info["query_started"].pop())
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    @event.listens_for(engine, "handle_error")
+    def drop_query_timer(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
 engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+apply_sqlite_profile(engine)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -13,4 +70,33 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits; drop it on rollback.
+
+    Used for in-process side effects (indexes, caches) that must only
+    reflect data that actually reached the database.
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_KEY, ()):
+        try:
+            callback()
+        except Exception:
+            logger.exception("after-commit callback failed")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_commit_callbacks(session: Session, transaction) -> None:
+    # Only the outermost transaction ending (rollback or close) drops them;
+    # a rolled-back SAVEPOINT leaves the enclosing transaction's callbacks alone.
+    if transaction.parent is None:
+        session.info.pop(AFTER_COMMIT_KEY, None)
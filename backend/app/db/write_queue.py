@@ -0,0 +1,187 @@
+import asyncio
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import AFTER_COMMIT_KEY, IS_SQLITE, apply_sqlite_profile, instrument_engine
+
+
+class WriteQueueTimeout(Exception):
+    """The caller gave up waiting for its write; the API turns it into a 503."""
+
+
+def _writer_engine():
+    connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+    engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, pool_size=1, max_overflow=0)
+    apply_sqlite_profile(engine)
+    instrument_engine(engine)
+    if IS_SQLITE:
+        # pysqlite defers BEGIN to its own heuristics, which breaks SAVEPOINT;
+        # take over transaction control and grab the write lock up front.
+        @event.listens_for(engine, "connect")
+        def disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return engine
+
+
+class _Job:
+    __slots__ = ("fn", "args", "future", "context")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple):
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+        # Run in the submitter's context so per-request metrics follow the job.
+        self.context = contextvars.copy_context()
+
+
+class WriteQueue:
+    """Single-writer group commit.
+
+    Callers hand over ``fn(session, *args)`` and wait for the result. One
+    thread drains the queue: it takes the first job, waits at most
+    ``max_wait`` for up to ``max_batch - 1`` more, runs each in its own
+    SAVEPOINT (so a failing job only undoes itself and gets its exception
+    back) and commits the whole batch once. Results are detached ORM objects
+    with their columns loaded, safe to read from the calling thread.
+    """
+
+    def __init__(self, max_batch: int, max_wait: float, timeout: float):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.batches = 0
+        self.jobs = 0
+        self._queue: queue.Queue[_Job | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._sessionmaker: sessionmaker | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._sessionmaker = sessionmaker(bind=_writer_engine(), autoflush=False, expire_on_commit=False)
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        if self._thread is None:
+            raise RuntimeError("write queue is not running")
+        job = _Job(fn, args)
+        self._queue.put(job)
+        return job.future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Submit and block until the batch holding this job commits."""
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # Only a job that has not started can be withdrawn; otherwise its outcome stands.
+            if future.cancel():
+                raise WriteQueueTimeout("Write queue is saturated")
+            return future.result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        future = self.submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            if future.cancel():
+                raise WriteQueueTimeout("Write queue is saturated")
+            return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "jobs": self.jobs,
+            "avg_batch_size": self.jobs / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def _next_batch(self) -> list[_Job] | None:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                self._queue.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[_Job]) -> None:
+        session: Session = self._sessionmaker()
+        done: list[tuple[_Job, Any]] = []
+        try:
+            for job in batch:
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                callbacks = session.info.setdefault(AFTER_COMMIT_KEY, [])
+                pending_callbacks = len(callbacks)
+                savepoint = session.begin_nested()
+                try:
+                    result = job.context.run(job.fn, session, *job.args)
+                    savepoint.commit()
+                except Exception as exc:
+                    savepoint.rollback()
+                    del callbacks[pending_callbacks:]
+                    job.future.set_exception(exc)
+                    continue
+                done.append((job, result))
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            for job, _ in done:
+                job.future.set_exception(exc)
+            session.close()
+            return
+        session.expunge_all()
+        session.close()
+        self.batches += 1
+        self.jobs += len(done)
+        for job, result in done:
+            job.future.set_result(result)
+
+
+write_queue = (
+    WriteQueue(
+        max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+        max_wait=settings.GROUP_COMMIT_MAX_WAIT_MS / 1000,
+        timeout=settings.GROUP_COMMIT_TIMEOUT_SECONDS,
+    )
+    if settings.GROUP_COMMIT_ENABLED
+    else None
+)
@@ -1,28 +1,185 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Header, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from app.api.routers import rentals, users, vehicles
-from app.db.base import Base
-from app.db.session import engine
+from app.api.feed import parse_event_id, relay_other_workers, stream_feed
+from app.api.middleware import AdmissionControlMiddleware, MetricsMiddleware, admission_gates, admission_stats
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.routers import analytics, rentals, routes, users, vehicles
+from app.core.catalog_version import catalog_version
+from app.core.config import settings
+from app.core.live_feed import vehicle_feed
+from app.core.metrics import metrics
+from app.core.password_pool import PasswordHashingBusy
+from app.core.principal_cache import principal_cache
+from app.core.security import password_pool
+from app.db.schema import migrate
+from app.db.session import SessionLocal, engine
+from app.db.write_queue import WriteQueueTimeout, write_queue
+from app.services.active_rentals import active_rentals
+from app.services.pricing_service import pricing_engine
+from app.services.rental_service import RentalService
+from app.services.vehicle_service import VehicleService
 
 app = FastAPI()
 
+gates = admission_gates(
+    {
+        "auth": settings.ADMISSION_AUTH_LIMIT,
+        "reads": settings.ADMISSION_READ_LIMIT,
+        "writes": settings.ADMISSION_WRITE_LIMIT,
+    },
+    settings.ADMISSION_QUEUE_TARGET_MS / 1000,
+)
+# Innermost of the three, so shed responses still get CORS headers and are counted in the metrics.
+app.add_middleware(AdmissionControlMiddleware, gates=gates)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(MetricsMiddleware)
+
+metrics.register_collector("password_hashing", password_pool.stats)
+metrics.register_collector("principal_cache", principal_cache.stats)
+metrics.register_collector("vehicle_feed", vehicle_feed.stats)
+metrics.register_collector("admission", lambda: admission_stats(gates))
+metrics.register_collector("active_rentals", active_rentals.stats)
+if write_queue is not None:
+    metrics.register_collector("write_queue", write_queue.stats)
+if pricing_engine is not None:
+    metrics.register_collector("pricing", pricing_engine.stats)
 
 
 @app.on_event("startup")
 def on_startup():
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    with SessionLocal() as db:
+        VehicleService().rebuild_spatial_index(db)
+        RentalService().rebuild_active_registry(db)
+    if write_queue is not None:
+        write_queue.start()
+    if pricing_engine is not None:
+        pricing_engine.start(SessionLocal)
+
+
+def _resync_from_database():
+    with SessionLocal() as db:
+        VehicleService().rebuild_spatial_index(db)
+        RentalService().rebuild_active_registry(db)
+
+
+@app.on_event("startup")
+async def bind_vehicle_feed():
+    vehicle_feed.bind(asyncio.get_running_loop())
+    if catalog_version.shared:
+        # Another worker or the import CLI moved vehicles or their
+        # availability, so the same signal refreshes this worker's spatial
+        # index and active-rental registry.
+        app.state.catalog_watch = asyncio.create_task(
+            relay_other_workers(
+                vehicle_feed,
+                catalog_version,
+                settings.CATALOG_WATCH_SECONDS,
+                on_change=lambda: run_in_threadpool(_resync_from_database),
+            )
+        )
+
+
+@app.on_event("shutdown")
+async def stop_catalog_watch():
+    task = getattr(app.state, "catalog_watch", None)
+    if task is not None:
+        task.cancel()
+
+
+@app.on_event("shutdown")
+def shutdown_password_pool():
+    password_pool.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_write_queue():
+    if write_queue is not None:
+        write_queue.stop()
+
+
+@app.on_event("shutdown")
+def stop_pricing_engine():
+    if pricing_engine is not None:
+        pricing_engine.stop()
+
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(WriteQueueTimeout)
+async def write_queue_timeout_handler(request: Request, exc: WriteQueueTimeout):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent writes, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# Declared before the routers so "/vehicles/{vehicle_id}" does not capture it.
+@app.get("/vehicles/feed", tags=["Vehicles"])
+async def vehicle_feed_stream(
+    since: str | None = Query(None, description="Resume after this event id"),
+    last_event_id: str | None = Header(None),
+):
+    """Server-Sent Events with vehicle availability/price deltas.
+
+    Events are ``vehicle`` (``{"id", "available"?, "price"?, "deleted"?}``,
+    only the fields that changed) and ``reset`` (re-fetch ``GET /vehicles/``).
+    Reconnecting with ``Last-Event-ID`` (EventSource does this itself) or
+    ``?since=`` replays whatever was missed.
+    """
+    last_seq = parse_event_id(vehicle_feed, last_event_id or since)
+    return StreamingResponse(
+        stream_feed(vehicle_feed, last_seq),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+if settings.DB_ASYNC:
+    from app.api.routers import async_rentals, async_users, async_vehicles
+    from app.db.async_session import async_engine
+
+    # Registered first so they take precedence; anything they do not define
+    # (e.g. the bcrypt-bound auth routes) falls through to the sync routers.
+    # Their id routes only match integers so literal paths can fall through too.
+    app.include_router(async_rentals.router, prefix="/rentals", tags=["Rentals"])
+    app.include_router(async_users.router, prefix="/users", tags=["Users"])
+    app.include_router(async_vehicles.router, prefix="/vehicles", tags=["Vehicles"])
+
+    @app.on_event("shutdown")
+    async def on_shutdown():
+        await async_engine.dispose()
 
 app.include_router(rentals.router, prefix="/rentals", tags=["Rentals"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(vehicles.router, prefix="/vehicles", tags=["Vehicles"])
+app.include_router(routes.router, prefix="/routes", tags=["Routes"])
+app.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
 
 @app.get("/")
 def read_root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -11,6 +11,29 @@ class Rental(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
     total_cost = Column(Float, nullable=True)
+    # The vehicle's price when an open rental claimed it; closing charges this rate, whatever the price is by then.
+    price_per_hour = Column(Float, nullable=True)
 
     user = relationship("User", back_populates="rentals")
-    vehicle = relationship("Vehicle", back_populates="rentals")
\ No newline at end of file
+    vehicle = relationship("Vehicle", back_populates="rentals")
+
+    __table_args__ = (
+        # Serve a user's history: equality on user, range and order on start_time (id rides along as the rowid).
+        Index("ix_rentals_user_start", "user_id", "start_time"),
+        # One open rental per vehicle and per user, enforced by the database; being partial, they
+        # also let the active-rental registry be rebuilt or checked without scanning history.
+        Index(
+            "ix_rentals_open_vehicle",
+            "vehicle_id",
+            unique=True,
+            sqlite_where=end_time.is_(None),
+            postgresql_where=end_time.is_(None),
+        ),
+        Index(
+            "ix_rentals_open_user",
+            "user_id",
+            unique=True,
+            sqlite_where=end_time.is_(None),
+            postgresql_where=end_time.is_(None),
+        ),
+    )
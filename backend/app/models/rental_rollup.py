@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+from app.db.base import Base
+
+
+class _RollupColumns:
+    # One row per (bucket, vehicle); vehicle_type is copied in so per-type
+    # dashboards never join back to vehicles.
+    bucket_start = Column(DateTime, primary_key=True)
+    vehicle_id = Column(Integer, primary_key=True)
+    vehicle_type = Column(String, nullable=False)
+    # Rentals and revenue count in the bucket the rental started in; rented
+    # time is split across every bucket the rental overlaps.
+    rentals = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    rented_seconds = Column(Float, nullable=False, default=0.0)
+
+
+class RentalHourlyRollup(_RollupColumns, Base):
+    __tablename__ = "rental_rollups_hourly"
+    __table_args__ = (Index("ix_rental_rollups_hourly_type_bucket", "vehicle_type", "bucket_start"),)
+
+
+class RentalDailyRollup(_RollupColumns, Base):
+    __tablename__ = "rental_rollups_daily"
+    __table_args__ = (Index("ix_rental_rollups_daily_type_bucket", "vehicle_type", "bucket_start"),)
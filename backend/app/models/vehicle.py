@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, Float, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -11,8 +11,20 @@ class Vehicle(Base):
     description = Column(Text, nullable=True)
     available = Column(Boolean, default=True)
     price_per_hour = Column(Float, nullable=False)
+    # The admin-set price the pricing engine scales; price_per_hour is what riders are charged.
+    base_price_per_hour = Column(
+        Float, nullable=True, default=lambda context: context.get_current_parameters()["price_per_hour"]
+    )
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
 
     rentals = relationship("Rental", back_populates="vehicle")
 
+    __table_args__ = (
+        # Serve the availability search: equality on available/type, range and order on price.
+        Index("ix_vehicles_available_type_price", "available", "vehicle_type", "price_per_hour"),
+        Index("ix_vehicles_available_price", "available", "price_per_hour"),
+    )
+
     def __repr__(self):
         return f"<Vehicle(id={self.id}, name={self.name}, type={self.vehicle_type}, available={self.available})>"
\ No newline at end of file
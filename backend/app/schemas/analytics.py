@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class RevenueBucket(BaseModel):
+    bucket_start: datetime
+    vehicle_type: str
+    # Only set when grouping by vehicle.
+    vehicle_id: Optional[int] = None
+    rentals: int
+    revenue: float
+    rented_hours: float
+
+
+class UtilizationBucket(BaseModel):
+    bucket_start: datetime
+    vehicle_type: str
+    rented_hours: float
+    fleet_size: int
+    # Share of the type's current fleet-hours in the bucket that were rented.
+    utilization: float
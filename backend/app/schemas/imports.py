@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    # Only the first MAX_REPORTED_ERRORS failures are listed; ``failed`` counts them all.
+    errors: List[ImportLineError] = []
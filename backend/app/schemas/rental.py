@@ -1,6 +1,8 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from app.schemas.vehicle import Vehicle
 
 class RentalBase(BaseModel):
     vehicle_id: int
@@ -18,5 +20,43 @@ class RentalUpdate(BaseModel):
 class Rental(RentalBase):
     id: int
     user_id: int
+    price_per_hour: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RentalUser(BaseModel):
+    # Rentals are publicly readable, so the embedded user omits the email.
+    id: int
+    username: str
+    full_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RentalExpanded(Rental):
+    vehicle: Optional[Vehicle] = None
+    user: Optional[RentalUser] = None
+
+
+class ActiveRental(BaseModel):
+    rental_id: int
+    vehicle_id: int
+    user_id: int
+    start_time: datetime
+
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+class ActiveRentalCheck(BaseModel):
+    consistent: bool
+    registry: int
+    # Open in the database but absent from the registry, and the reverse.
+    missing: List[int]
+    stale: List[int]
+    # Present in both with a different vehicle, user or start time.
+    mismatched: List[int]
+    # Vehicles and users with more than one open rental, in the database or the registry.
+    duplicate_vehicles: List[int]
+    duplicate_users: List[int]
+    # Vehicles marked available that an open rental still holds.
+    available_while_rented: List[int]
+    repaired: bool = False
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional
+
+
+class GeoPoint(BaseModel):
+    lat: float
+    lng: float
+
+
+class RouteQuoteRequest(BaseModel):
+    vehicle_id: int
+    # Give either graph node ids or coordinates (snapped to the nearest node) for each end.
+    from_node: Optional[str] = None
+    to_node: Optional[str] = None
+    origin: Optional[GeoPoint] = None
+    destination: Optional[GeoPoint] = None
+
+    @model_validator(mode="after")
+    def check_endpoints(self):
+        if self.from_node is None and self.origin is None:
+            raise ValueError("from_node or origin is required")
+        if self.to_node is None and self.destination is None:
+            raise ValueError("to_node or destination is required")
+        return self
+
+
+class RouteQuote(BaseModel):
+    vehicle_id: int
+    from_node: str
+    to_node: str
+    distance_km: float
+    eta_minutes: float
+    price_per_hour: float
+    cost: float
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Optional
+
+# Largest id list one batch update accepts; filters have no limit.
+MAX_BATCH_IDS = 10000
+NOT_NULL_FIELDS = ("name", "vehicle_type", "price_per_hour", "available")
 
 
 class VehicleBase(BaseModel):
@@ -8,6 +12,8 @@ class VehicleBase(BaseModel):
     description: Optional[str] = None
     price_per_hour: float
     available: bool = True
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
 class VehicleCreate(VehicleBase):
@@ -20,9 +26,47 @@ class VehicleUpdate(BaseModel):
     description: Optional[str] = None
     price_per_hour: Optional[float] = None
     available: Optional[bool] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
 class Vehicle(VehicleBase):
     id: int
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VehicleNearby(Vehicle):
+    distance_km: float
+
+
+class VehicleFilter(BaseModel):
+    # Every given criterion must match; an empty filter selects the whole fleet.
+    vehicle_type: Optional[str] = None
+    available: Optional[bool] = None
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+
+
+class VehicleBatchUpdate(BaseModel):
+    # Give either ``ids`` or ``filter`` to choose the vehicles.
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BATCH_IDS)
+    filter: Optional[VehicleFilter] = None
+    changes: VehicleUpdate
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("give exactly one of ids or filter")
+        if not self.changes.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        cleared = [name for name in NOT_NULL_FIELDS if name in self.changes.model_fields_set
+                   and getattr(self.changes, name) is None]
+        if cleared:
+            raise ValueError(f"cannot clear {', '.join(cleared)}")
+        return self
+
+
+class VehicleBatchResult(BaseModel):
+    updated: int
+    ids: List[int]
@@ -0,0 +1,150 @@
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+
+class ActiveRental(NamedTuple):
+    rental_id: int
+    vehicle_id: int
+    user_id: int
+    start_time: datetime
+
+
+class UserHasOpenRentalError(ValueError):
+    pass
+
+
+class RegistryDrift(NamedTuple):
+    """Differences between the registry and the database's open rentals.
+
+    ``duplicate_vehicles`` and ``duplicate_users`` list keys holding more than
+    one open rental in either the database or the registry;
+    ``available_while_rented`` lists vehicles marked available that have one.
+    """
+
+    missing: list[int]
+    stale: list[int]
+    mismatched: list[int]
+    duplicate_vehicles: list[int]
+    duplicate_users: list[int]
+    available_while_rented: list[int]
+
+    @property
+    def consistent(self) -> bool:
+        return not any(self)
+
+
+class ActiveRentalRegistry:
+    """Open rentals (``end_time IS NULL``) held in memory, keyed by rental, vehicle and user.
+
+    It is rebuilt from the database at startup and kept current by after-commit
+    callbacks from ``RentalService``, so it only ever reflects committed
+    rentals. Fleet status reads it instead of scanning the rentals table.
+    It never decides whether a rental may open: that is the database's job,
+    through the unique open-rental indexes, since the registry may trail
+    writes made by other processes.
+
+    Each worker holds its own registry. Under the multi-worker launcher a
+    worker rebuilds it when it sees another worker move the shared catalog
+    version, so it trails the database by at most ``CATALOG_WATCH_SECONDS``.
+    """
+
+    def __init__(self):
+        self._rentals: dict[int, ActiveRental] = {}
+        self._by_vehicle: dict[int, set[int]] = {}
+        self._by_user: dict[int, set[int]] = {}
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self._rentals)
+
+    def rebuild(self, rows: Iterable) -> None:
+        """Replace the contents with ``(rental_id, vehicle_id, user_id, start_time)`` rows."""
+        with self._lock:
+            self._rentals.clear()
+            self._by_vehicle.clear()
+            self._by_user.clear()
+            for row in rows:
+                self._insert(ActiveRental(*row))
+            self.rebuilds += 1
+
+    def open(self, rental: ActiveRental) -> None:
+        with self._lock:
+            self._discard(rental.rental_id)
+            self._insert(rental)
+
+    def close(self, rental_id: int) -> None:
+        with self._lock:
+            self._discard(rental_id)
+
+    def for_vehicle(self, vehicle_id: int) -> list[ActiveRental]:
+        with self._lock:
+            return [self._rentals[rental_id] for rental_id in self._by_vehicle.get(vehicle_id, ())]
+
+    def for_user(self, user_id: int) -> list[ActiveRental]:
+        with self._lock:
+            return [self._rentals[rental_id] for rental_id in self._by_user.get(user_id, ())]
+
+    def snapshot(self) -> list[ActiveRental]:
+        """Every open rental, ordered by rental id."""
+        with self._lock:
+            return [self._rentals[rental_id] for rental_id in sorted(self._rentals)]
+
+    def diff(self, rows: Iterable, available_while_rented: Iterable[int] = ()) -> RegistryDrift:
+        """Compare against the database's open rentals given as ``rebuild`` rows.
+
+        ``available_while_rented`` is passed through from the caller, which
+        reads vehicle availability alongside the rows.
+        """
+        expected = {row[0]: ActiveRental(*row) for row in rows}
+        with self._lock:
+            actual = dict(self._rentals)
+        return RegistryDrift(
+            missing=sorted(expected.keys() - actual.keys()),
+            stale=sorted(actual.keys() - expected.keys()),
+            mismatched=sorted(
+                rental_id for rental_id in expected.keys() & actual.keys() if expected[rental_id] != actual[rental_id]
+            ),
+            duplicate_vehicles=_duplicates(expected, actual, "vehicle_id"),
+            duplicate_users=_duplicates(expected, actual, "user_id"),
+            available_while_rented=sorted(set(available_while_rented)),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "open": len(self._rentals),
+                "vehicles": len(self._by_vehicle),
+                "users": len(self._by_user),
+                "rebuilds": self.rebuilds,
+            }
+
+    def _insert(self, rental: ActiveRental) -> None:
+        self._rentals[rental.rental_id] = rental
+        self._by_vehicle.setdefault(rental.vehicle_id, set()).add(rental.rental_id)
+        self._by_user.setdefault(rental.user_id, set()).add(rental.rental_id)
+
+    def _discard(self, rental_id: int) -> None:
+        rental = self._rentals.pop(rental_id, None)
+        if rental is None:
+            return
+        for index, key in ((self._by_vehicle, rental.vehicle_id), (self._by_user, rental.user_id)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(rental_id)
+                if not ids:
+                    del index[key]
+
+
+def _duplicates(expected: dict, actual: dict, field: str) -> list[int]:
+    """Keys of ``field`` that more than one open rental shares on either side."""
+    duplicates = set()
+    for rentals in (expected, actual):
+        counts = Counter(getattr(rental, field) for rental in rentals.values())
+        duplicates.update(key for key, count in counts.items() if count > 1)
+    return sorted(duplicates)
+
+
+active_rentals = ActiveRentalRegistry()
@@ -0,0 +1,37 @@
+from typing import Collection
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.write_queue import write_queue
+from app.models.rental import Rental
+from app.schemas.rental import RentalCreate, RentalUpdate
+from app.services.rental_service import RentalService
+
+
+class AsyncRentalService:
+    """RentalService over an AsyncSession, delegating through ``run_sync``."""
+
+    def __init__(self, service: RentalService | None = None):
+        self.service = service or RentalService()
+
+    async def create_rental(self, db: AsyncSession, rental: RentalCreate) -> Rental:
+        if write_queue is not None:
+            return await write_queue.run_async(self.service.stage_create_rental, rental)
+        return await db.run_sync(self.service.create_rental, rental)
+
+    async def get_rental(self, db: AsyncSession, rental_id: int, expand: Collection[str] = ()) -> Rental | None:
+        return await db.run_sync(self.service.get_rental, rental_id, expand)
+
+    async def update_rental(self, db: AsyncSession, rental_id: int, rental_update: RentalUpdate) -> Rental | None:
+        if write_queue is not None:
+            return await write_queue.run_async(self.service.stage_update_rental, rental_id, rental_update)
+        return await db.run_sync(self.service.update_rental, rental_id, rental_update)
+
+    async def delete_rental(self, db: AsyncSession, rental_id: int) -> bool:
+        return await db.run_sync(self.service.delete_rental, rental_id)
+
+    async def get_all_rentals(self, db: AsyncSession, **filters) -> list[Rental]:
+        return await db.run_sync(self.service.get_all_rentals, **filters)
+
+    async def get_user_rentals(self, db: AsyncSession, user_id: int, **filters) -> list[Rental]:
+        return await db.run_sync(self.service.get_user_rentals, user_id, **filters)
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.user_service import UserService
+
+
+class AsyncUserService:
+    """UserService over an AsyncSession, delegating through ``run_sync``.
+
+    Only the lookups and profile edits are exposed: registration, login and
+    password changes are bcrypt-bound and stay on the sync routes, where the
+    hashing runs off the event loop.
+    """
+
+    def __init__(self, service: UserService | None = None):
+        self.service = service or UserService()
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        return await db.run_sync(self.service.get_user_by_email, email)
+
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        return await db.run_sync(self.service.get_user_by_id, user_id)
+
+    async def get_all_users(self, db: AsyncSession, **filters) -> list[User]:
+        return await db.run_sync(self.service.get_all_users, **filters)
+
+    async def delete_user(self, db: AsyncSession, user_id: int) -> bool:
+        return await db.run_sync(self.service.delete_user, user_id)
+
+    async def update_user(
+        self,
+        db: AsyncSession,
+        user: User,
+        *,
+        email: Optional[str],
+        username: Optional[str],
+        full_name: Optional[str],
+    ) -> User:
+        return await db.run_sync(
+            self.service.update_user, user, email=email, username=username, full_name=full_name
+        )
@@ -0,0 +1,38 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.vehicle import Vehicle
+from app.schemas.vehicle import VehicleCreate, VehicleUpdate
+from app.services.vehicle_service import VehicleService
+
+
+class AsyncVehicleService:
+    """VehicleService over an AsyncSession.
+
+    Each call runs the sync service through ``AsyncSession.run_sync``, so the
+    queries stay defined in one place while I/O goes through the async driver
+    on the event loop instead of a threadpool worker.
+    """
+
+    def __init__(self, service: VehicleService | None = None):
+        self.service = service or VehicleService()
+
+    async def create_vehicle(self, db: AsyncSession, vehicle: VehicleCreate) -> Vehicle:
+        return await db.run_sync(self.service.create_vehicle, vehicle)
+
+    async def get_vehicle(self, db: AsyncSession, vehicle_id: int) -> Vehicle | None:
+        return await db.run_sync(self.service.get_vehicle, vehicle_id)
+
+    async def update_vehicle(self, db: AsyncSession, vehicle_id: int, vehicle: VehicleUpdate) -> Vehicle | None:
+        return await db.run_sync(self.service.update_vehicle, vehicle_id, vehicle)
+
+    async def delete_vehicle(self, db: AsyncSession, vehicle_id: int) -> bool:
+        return await db.run_sync(self.service.delete_vehicle, vehicle_id)
+
+    async def get_all_vehicles(self, db: AsyncSession, **filters) -> list[Vehicle]:
+        return await db.run_sync(self.service.get_all_vehicles, **filters)
+
+    async def get_nearby_vehicles(self, db: AsyncSession, **query) -> list[tuple[Vehicle, float]]:
+        return await db.run_sync(self.service.get_nearby_vehicles, **query)
+
+    async def search_vehicles(self, db: AsyncSession, **filters) -> list[Vehicle]:
+        return await db.run_sync(self.service.search_vehicles, **filters)
@@ -0,0 +1,261 @@
+import csv
+import json
+from datetime import datetime
+from typing import Iterable, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.catalog_version import catalog_version
+from app.core.live_feed import vehicle_feed
+from app.models.rental import Rental
+from app.models.user import User
+from app.models.vehicle import Vehicle
+from app.schemas.imports import ImportLineError, ImportReport
+from app.schemas.rental import RentalCreate
+from app.schemas.vehicle import VehicleCreate
+from app.services.active_rentals import ActiveRental, active_rentals
+from app.services.rental_service import RentalService, VehicleNotFoundError, VehicleUnavailableError
+from app.services.rollup_service import ClosedRental, RollupService, utc_naive
+from app.services.spatial_index import vehicle_index
+from app.services.vehicle_service import BATCH_FEED_DELTAS
+
+ImportKind = Literal["vehicles", "rentals"]
+ImportFormat = Literal["ndjson", "csv"]
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+rollup_service = RollupService()
+rental_service = RentalService()
+
+
+class RecordParser:
+    """Turns NDJSON or CSV text into dicts one line at a time.
+
+    CSV input takes its column names from the first line; quoted fields may
+    not span lines, since records are parsed as the lines arrive.
+    """
+
+    def __init__(self, fmt: ImportFormat):
+        self.fmt = fmt
+        self.header: list[str] | None = None
+
+    def parse(self, line: str) -> dict | None:
+        """Return the record on ``line``, None for header/blank lines; raise ValueError if malformed."""
+        if not line.strip():
+            return None
+        if self.fmt == "ndjson":
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Expected a JSON object")
+            return record
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} columns, got {len(values)}")
+        # Empty CSV cells mean "not given", so optional fields fall back to their defaults.
+        return {name: value for name, value in zip(self.header, values) if value != ""}
+
+
+class ImportBatcher:
+    """Collects parsed records into chunks, logging unparseable lines on the report."""
+
+    def __init__(self, fmt: ImportFormat, chunk_size: int, report: ImportReport):
+        self.parser = RecordParser(fmt)
+        self.chunk_size = chunk_size
+        self.report = report
+        self.line_no = 0
+        self._chunk: list[tuple[int, dict]] = []
+
+    def add(self, line: str) -> list[tuple[int, dict]] | None:
+        """Consume one line; return a full chunk when one is ready."""
+        self.line_no += 1
+        try:
+            record = self.parser.parse(line)
+        except ValueError as exc:
+            record_failure(self.report, self.line_no, str(exc))
+            return None
+        if record is not None:
+            self._chunk.append((self.line_no, record))
+        if len(self._chunk) >= self.chunk_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> list[tuple[int, dict]] | None:
+        chunk, self._chunk = self._chunk, []
+        return chunk or None
+
+
+def record_failure(report: ImportReport, line_no: int, error: str) -> None:
+    report.failed += 1
+    if len(report.errors) < MAX_REPORTED_ERRORS:
+        report.errors.append(ImportLineError(line=line_no, error=error))
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}" for err in exc.errors()
+        )
+    return str(exc)
+
+
+class ImportService:
+    """Streams vehicle and rental records into the database in chunks.
+
+    ``open_rentals=False`` reports open rentals as failed lines instead of
+    importing them, for callers outside the server whose writes the workers
+    would otherwise never hear about.
+    """
+
+    def __init__(self, open_rentals: bool = True):
+        self.open_rentals = open_rentals
+
+    def import_chunk(self, db: Session, kind: ImportKind, records: list[tuple[int, dict]], report: ImportReport) -> None:
+        """Validate and insert one chunk of ``(line_no, record)`` pairs in a single transaction."""
+        positioned = []
+        opened = []
+        try:
+            if kind == "vehicles":
+                rows = self._validate(records, VehicleCreate, report)
+                if rows:
+                    positioned = self._insert_vehicles(db, [row for _, row in rows])
+            else:
+                rows = [
+                    (line_no, {k: utc_naive(v) if isinstance(v, datetime) else v for k, v in row.items()})
+                    for line_no, row in self._validate(records, RentalCreate, report)
+                ]
+                rows = self._check_references(db, rows, report)
+                rows = self._claim_open_rentals(db, rows, report)
+                if rows:
+                    opened = self._insert_rentals(db, [row for _, row in rows])
+                    rollup_service.record(db, [
+                        ClosedRental(row["vehicle_id"], row["start_time"], row["end_time"], row["total_cost"])
+                        for _, row in rows
+                    ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        report.inserted += len(rows)
+        for vehicle_id, lat, lng, available in positioned:
+            vehicle_index.upsert(vehicle_id, lat, lng, available)
+        if kind == "vehicles" and rows:
+            catalog_version.bump()
+            # Too many rows to send one by one; subscribers re-fetch instead.
+            vehicle_feed.publish("reset", {})
+        if opened:
+            for entry in opened:
+                active_rentals.open(ActiveRental(*entry))
+                vehicle_index.set_available(entry[1], False)
+            catalog_version.bump()
+            if len(opened) > BATCH_FEED_DELTAS:
+                vehicle_feed.publish("reset", {})
+            else:
+                for entry in opened:
+                    vehicle_feed.publish("vehicle", {"id": entry[1], "available": False})
+
+    def import_lines(
+        self,
+        db: Session,
+        kind: ImportKind,
+        lines: Iterable[str],
+        fmt: ImportFormat = "ndjson",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ImportReport:
+        """Stream ``lines`` into the database, holding at most one chunk in memory."""
+        report = ImportReport()
+        batcher = ImportBatcher(fmt, chunk_size, report)
+        for line in lines:
+            chunk = batcher.add(line.rstrip("\r\n"))
+            if chunk:
+                self.import_chunk(db, kind, chunk, report)
+        chunk = batcher.flush()
+        if chunk:
+            self.import_chunk(db, kind, chunk, report)
+        report.errors.sort(key=lambda error: error.line)
+        return report
+
+    def _validate(self, records, schema, report: ImportReport) -> list[tuple[int, dict]]:
+        rows = []
+        for line_no, record in records:
+            try:
+                rows.append((line_no, schema.model_validate(record).model_dump()))
+            except ValidationError as exc:
+                record_failure(report, line_no, _describe(exc))
+        return rows
+
+    def _check_references(self, db: Session, rows, report: ImportReport) -> list[tuple[int, dict]]:
+        # One lookup per chunk for each referenced table instead of one per row.
+        vehicle_ids = {row["vehicle_id"] for _, row in rows}
+        user_ids = {row["user_id"] for _, row in rows}
+        known_vehicles = {vid for (vid,) in db.query(Vehicle.id).filter(Vehicle.id.in_(vehicle_ids))}
+        known_users = {uid for (uid,) in db.query(User.id).filter(User.id.in_(user_ids))}
+        valid = []
+        for line_no, row in rows:
+            if row["vehicle_id"] not in known_vehicles:
+                record_failure(report, line_no, f"vehicle_id: unknown vehicle {row['vehicle_id']}")
+            elif row["user_id"] not in known_users:
+                record_failure(report, line_no, f"user_id: unknown user {row['user_id']}")
+            else:
+                valid.append((line_no, row))
+        return valid
+
+    def _claim_open_rentals(self, db: Session, rows, report: ImportReport) -> list[tuple[int, dict]]:
+        """Give open rentals the same guarantees as ``POST /rentals/``; conflicting lines are reported.
+
+        A user may hold one open rental, counting those already in the
+        database and those earlier in the chunk, and each vehicle is claimed
+        with the same conditional UPDATE, so an import can neither double-book
+        a vehicle nor a user. The unique open-rental indexes back both checks.
+        """
+        open_users = {row["user_id"] for _, row in rows if row["end_time"] is None}
+        if not open_users:
+            return rows
+        busy_users = {
+            uid for (uid,) in db.query(Rental.user_id).filter(Rental.end_time.is_(None), Rental.user_id.in_(open_users))
+        }
+        valid = []
+        for line_no, row in rows:
+            if row["end_time"] is not None:
+                valid.append((line_no, row))
+                continue
+            if not self.open_rentals:
+                record_failure(report, line_no, "end_time: open rentals cannot be imported here")
+                continue
+            if row["user_id"] in busy_users:
+                record_failure(report, line_no, f"user_id: user {row['user_id']} already has an open rental")
+                continue
+            try:
+                row["price_per_hour"] = rental_service.claim_vehicle(db, row["vehicle_id"])
+            except (VehicleNotFoundError, VehicleUnavailableError):
+                record_failure(report, line_no, f"vehicle_id: vehicle {row['vehicle_id']} is not available")
+                continue
+            busy_users.add(row["user_id"])
+            valid.append((line_no, row))
+        return valid
+
+    def _insert_vehicles(self, db: Session, rows: list[dict]) -> list[tuple]:
+        """Insert in one executemany and return the rows that belong in the spatial index."""
+        inserted = db.execute(
+            insert(Vehicle).returning(Vehicle.id, Vehicle.latitude, Vehicle.longitude, Vehicle.available),
+            rows,
+        ).all()
+        return [row for row in inserted if row[1] is not None and row[2] is not None]
+
+    def _insert_rentals(self, db: Session, rows: list[dict]) -> list[tuple]:
+        """Insert closed rentals in one executemany, open ones with RETURNING for the active-rental registry."""
+        closed = [row for row in rows if row["end_time"] is not None]
+        still_open = [row for row in rows if row["end_time"] is None]
+        if closed:
+            db.execute(insert(Rental), closed)
+        if not still_open:
+            return []
+        return db.execute(
+            insert(Rental).returning(Rental.id, Rental.vehicle_id, Rental.user_id, Rental.start_time),
+            still_open,
+        ).all()
@@ -0,0 +1,228 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.catalog_version import catalog_version
+from app.core.config import settings
+from app.core.live_feed import vehicle_feed
+from app.models.rental import Rental
+from app.models.rental_rollup import RentalHourlyRollup
+from app.models.vehicle import Vehicle
+from app.services.rollup_service import bucket_start
+from app.services.vehicle_service import BATCH_FEED_DELTAS
+
+logger = logging.getLogger(__name__)
+
+_vehicles = Vehicle.__table__
+# One executemany; a vehicle whose base price an admin changed since it was read is left alone.
+_SET_PRICE = (
+    update(_vehicles)
+    .where(
+        _vehicles.c.id == bindparam("vehicle_id"),
+        func.coalesce(_vehicles.c.base_price_per_hour, _vehicles.c.price_per_hour) == bindparam("base"),
+    )
+    .values(price_per_hour=bindparam("price"))
+)
+
+
+class Fleet(NamedTuple):
+    """Every vehicle as parallel arrays, ordered by id."""
+
+    ids: np.ndarray
+    type_codes: np.ndarray
+    types: list[str]
+    base: np.ndarray
+    current: np.ndarray
+
+
+class PricingEngine:
+    """Reprices the whole fleet from recent demand on a background thread.
+
+    Each run reads the fleet and the rentals started in the trailing window
+    (closed ones from the hourly rollups, open ones from the partial index
+    over open rentals), computes every new price in one NumPy pass and
+    writes the changed ones with a single executemany in one transaction.
+    Readers therefore see either the old or the new price list, never a mix,
+    and the read path only ever reads ``price_per_hour``.
+
+    A vehicle's demand blends its own rental count with its type's average,
+    is mapped through its type's piecewise-linear curve to a multiplier of
+    the base price, and the result is capped and rate-limited per run.
+    New prices only apply to rentals opened afterwards; an open rental is
+    charged the rate stored on it when it started.
+    """
+
+    def __init__(
+        self,
+        curves: dict[str, Sequence[tuple[float, float]]],
+        *,
+        window: timedelta,
+        interval: float,
+        vehicle_weight: float,
+        min_multiplier: float,
+        max_multiplier: float,
+        max_step: float,
+    ):
+        if "default" not in curves:
+            raise ValueError("pricing curves need a 'default' entry")
+        self.curves = {}
+        for vehicle_type, points in curves.items():
+            xs, ys = (np.asarray(axis, dtype=float) for axis in zip(*points))
+            if len(xs) == 0 or np.any(np.diff(xs) <= 0):
+                raise ValueError(f"pricing curve {vehicle_type!r} needs increasing demand points")
+            self.curves[vehicle_type] = (xs, ys)
+        self.window = window
+        self.interval = interval
+        self.vehicle_weight = vehicle_weight
+        self.min_multiplier = min_multiplier
+        self.max_multiplier = max_multiplier
+        self.max_step = max_step
+        self.runs = 0
+        self.failures = 0
+        self.last_repriced = 0
+        self.last_run_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._sessionmaker: sessionmaker | None = None
+
+    def start(self, sessionmaker: sessionmaker) -> None:
+        if self._thread is not None:
+            return
+        self._sessionmaker = sessionmaker
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pricing-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with self._sessionmaker() as db:
+                    self.run_once(db)
+            except Exception:
+                self.failures += 1
+                logger.exception("pricing run failed")
+
+    def run_once(self, db: Session, now: datetime | None = None) -> int:
+        """Reprice the fleet once; returns how many prices changed."""
+        started = time.perf_counter()
+        fleet = self.load_fleet(db)
+        demand = self.load_demand(db, fleet.ids, (now or datetime.utcnow()) - self.window)
+        prices = self.price(fleet, demand)
+        changed = np.flatnonzero(np.abs(prices - fleet.current) >= 0.005)
+        repriced = 0
+        if changed.size:
+            params = [
+                {"vehicle_id": int(vehicle_id), "base": float(base), "price": float(price)}
+                for vehicle_id, base, price in zip(fleet.ids[changed], fleet.base[changed], prices[changed])
+            ]
+            repriced = db.execute(_SET_PRICE, params).rowcount
+            db.commit()
+        if repriced:
+            catalog_version.bump()
+            if repriced != changed.size or repriced > BATCH_FEED_DELTAS:
+                vehicle_feed.publish("reset", {})
+            else:
+                for row in params:
+                    vehicle_feed.publish("vehicle", {"id": row["vehicle_id"], "price": row["price"]})
+        self.runs += 1
+        self.last_repriced = repriced
+        self.last_run_seconds = time.perf_counter() - started
+        return repriced
+
+    def load_fleet(self, db: Session) -> Fleet:
+        rows = db.execute(
+            select(
+                Vehicle.id,
+                Vehicle.vehicle_type,
+                func.coalesce(Vehicle.base_price_per_hour, Vehicle.price_per_hour),
+                Vehicle.price_per_hour,
+            ).order_by(Vehicle.id)
+        ).all()
+        if not rows:
+            empty = np.empty(0)
+            return Fleet(empty.astype(np.int64), empty.astype(np.int64), [], empty, empty)
+        ids, vehicle_types, base, current = zip(*rows)
+        types, type_codes = np.unique(np.asarray(vehicle_types, dtype=object), return_inverse=True)
+        return Fleet(
+            np.asarray(ids, dtype=np.int64),
+            type_codes,
+            list(types),
+            np.asarray(base, dtype=float),
+            np.asarray(current, dtype=float),
+        )
+
+    def load_demand(self, db: Session, ids: np.ndarray, since: datetime) -> np.ndarray:
+        """Rentals started since ``since`` for each vehicle in ``ids`` (sorted), as floats."""
+        closed = db.execute(
+            select(RentalHourlyRollup.vehicle_id, func.sum(RentalHourlyRollup.rentals))
+            .where(RentalHourlyRollup.bucket_start >= bucket_start(since, "hour"))
+            .group_by(RentalHourlyRollup.vehicle_id)
+        ).all()
+        still_open = db.execute(
+            select(Rental.vehicle_id, func.count())
+            .where(Rental.end_time.is_(None), Rental.start_time >= since)
+            .group_by(Rental.vehicle_id)
+        ).all()
+        demand = np.zeros(len(ids))
+        for rows in (closed, still_open):
+            if not rows or not len(ids):
+                continue
+            vehicle_ids, counts = (np.asarray(column) for column in zip(*rows))
+            positions = np.searchsorted(ids, vehicle_ids)
+            # Rollups outlive deleted vehicles; only count rows that map onto the fleet.
+            known = positions < len(ids)
+            known[known] = ids[positions[known]] == vehicle_ids[known]
+            np.add.at(demand, positions[known], counts[known].astype(float))
+        return demand
+
+    def price(self, fleet: Fleet, demand: np.ndarray) -> np.ndarray:
+        """New price for every vehicle in ``fleet``, rounded to cents."""
+        if not len(fleet.ids):
+            return fleet.current
+        per_type = np.bincount(fleet.type_codes, weights=demand) / np.bincount(fleet.type_codes)
+        blended = self.vehicle_weight * demand + (1 - self.vehicle_weight) * per_type[fleet.type_codes]
+        multiplier = np.empty(len(fleet.ids))
+        for code, vehicle_type in enumerate(fleet.types):
+            xs, ys = self.curves.get(vehicle_type, self.curves["default"])
+            members = fleet.type_codes == code
+            multiplier[members] = np.interp(blended[members], xs, ys)
+        floor, ceiling = fleet.base * self.min_multiplier, fleet.base * self.max_multiplier
+        target = np.clip(fleet.base * multiplier, floor, ceiling)
+        stepped = np.clip(target, fleet.current * (1 - self.max_step), fleet.current * (1 + self.max_step))
+        return np.round(np.clip(stepped, floor, ceiling), 2)
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_repriced": self.last_repriced,
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+pricing_engine = (
+    PricingEngine(
+        settings.PRICING_CURVES,
+        window=timedelta(hours=settings.PRICING_WINDOW_HOURS),
+        interval=settings.PRICING_INTERVAL_SECONDS,
+        vehicle_weight=settings.PRICING_VEHICLE_WEIGHT,
+        min_multiplier=settings.PRICING_MIN_MULTIPLIER,
+        max_multiplier=settings.PRICING_MAX_MULTIPLIER,
+        max_step=settings.PRICING_MAX_STEP,
+    )
+    if settings.PRICING_ENABLED
+    else None
+)
@@ -1,35 +1,314 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Collection, Iterator, Sequence
+
+from sqlalchemy import Row, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.core.catalog_version import catalog_version
+from app.core.live_feed import vehicle_feed
+from app.db.session import after_commit
+from app.db.write_queue import write_queue
 from app.models.rental import Rental
+from app.models.vehicle import Vehicle
 from app.schemas.rental import RentalCreate, RentalUpdate
+from app.services.active_rentals import ActiveRental, RegistryDrift, UserHasOpenRentalError, active_rentals
+from app.services.rollup_service import ClosedRental, RollupService, utc_naive
+from app.services.route_service import fare
+from app.services.spatial_index import vehicle_index
+
+
+rollup_service = RollupService()
+
+EXPANDABLE = {"vehicle": Rental.vehicle, "user": Rental.user}
+
+
+class VehicleNotFoundError(LookupError):
+    pass
+
+
+class VehicleUnavailableError(ValueError):
+    pass
+
+
+class RentalReopenError(ValueError):
+    pass
+
+
+def open_rental_conflict(exc: IntegrityError) -> ValueError:
+    """The error a unique open-rental index violation stands for."""
+    message = str(exc.orig)
+    if "ix_rentals_open_user" in message or "rentals.user_id" in message:
+        return UserHasOpenRentalError("User already has an open rental")
+    return VehicleUnavailableError("Vehicle is not available")
 
 
 class RentalService:
     def create_rental(self, db: Session, rental: RentalCreate) -> Rental:
-        db_rental = Rental(**rental.model_dump())
-        db.add(db_rental)
+        if write_queue is not None:
+            return write_queue.run(self.stage_create_rental, rental)
+        try:
+            db_rental = self.stage_create_rental(db, rental)
+        except (VehicleNotFoundError, VehicleUnavailableError, UserHasOpenRentalError):
+            db.rollback()
+            raise
         db.commit()
         db.refresh(db_rental)
         return db_rental
 
-    def get_rental(self, db: Session, rental_id: int) -> Rental:
-        return db.query(Rental).filter(Rental.id == rental_id).first()
+    def stage_create_rental(self, db: Session, rental: RentalCreate) -> Rental:
+        """Claim the vehicle and the user's open-rental slot and insert the rental without committing."""
+        db_rental = Rental(**self._normalized(rental.model_dump()))
+        if db_rental.end_time is None:
+            # The claim writes first, so the transaction holds the write lock
+            # before it reads the user's open rentals.
+            db_rental.price_per_hour = self.claim_vehicle(db, rental.vehicle_id)
+            if self.has_open_rental(db, rental.user_id):
+                raise UserHasOpenRentalError("User already has an open rental")
+            self._on_commit_set_available(db, rental.vehicle_id, False)
+        else:
+            rollup_service.record_rental(db, db_rental)
+        db.add(db_rental)
+        try:
+            db.flush()
+        except IntegrityError as exc:
+            # The unique open-rental indexes catch a concurrent writer the checks above could not see.
+            raise open_rental_conflict(exc) from exc
+        if db_rental.end_time is None:
+            self._on_commit_track(db, db_rental)
+        return db_rental
+
+    def has_open_rental(self, db: Session, user_id: int) -> bool:
+        # Asks the database, not the registry, which may trail other processes' writes.
+        return db.query(Rental.id).filter(Rental.user_id == user_id, Rental.end_time.is_(None)).first() is not None
+
+    def _normalized(self, values: dict) -> dict:
+        # Store naive UTC so stored times compare and bucket consistently.
+        return {key: utc_naive(value) if isinstance(value, datetime) else value for key, value in values.items()}
+
+    def claim_vehicle(self, db: Session, vehicle_id: int) -> float:
+        """Take the vehicle and return its current hourly price, the rate the rental will be charged."""
+        # A single conditional UPDATE both checks and takes the vehicle, so two
+        # racing requests cannot both see it as available; the loser matches no
+        # row and fails without waiting on the winner's transaction to finish.
+        price = db.execute(
+            update(Vehicle)
+            .where(Vehicle.id == vehicle_id, Vehicle.available.is_(True))
+            .values(available=False)
+            .returning(Vehicle.price_per_hour)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if price is not None:
+            return price
+        if db.query(Vehicle.id).filter(Vehicle.id == vehicle_id).first() is None:
+            raise VehicleNotFoundError("Vehicle not found")
+        raise VehicleUnavailableError("Vehicle is not available")
+
+    def _rental_cost(self, db: Session, rental: Rental) -> float | None:
+        price = rental.price_per_hour
+        if price is None:
+            # Rentals created closed, or opened before rates were stored, fall back to today's price.
+            price = db.query(Vehicle.price_per_hour).filter(Vehicle.id == rental.vehicle_id).scalar()
+        if price is None:
+            return None
+        hours = (utc_naive(rental.end_time) - utc_naive(rental.start_time)).total_seconds() / 3600
+        return fare(price, hours)
+
+    def _release_vehicle(self, db: Session, vehicle_id: int) -> None:
+        db.execute(
+            update(Vehicle)
+            .where(Vehicle.id == vehicle_id)
+            .values(available=True)
+            .execution_options(synchronize_session=False)
+        )
+        self._on_commit_set_available(db, vehicle_id, True)
+
+    def _on_commit_set_available(self, db: Session, vehicle_id: int, available: bool) -> None:
+        def publish():
+            vehicle_index.set_available(vehicle_id, available)
+            catalog_version.bump()
+            vehicle_feed.publish("vehicle", {"id": vehicle_id, "available": available})
+
+        after_commit(db, publish)
+
+    def _on_commit_track(self, db: Session, rental: Rental) -> None:
+        # Captured now: the instance may be expired or detached by the time the callback runs.
+        entry = ActiveRental(rental.id, rental.vehicle_id, rental.user_id, rental.start_time)
+        if rental.end_time is None:
+            after_commit(db, lambda: active_rentals.open(entry))
+        else:
+            after_commit(db, lambda: active_rentals.close(entry.rental_id))
+
+    def get_rental(self, db: Session, rental_id: int, expand: Collection[str] = ()) -> Rental:
+        query = db.query(Rental).filter(Rental.id == rental_id)
+        if expand:
+            # One row, so joining the related rows in costs nothing extra.
+            query = query.options(*(joinedload(EXPANDABLE[name]) for name in expand))
+        return query.first()
 
     def update_rental(self, db: Session, rental_id: int, rental_update: RentalUpdate) -> Rental:
-        db_rental = self.get_rental(db, rental_id)
+        if write_queue is not None:
+            return write_queue.run(self.stage_update_rental, rental_id, rental_update)
+        db_rental = self.stage_update_rental(db, rental_id, rental_update)
         if db_rental:
-            for key, value in rental_update.model_dump(exclude_unset=True).items():
-                setattr(db_rental, key, value)
             db.commit()
             db.refresh(db_rental)
         return db_rental
 
+    def stage_update_rental(self, db: Session, rental_id: int, rental_update: RentalUpdate) -> Rental | None:
+        """Apply the update (pricing, releasing the vehicle and rolling up on close) without committing."""
+        db_rental = self.get_rental(db, rental_id)
+        if db_rental:
+            was_open = db_rental.end_time is None
+            if not was_open and "end_time" in rental_update.model_fields_set and rental_update.end_time is None:
+                # Reopening would skip the vehicle claim and the user's open-rental check.
+                raise RentalReopenError("A closed rental cannot be reopened")
+            before = ClosedRental(db_rental.vehicle_id, db_rental.start_time, db_rental.end_time, db_rental.total_cost)
+            changes = self._normalized(rental_update.model_dump(exclude_unset=True))
+            for key, value in changes.items():
+                setattr(db_rental, key, value)
+            if changes.get("end_time") is not None and changes.get("total_cost") is None:
+                db_rental.total_cost = self._rental_cost(db, db_rental)
+            if was_open and db_rental.end_time is not None:
+                self._release_vehicle(db, db_rental.vehicle_id)
+            if changes:
+                # Editing an already closed rental swaps its old contribution for the new one.
+                if not was_open:
+                    rollup_service.record(db, [before], sign=-1)
+                rollup_service.record_rental(db, db_rental)
+            db.flush()
+            if was_open or db_rental.end_time is None:
+                self._on_commit_track(db, db_rental)
+        return db_rental
+
     def delete_rental(self, db: Session, rental_id: int) -> bool:
         db_rental = self.get_rental(db, rental_id)
         if db_rental:
+            if db_rental.end_time is None:
+                self._release_vehicle(db, db_rental.vehicle_id)
+            else:
+                rollup_service.record_rental(db, db_rental, sign=-1)
             db.delete(db_rental)
+            after_commit(db, lambda: active_rentals.close(rental_id))
             db.commit()
             return True
         return False
 
-    def get_all_rentals(self, db: Session) -> list[Rental]:
-        return db.query(Rental).all()
\ No newline at end of file
+    def open_rental_rows(self, db: Session) -> list[Row]:
+        """``(id, vehicle_id, user_id, start_time)`` of every open rental, as the registry holds them."""
+        return (
+            db.query(Rental.id, Rental.vehicle_id, Rental.user_id, Rental.start_time)
+            .filter(Rental.end_time.is_(None))
+            .all()
+        )
+
+    def rebuild_active_registry(self, db: Session) -> int:
+        rows = self.open_rental_rows(db)
+        active_rentals.rebuild(rows)
+        return len(rows)
+
+    def available_while_rented(self, db: Session) -> list[int]:
+        """Vehicles marked available although an open rental holds them."""
+        open_rental = select(Rental.id).where(Rental.vehicle_id == Vehicle.id, Rental.end_time.is_(None))
+        return list(db.scalars(select(Vehicle.id).where(Vehicle.available.is_(True), open_rental.exists())))
+
+    def check_active_registry(self, db: Session) -> RegistryDrift:
+        return active_rentals.diff(self.open_rental_rows(db), self.available_while_rented(db))
+
+    def repair_active_registry(self, db: Session, drift: RegistryDrift) -> int:
+        """Take back vehicles marked available while rented, then rebuild the registry; returns its size."""
+        for vehicle_id in drift.available_while_rented:
+            db.execute(
+                update(Vehicle)
+                .where(Vehicle.id == vehicle_id)
+                .values(available=False)
+                .execution_options(synchronize_session=False)
+            )
+            self._on_commit_set_available(db, vehicle_id, False)
+        db.commit()
+        return self.rebuild_active_registry(db)
+
+    def get_all_rentals(
+        self,
+        db: Session,
+        *,
+        after_id: int | None = None,
+        limit: int | None = None,
+        user_id: int | None = None,
+        vehicle_id: int | None = None,
+        active: bool | None = None,
+        expand: Collection[str] = (),
+        columns: Sequence | None = None,
+    ) -> list[Rental]:
+        # ``columns`` selects plain rows instead of entities for the fast list path.
+        query = db.query(*columns) if columns else db.query(Rental)
+        if expand:
+            # One extra IN (...) query per relationship, however many rentals are on the page.
+            query = query.options(*(selectinload(EXPANDABLE[name]) for name in expand))
+        if user_id is not None:
+            query = query.filter(Rental.user_id == user_id)
+        if vehicle_id is not None:
+            query = query.filter(Rental.vehicle_id == vehicle_id)
+        if active is not None:
+            query = query.filter(Rental.end_time.is_(None) if active else Rental.end_time.is_not(None))
+        if after_id is not None:
+            query = query.filter(Rental.id > after_id)
+        query = query.order_by(Rental.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_user_rentals(
+        self,
+        db: Session,
+        user_id: int,
+        *,
+        start_from: datetime | None = None,
+        start_to: datetime | None = None,
+        before: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+        columns: Sequence | None = None,
+    ) -> list[Rental]:
+        """One user's rentals, newest first, continuing after the ``(start_time, id)`` in ``before``.
+
+        Every filter is a range on ix_rentals_user_start, so a page costs the
+        same however long the user's history is.
+        """
+        query = db.query(*columns) if columns else db.query(Rental)
+        query = query.filter(Rental.user_id == user_id)
+        if start_from is not None:
+            query = query.filter(Rental.start_time >= utc_naive(start_from))
+        if start_to is not None:
+            query = query.filter(Rental.start_time < utc_naive(start_to))
+        if before is not None:
+            # A row-value comparison stays a single index range; the equivalent
+            # OR of two predicates makes SQLite walk the user's whole history.
+            before_time, before_id = before
+            query = query.filter(tuple_(Rental.start_time, Rental.id) < (utc_naive(before_time), before_id))
+        query = query.order_by(Rental.start_time.desc(), Rental.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def iter_rentals(
+        self,
+        db: Session,
+        *,
+        start_from: datetime | None = None,
+        start_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """Yield rental rows as plain tuples, fetched ``batch_size`` at a time via a server-side cursor."""
+        stmt = select(
+            Rental.id,
+            Rental.user_id,
+            Rental.vehicle_id,
+            Rental.start_time,
+            Rental.end_time,
+            Rental.total_cost,
+        )
+        if start_from is not None:
+            stmt = stmt.where(Rental.start_time >= utc_naive(start_from))
+        if start_to is not None:
+            stmt = stmt.where(Rental.start_time < utc_naive(start_to))
+        stmt = stmt.order_by(Rental.id).execution_options(stream_results=True, yield_per=batch_size)
+        yield from db.execute(stmt)
@@ -0,0 +1,155 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Literal, NamedTuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.rental import Rental
+from app.models.rental_rollup import RentalDailyRollup, RentalHourlyRollup
+from app.models.vehicle import Vehicle
+
+Granularity = Literal["hour", "day"]
+
+ROLLUP_MODELS = {"hour": RentalHourlyRollup, "day": RentalDailyRollup}
+BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+REBUILD_BATCH_SIZE = 5000
+
+
+class ClosedRental(NamedTuple):
+    vehicle_id: int
+    start_time: datetime
+    end_time: datetime
+    total_cost: float | None
+
+
+def bucket_start(value: datetime, granularity: Granularity) -> datetime:
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def utc_naive(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes while clients may send offsets.
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class RollupService:
+    """Keeps the hourly and daily rental rollups in step with closed rentals.
+
+    Every change is an additive delta (``sign=-1`` takes a rental back out),
+    applied with an upsert in the caller's transaction, so the rollups commit
+    or roll back together with the rental itself. ``rebuild`` recomputes
+    both tables from the rentals table.
+    """
+
+    def record(self, db: Session, rentals: Iterable[ClosedRental], sign: int = 1) -> None:
+        rentals = [r for r in rentals if r.end_time is not None]
+        if not rentals:
+            return
+        vehicle_ids = {r.vehicle_id for r in rentals}
+        types = dict(db.query(Vehicle.id, Vehicle.vehicle_type).filter(Vehicle.id.in_(vehicle_ids)))
+        self._apply(db, [(r, types.get(r.vehicle_id)) for r in rentals], sign)
+
+    def record_rental(self, db: Session, rental: Rental, sign: int = 1) -> None:
+        self.record(db, [ClosedRental(rental.vehicle_id, rental.start_time, rental.end_time, rental.total_cost)], sign)
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute both rollup tables from every closed rental; returns how many were counted."""
+        for model in ROLLUP_MODELS.values():
+            db.execute(delete(model))
+        stmt = (
+            select(Rental.vehicle_id, Rental.start_time, Rental.end_time, Rental.total_cost, Vehicle.vehicle_type)
+            .join(Vehicle, Vehicle.id == Rental.vehicle_id)
+            .where(Rental.end_time.is_not(None))
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+        counted = 0
+        for partition in db.execute(stmt).partitions():
+            self._apply(db, [(ClosedRental(*row[:4]), row[4]) for row in partition], 1)
+            counted += len(partition)
+        db.commit()
+        return counted
+
+    def _apply(self, db: Session, rentals: list[tuple[ClosedRental, str | None]], sign: int) -> None:
+        for granularity, model in ROLLUP_MODELS.items():
+            deltas: dict[tuple[datetime, int], list] = defaultdict(lambda: [None, 0, 0.0, 0.0])
+            for rental, vehicle_type in rentals:
+                if vehicle_type is None:
+                    continue
+                start, end = utc_naive(rental.start_time), utc_naive(rental.end_time)
+                row = deltas[(bucket_start(start, granularity), rental.vehicle_id)]
+                row[0] = vehicle_type
+                row[1] += sign
+                row[2] += sign * (rental.total_cost or 0.0)
+                for bucket, seconds in self._overlaps(start, end, granularity):
+                    row = deltas[(bucket, rental.vehicle_id)]
+                    row[0] = vehicle_type
+                    row[3] += sign * seconds
+            if deltas:
+                self._upsert(db, model, [
+                    {
+                        "bucket_start": bucket,
+                        "vehicle_id": vehicle_id,
+                        "vehicle_type": vehicle_type,
+                        "rentals": rentals_delta,
+                        "revenue": revenue,
+                        "rented_seconds": seconds,
+                    }
+                    for (bucket, vehicle_id), (vehicle_type, rentals_delta, revenue, seconds) in deltas.items()
+                ])
+
+    def _overlaps(self, start: datetime, end: datetime, granularity: Granularity):
+        step = timedelta(seconds=BUCKET_SECONDS[granularity])
+        bucket = bucket_start(start, granularity)
+        while bucket < end:
+            following = bucket + step
+            yield bucket, (min(end, following) - max(start, bucket)).total_seconds()
+            bucket = following
+
+    def _upsert(self, db: Session, model, rows: list[dict]) -> None:
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.bucket_start, model.vehicle_id],
+            set_={
+                "vehicle_type": stmt.excluded.vehicle_type,
+                "rentals": model.rentals + stmt.excluded.rentals,
+                "revenue": model.revenue + stmt.excluded.revenue,
+                "rented_seconds": model.rented_seconds + stmt.excluded.rented_seconds,
+            },
+        )
+        db.execute(stmt, rows)
+
+    def summarize(
+        self,
+        db: Session,
+        *,
+        granularity: Granularity,
+        start: datetime,
+        end: datetime,
+        group_by: Literal["vehicle", "type"],
+        vehicle_id: int | None = None,
+        vehicle_type: str | None = None,
+    ) -> list:
+        model = ROLLUP_MODELS[granularity]
+        keys = [model.bucket_start, model.vehicle_type]
+        if group_by == "vehicle":
+            keys.append(model.vehicle_id)
+        query = db.query(
+            *keys,
+            func.sum(model.rentals).label("rentals"),
+            func.sum(model.revenue).label("revenue"),
+            func.sum(model.rented_seconds).label("rented_seconds"),
+        ).filter(model.bucket_start >= bucket_start(utc_naive(start), granularity), model.bucket_start < utc_naive(end))
+        if vehicle_id is not None:
+            query = query.filter(model.vehicle_id == vehicle_id)
+        if vehicle_type is not None:
+            query = query.filter(model.vehicle_type == vehicle_type)
+        return query.group_by(*keys).order_by(*keys).all()
+
+    def fleet_sizes(self, db: Session) -> dict[str, int]:
+        return dict(db.query(Vehicle.vehicle_type, func.count(Vehicle.id)).group_by(Vehicle.vehicle_type))
@@ -0,0 +1,84 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Oradea road graph used for ride quotes; the frontend no longer carries its own copy.
+CITY_NODES: dict[str, tuple[float, float]] = {
+    "central": (47.0525, 21.93),
+    "university": (47.0575, 21.93),
+    "oldTown": (47.0505, 21.921),
+    "station": (47.0675, 21.917),
+    "nufarul": (47.038, 21.98),
+    "westPark": (47.067, 21.888),
+    "zoo": (47.069, 21.948),
+    "industrial": (47.03, 21.99),
+}
+
+CITY_EDGES: dict[str, tuple[str, ...]] = {
+    "central": ("oldTown", "station", "university", "nufarul"),
+    "oldTown": ("central", "westPark", "zoo"),
+    "westPark": ("oldTown", "station"),
+    "station": ("central", "westPark"),
+    "university": ("central", "zoo", "nufarul"),
+    "zoo": ("oldTown", "university"),
+    "nufarul": ("central", "university", "industrial"),
+    "industrial": ("nufarul",),
+}
+
+AVERAGE_SPEED_KMH = {"bike": 15.0, "scooter": 20.0}
+DEFAULT_SPEED_KMH = 15.0
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Great-circle distance in km; accepts scalars or broadcastable arrays in degrees."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lng1, lat2, lng2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(h)))
+
+
+def fare(price_per_hour: float, hours: float) -> float:
+    return round(max(hours, 0.0) * price_per_hour, 2)
+
+
+class RouteService:
+    """All-pairs shortest road distances over the city graph.
+
+    The matrix is computed once, with the edge weights from one vectorized
+    haversine call and a NumPy Floyd-Warshall, so a quote is two index
+    lookups instead of a Dijkstra run.
+    """
+
+    def __init__(self, nodes: dict[str, tuple[float, float]], edges: dict[str, tuple[str, ...]]):
+        self.node_ids = list(nodes)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        coords = np.array([nodes[node_id] for node_id in self.node_ids], dtype=float)
+        self.lats, self.lngs = coords[:, 0], coords[:, 1]
+        self.distances = self._all_pairs(edges)
+
+    def _all_pairs(self, edges: dict[str, tuple[str, ...]]) -> np.ndarray:
+        direct = haversine_km(self.lats[:, None], self.lngs[:, None], self.lats[None, :], self.lngs[None, :])
+        adjacency = np.zeros(direct.shape, dtype=bool)
+        for source, targets in edges.items():
+            for target in targets:
+                adjacency[self.index[source], self.index[target]] = True
+        dist = np.where(adjacency, direct, np.inf)
+        np.fill_diagonal(dist, 0.0)
+        for k in range(len(self.node_ids)):
+            np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+        return dist
+
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self.index
+
+    def nearest_node(self, lat: float, lng: float) -> str:
+        return self.node_ids[int(np.argmin(haversine_km(lat, lng, self.lats, self.lngs)))]
+
+    def distance_km(self, from_node: str, to_node: str) -> float:
+        """Shortest road distance between two nodes; inf if they are not connected."""
+        return float(self.distances[self.index[from_node], self.index[to_node]])
+
+    def eta_hours(self, distance_km: float, vehicle_type: str) -> float:
+        return distance_km / AVERAGE_SPEED_KMH.get(vehicle_type, DEFAULT_SPEED_KMH)
+
+
+route_service = RouteService(CITY_NODES, CITY_EDGES)
@@ -0,0 +1,182 @@
+import math
+import threading
+from dataclasses import dataclass
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+@dataclass(slots=True)
+class IndexedPoint:
+    lat: float
+    lng: float
+    available: bool
+
+
+class GridIndex:
+    """Uniform lat/lng grid for nearest-k lookups over vehicle positions.
+
+    A query visits cells ring by ring outward from the query's cell and stops
+    as soon as no unvisited ring can hold anything closer than the current
+    k-th result (or lies beyond the radius), so cost depends on local density
+    rather than fleet size. Rings are clipped to the bounding box of occupied
+    cells, which is kept up to date as points come and go, so a query far
+    from the fleet never walks empty cells beyond it. Once a ring would hold
+    more cells than are occupied (a sparse, spread-out fleet), the remaining
+    rings are read from the occupied cells instead of walked.
+    """
+
+    def __init__(self, cell_degrees: float = 0.01):
+        self.cell_degrees = cell_degrees
+        self._points: dict[int, IndexedPoint] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        # (min_row, max_row, min_col, max_col) of occupied cells; None when empty or to be recomputed.
+        self._bounds: tuple[int, int, int, int] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def rebuild(self, rows) -> None:
+        """Replace the contents with ``(id, lat, lng, available)`` rows."""
+        with self._lock:
+            self._points.clear()
+            self._cells.clear()
+            self._bounds = None
+            for item_id, lat, lng, available in rows:
+                self._insert(item_id, lat, lng, bool(available))
+
+    def upsert(self, item_id: int, lat: float | None, lng: float | None, available: bool) -> None:
+        with self._lock:
+            self._discard(item_id)
+            if lat is not None and lng is not None:
+                self._insert(item_id, lat, lng, bool(available))
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            self._discard(item_id)
+
+    def set_available(self, item_id: int, available: bool) -> None:
+        with self._lock:
+            point = self._points.get(item_id)
+            if point is not None:
+                point.available = available
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        radius_km: float | None = None,
+        available_only: bool = True,
+    ) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(id, distance_km)`` pairs, closest first."""
+        with self._lock:
+            if not self._cells:
+                return []
+            bounds = self._bounds or self._recompute_bounds()
+            min_row, max_row, min_col, max_col = bounds
+            center_row, center_col = self._cell(lat, lng)
+            # Rings closer in than the box hold nothing; those past its far corner are never reached.
+            first_ring = max(0, min_row - center_row, center_row - max_row, min_col - center_col, center_col - max_col)
+            max_ring = max(center_row - min_row, max_row - center_row, center_col - min_col, max_col - center_col)
+            # Smallest cell side in km around the query; lng cells shrink with latitude.
+            cell_km = self.cell_degrees * KM_PER_DEGREE_LAT * min(1.0, math.cos(math.radians(lat)))
+            if radius_km is not None:
+                max_ring = min(max_ring, math.ceil(radius_km / cell_km) + 1)
+            found: list[tuple[float, int]] = []
+            for ring, cells in self._rings(center_row, center_col, first_ring, max_ring, bounds):
+                for cell in cells:
+                    for item_id in self._cells.get(cell, ()):
+                        point = self._points[item_id]
+                        if available_only and not point.available:
+                            continue
+                        distance = haversine_km(lat, lng, point.lat, point.lng)
+                        if radius_km is None or distance <= radius_km:
+                            found.append((distance, item_id))
+                # Anything in ring + 1 or beyond is at least ``ring`` whole cells away.
+                floor_km = ring * cell_km
+                if radius_km is not None and floor_km > radius_km:
+                    break
+                if len(found) >= k:
+                    found.sort()
+                    del found[k:]
+                    if found[-1][0] <= floor_km:
+                        break
+            found.sort()
+            return [(item_id, distance) for distance, item_id in found[:k]]
+
+    def _rings(self, row: int, col: int, first_ring: int, max_ring: int, bounds: tuple[int, int, int, int]):
+        """Yield ``(ring, cells)`` outward from ``(row, col)``, every ring in order."""
+        for ring in range(first_ring, max_ring + 1):
+            if 8 * ring > len(self._cells):
+                by_ring: dict[int, list[tuple[int, int]]] = {}
+                for cell in self._cells:
+                    cell_ring = max(abs(cell[0] - row), abs(cell[1] - col))
+                    if ring <= cell_ring <= max_ring:
+                        by_ring.setdefault(cell_ring, []).append(cell)
+                for remaining in range(ring, max_ring + 1):
+                    yield remaining, by_ring.get(remaining, ())
+                return
+            yield ring, self._ring_cells(row, col, ring, bounds)
+
+    @staticmethod
+    def _ring_cells(row: int, col: int, ring: int, bounds: tuple[int, int, int, int]):
+        """Cells of the square ring ``ring`` cells out from ``(row, col)`` that lie inside ``bounds``."""
+        min_row, max_row, min_col, max_col = bounds
+        if ring == 0:
+            if min_row <= row <= max_row and min_col <= col <= max_col:
+                yield row, col
+            return
+        cols = range(max(col - ring, min_col), min(col + ring, max_col) + 1)
+        for r in (row - ring, row + ring):
+            if min_row <= r <= max_row:
+                for c in cols:
+                    yield r, c
+        rows = range(max(row - ring + 1, min_row), min(row + ring - 1, max_row) + 1)
+        for c in (col - ring, col + ring):
+            if min_col <= c <= max_col:
+                for r in rows:
+                    yield r, c
+
+    def _recompute_bounds(self) -> tuple[int, int, int, int]:
+        rows = [row for row, _ in self._cells]
+        cols = [col for _, col in self._cells]
+        self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        return self._bounds
+
+    def _insert(self, item_id: int, lat: float, lng: float, available: bool) -> None:
+        self._points[item_id] = IndexedPoint(lat, lng, available)
+        row, col = cell = self._cell(lat, lng)
+        self._cells.setdefault(cell, set()).add(item_id)
+        if self._bounds is not None:
+            min_row, max_row, min_col, max_col = self._bounds
+            self._bounds = (min(min_row, row), max(max_row, row), min(min_col, col), max(max_col, col))
+        elif len(self._cells) == 1:
+            self._bounds = (row, row, col, col)
+
+    def _discard(self, item_id: int) -> None:
+        point = self._points.pop(item_id, None)
+        if point is None:
+            return
+        cell = self._cell(point.lat, point.lng)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(item_id)
+            if not members:
+                del self._cells[cell]
+                # Only an emptied cell on the box's edge can shrink it; recompute on the next query.
+                if self._bounds is not None and (cell[0] in self._bounds[:2] or cell[1] in self._bounds[2:]):
+                    self._bounds = None
+
+
+vehicle_index = GridIndex()
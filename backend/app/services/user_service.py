@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import Optional, Sequence
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
 from app.schemas.user import UserCreate
+from app.core.principal_cache import principal_cache
 from app.core.security import hash_password, verify_password
 
 
@@ -34,8 +35,25 @@ class UserService:
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
         return db.query(User).filter(User.id == user_id).first()
 
-    def get_all_users(self, db: Session):
-        return db.query(User).all()
+    def get_all_users(
+        self,
+        db: Session,
+        *,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        columns: Optional[Sequence] = None,
+    ) -> list[User]:
+        # ``columns`` selects plain rows instead of entities for the fast list path.
+        query = db.query(*columns) if columns else db.query(User)
+        if is_active is not None:
+            query = query.filter(User.is_active == is_active)
+        if after_id is not None:
+            query = query.filter(User.id > after_id)
+        query = query.order_by(User.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     def delete_user(self, db: Session, user_id: int) -> bool:
         user = self.get_user_by_id(db, user_id)
@@ -43,6 +61,7 @@ class UserService:
             return False
         db.delete(user)
         db.commit()
+        principal_cache.invalidate_user(user_id)
         return True
 
     def update_user(self, db: Session, user: User, *, email: Optional[str], username: Optional[str], full_name: Optional[str]) -> User:
@@ -64,6 +83,7 @@ class UserService:
         except IntegrityError:
             db.rollback()
             raise ValueError("Conflict updating user")
+        principal_cache.invalidate_user(user.id)
         db.refresh(user)
         return user
 
@@ -73,6 +93,7 @@ class UserService:
         new_hash = hash_password(new_password)
         db.query(User).filter(User.id == user.id).update({User.hashed_password: new_hash})
         db.commit()
+        principal_cache.invalidate_user(user.id)
         db.refresh(user)
         return True
 
@@ -1,6 +1,16 @@
+from typing import Sequence
+
+from sqlalchemy import and_, or_, select, update
 from sqlalchemy.orm import Session
+from app.core.catalog_version import catalog_version
+from app.core.live_feed import vehicle_feed
+from app.models.rental import Rental
 from app.models.vehicle import Vehicle
-from app.schemas.vehicle import VehicleCreate, VehicleUpdate
+from app.schemas.vehicle import VehicleCreate, VehicleFilter, VehicleUpdate
+from app.services.spatial_index import vehicle_index
+
+# Above this many changed vehicles the feed sends one ``reset`` instead of per-vehicle deltas.
+BATCH_FEED_DELTAS = 100
 
 
 class VehicleService:
@@ -9,27 +19,193 @@ class VehicleService:
         db.add(db_vehicle)
         db.commit()
         db.refresh(db_vehicle)
+        self._index(db_vehicle)
         return db_vehicle
 
+    def _index(self, vehicle: Vehicle) -> None:
+        vehicle_index.upsert(vehicle.id, vehicle.latitude, vehicle.longitude, vehicle.available)
+        catalog_version.bump()
+        vehicle_feed.publish(
+            "vehicle", {"id": vehicle.id, "available": vehicle.available, "price": vehicle.price_per_hour}
+        )
+
+    def rebuild_spatial_index(self, db: Session) -> int:
+        rows = (
+            db.query(Vehicle.id, Vehicle.latitude, Vehicle.longitude, Vehicle.available)
+            .filter(Vehicle.latitude.is_not(None), Vehicle.longitude.is_not(None))
+            .all()
+        )
+        vehicle_index.rebuild(rows)
+        return len(rows)
+
+    def get_nearby_vehicles(
+        self,
+        db: Session,
+        *,
+        lat: float,
+        lng: float,
+        k: int,
+        radius_km: float,
+        available_only: bool = True,
+    ) -> list[tuple[Vehicle, float]]:
+        """Nearest vehicles from the in-memory index, loaded in one query, closest first."""
+        hits = vehicle_index.nearest(lat, lng, k, radius_km, available_only)
+        if not hits:
+            return []
+        vehicles = {v.id: v for v in db.query(Vehicle).filter(Vehicle.id.in_([vid for vid, _ in hits])).all()}
+        # The index is per process; re-check availability against the rows we just read.
+        return [
+            (vehicles[vid], distance)
+            for vid, distance in hits
+            if vid in vehicles and (vehicles[vid].available or not available_only)
+        ]
+
     def get_vehicle(self, db: Session, vehicle_id: int) -> Vehicle | None:
         return db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
 
     def update_vehicle(self, db: Session, vehicle_id: int, vehicle: VehicleUpdate) -> Vehicle | None:
         db_vehicle = self.get_vehicle(db, vehicle_id)
         if db_vehicle:
-            for key, value in vehicle.model_dump(exclude_unset=True).items():
+            for key, value in self._with_base_price(vehicle.model_dump(exclude_unset=True)).items():
                 setattr(db_vehicle, key, value)
             db.commit()
             db.refresh(db_vehicle)
+            self._index(db_vehicle)
         return db_vehicle
 
+    def update_vehicles(
+        self,
+        db: Session,
+        changes: VehicleUpdate,
+        *,
+        ids: Sequence[int] | None = None,
+        where: VehicleFilter | None = None,
+    ) -> list[int]:
+        """Apply ``changes`` to every vehicle in ``ids`` or matching ``where`` with one UPDATE; returns the changed ids.
+
+        The statement runs set-based in a single transaction and RETURNING
+        hands back what the spatial index and the feed need, so no row is
+        loaded into the session. Vehicles with an open rental are skipped
+        when the change would make them available.
+        """
+        values = self._with_base_price(changes.model_dump(exclude_unset=True))
+        stmt = update(Vehicle)
+        if ids is not None:
+            stmt = stmt.where(Vehicle.id.in_(ids))
+        else:
+            if where.vehicle_type is not None:
+                stmt = stmt.where(Vehicle.vehicle_type == where.vehicle_type)
+            if where.available is not None:
+                stmt = stmt.where(Vehicle.available == where.available)
+            if where.min_price is not None:
+                stmt = stmt.where(Vehicle.price_per_hour >= where.min_price)
+            if where.max_price is not None:
+                stmt = stmt.where(Vehicle.price_per_hour <= where.max_price)
+        if values.get("available") is True:
+            # A rented vehicle only becomes available again when its rental ends.
+            open_rental = select(Rental.id).where(Rental.vehicle_id == Vehicle.id, Rental.end_time.is_(None))
+            stmt = stmt.where(~open_rental.exists())
+        stmt = (
+            stmt.values(**values)
+            .returning(Vehicle.id, Vehicle.latitude, Vehicle.longitude, Vehicle.available, Vehicle.price_per_hour)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+        db.commit()
+        if not rows:
+            return []
+        for vehicle_id, lat, lng, available, _price in rows:
+            vehicle_index.upsert(vehicle_id, lat, lng, available)
+        catalog_version.bump()
+        if len(rows) > BATCH_FEED_DELTAS:
+            vehicle_feed.publish("reset", {})
+        else:
+            for vehicle_id, _lat, _lng, available, price in rows:
+                vehicle_feed.publish("vehicle", {"id": vehicle_id, "available": available, "price": price})
+        return sorted(row[0] for row in rows)
+
+    def _with_base_price(self, values: dict) -> dict:
+        # An admin-set price becomes the new base the pricing engine scales from.
+        if values.get("price_per_hour") is not None:
+            values["base_price_per_hour"] = values["price_per_hour"]
+        return values
+
     def delete_vehicle(self, db: Session, vehicle_id: int) -> bool:
         db_vehicle = self.get_vehicle(db, vehicle_id)
         if db_vehicle:
             db.delete(db_vehicle)
             db.commit()
+            vehicle_index.remove(vehicle_id)
+            catalog_version.bump()
+            vehicle_feed.publish("vehicle", {"id": vehicle_id, "deleted": True})
             return True
         return False
 
-    def get_all_vehicles(self, db: Session) -> list[Vehicle]:
-        return db.query(Vehicle).all()
\ No newline at end of file
+    def get_all_vehicles(
+        self,
+        db: Session,
+        *,
+        after_id: int | None = None,
+        limit: int | None = None,
+        vehicle_type: str | None = None,
+        available: bool | None = None,
+        columns: Sequence | None = None,
+    ) -> list[Vehicle]:
+        # ``columns`` selects plain rows instead of entities for the fast list path.
+        query = db.query(*columns) if columns else db.query(Vehicle)
+        if vehicle_type is not None:
+            query = query.filter(Vehicle.vehicle_type == vehicle_type)
+        if available is not None:
+            query = query.filter(Vehicle.available == available)
+        if after_id is not None:
+            query = query.filter(Vehicle.id > after_id)
+        query = query.order_by(Vehicle.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def search_vehicles(
+        self,
+        db: Session,
+        *,
+        vehicle_type: str | None = None,
+        available: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        descending: bool = False,
+        after: tuple[float, int] | None = None,
+        limit: int | None = None,
+        columns: Sequence | None = None,
+    ) -> list[Vehicle]:
+        query = db.query(*columns) if columns else db.query(Vehicle)
+        if vehicle_type is not None:
+            query = query.filter(Vehicle.vehicle_type == vehicle_type)
+        if available is not None:
+            query = query.filter(Vehicle.available == available)
+        if min_price is not None:
+            query = query.filter(Vehicle.price_per_hour >= min_price)
+        if max_price is not None:
+            query = query.filter(Vehicle.price_per_hour <= max_price)
+        if after is not None:
+            after_price, after_id = after
+            if descending:
+                query = query.filter(
+                    or_(
+                        Vehicle.price_per_hour < after_price,
+                        and_(Vehicle.price_per_hour == after_price, Vehicle.id < after_id),
+                    )
+                )
+            else:
+                query = query.filter(
+                    or_(
+                        Vehicle.price_per_hour > after_price,
+                        and_(Vehicle.price_per_hour == after_price, Vehicle.id > after_id),
+                    )
+                )
+        if descending:
+            query = query.order_by(Vehicle.price_per_hour.desc(), Vehicle.id.desc())
+        else:
+            query = query.order_by(Vehicle.price_per_hour, Vehicle.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
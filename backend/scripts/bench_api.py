@@ -0,0 +1,351 @@
+"""Load-test the API with a realistic request mix and check for latency regressions.
+
+Seeds a throwaway SQLite database and drives app.main:app either in-process
+through httpx's ASGI transport (no sockets, the default) or over a local
+uvicorn server. Virtual users pick actions by weight: browsing the catalog,
+logging in, renting and returning vehicles, and admin price edits. The
+report lists throughput and p50/p95/p99 per route; requests shed by
+admission control (503 with Retry-After) are counted apart from errors, e.g.:
+
+    python scripts/bench_api.py --users 50 --duration 20 --save baseline.json
+    python scripts/bench_api.py --users 50 --duration 20 --compare baseline.json --threshold 0.25
+
+With --compare the exit status is 1 if any route's p95 or the overall
+throughput is worse than the baseline by more than the threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+PASSWORD = "bench-password"
+CITY_CENTER = (47.0525, 21.93)
+
+# Relative weights of what a virtual user does next.
+DEFAULT_MIX = {
+    "browse": 55,
+    "vehicle": 15,
+    "search": 10,
+    "nearby": 8,
+    "login": 3,
+    "rent": 7,
+    "admin_edit": 2,
+}
+
+# Responses that are part of normal operation rather than failures.
+EXPECTED_STATUS = {"POST /rentals/": {201, 409}}
+
+# Routes whose sample count is too small to compare are skipped.
+MIN_COMPARE_SAMPLES = 20
+
+
+def seed(db_url: str, vehicles: int, users: int) -> None:
+    import bcrypt
+    from sqlalchemy import create_engine, insert
+
+    from app.core.config import settings
+    from app.db.schema import migrate
+    from app.models.user import User
+    from app.models.vehicle import Vehicle
+
+    rng = random.Random(1)
+    engine = create_engine(db_url)
+    migrate(engine)
+    # One real hash shared by every rider keeps seeding fast while logins still pay for bcrypt.
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    with engine.begin() as conn:
+        conn.execute(insert(Vehicle), [
+            {
+                "name": f"Vehicle {i}",
+                "vehicle_type": ("bike", "scooter")[i % 2],
+                "price_per_hour": 5 + i % 20,
+                "available": True,
+                "latitude": CITY_CENTER[0] + rng.uniform(-0.03, 0.03),
+                "longitude": CITY_CENTER[1] + rng.uniform(-0.05, 0.05),
+            }
+            for i in range(vehicles)
+        ])
+        conn.execute(insert(User), [
+            {"username": settings.ADMIN_USERNAME, "email": settings.ADMIN_EMAIL, "hashed_password": hashed, "is_active": True}
+        ] + [
+            {"username": f"rider{i}", "email": f"rider{i}@example.com", "hashed_password": hashed, "is_active": True}
+            for i in range(users)
+        ])
+    engine.dispose()
+
+
+def mint_token(email: str) -> str:
+    from app.core.security import create_access_token
+
+    return create_access_token({"sub": email}, expires_delta=timedelta(hours=2))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        # 503 + Retry-After from admission control: load shedding working as designed, not a failure.
+        self.shed: dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self.errors[route] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if response.status_code in EXPECTED_STATUS.get(route, {200, 201}):
+            self.latencies[route].append(elapsed)
+        elif response.status_code == 503 and "retry-after" in response.headers:
+            self.shed[route] += 1
+        else:
+            self.errors[route] += 1
+        return response
+
+
+class VirtualUser:
+    def __init__(self, index: int, args, recorder: Recorder, rng: random.Random):
+        self.email = f"rider{index % args.riders}@example.com"
+        self.headers = {"Authorization": f"Bearer {mint_token(self.email)}"}
+        self.admin_headers = {"Authorization": f"Bearer {mint_token(args.admin_email)}"}
+        self.vehicles = args.vehicles
+        self.recorder = recorder
+        self.rng = rng
+        self.actions, self.weights = zip(*args.mix.items())
+
+    async def run(self, client: httpx.AsyncClient, stop_at: float) -> None:
+        while time.monotonic() < stop_at:
+            action = self.rng.choices(self.actions, self.weights)[0]
+            await getattr(self, action)(client)
+
+    async def browse(self, client):
+        await self.recorder.call(client, "GET /vehicles/", "GET", "/vehicles/", params={"limit": 100})
+
+    async def vehicle(self, client):
+        vehicle_id = self.rng.randint(1, self.vehicles)
+        await self.recorder.call(client, "GET /vehicles/{id}", "GET", f"/vehicles/{vehicle_id}")
+
+    async def search(self, client):
+        params = {"vehicle_type": self.rng.choice(("bike", "scooter")), "max_price": 15, "limit": 50}
+        await self.recorder.call(client, "GET /vehicles/search", "GET", "/vehicles/search", params=params)
+
+    async def nearby(self, client):
+        params = {
+            "lat": CITY_CENTER[0] + self.rng.uniform(-0.02, 0.02),
+            "lng": CITY_CENTER[1] + self.rng.uniform(-0.03, 0.03),
+            "k": 10,
+        }
+        await self.recorder.call(client, "GET /vehicles/nearby", "GET", "/vehicles/nearby", params=params)
+
+    async def login(self, client):
+        await self.recorder.call(
+            client, "POST /users/login", "POST", "/users/login",
+            data={"username": self.email, "password": PASSWORD},
+        )
+
+    async def rent(self, client):
+        vehicle_id = self.rng.randint(1, self.vehicles)
+        created = await self.recorder.call(
+            client, "POST /rentals/", "POST", "/rentals/",
+            json={"vehicle_id": vehicle_id, "start_time": datetime.utcnow().isoformat(), "user_id": 0},
+            headers=self.headers,
+        )
+        if created is None or created.status_code != 201:
+            return
+        await self.recorder.call(
+            client, "PUT /rentals/{id}", "PUT", f"/rentals/{created.json()['id']}",
+            json={"end_time": datetime.utcnow().isoformat()},
+            headers=self.headers,
+        )
+
+    async def admin_edit(self, client):
+        vehicle_id = self.rng.randint(1, self.vehicles)
+        await self.recorder.call(
+            client, "PUT /vehicles/{id}", "PUT", f"/vehicles/{vehicle_id}",
+            json={"price_per_hour": self.rng.choice((5, 8, 10, 12))},
+            headers=self.admin_headers,
+        )
+
+
+async def drive(client: httpx.AsyncClient, args, duration: float) -> Recorder:
+    recorder = Recorder()
+    users = [VirtualUser(i, args, recorder, random.Random(i)) for i in range(args.users)]
+    stop_at = time.monotonic() + duration
+    await asyncio.gather(*(user.run(client, stop_at) for user in users))
+    return recorder
+
+
+async def run_asgi(args) -> Recorder:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60.0) as client:
+            if args.warmup:
+                await drive(client, args, args.warmup)
+            return await drive(client, args, args.duration)
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run_uvicorn(args) -> Recorder:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT_DIR,
+        env=os.environ.copy(),
+    )
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60.0) as client:
+            await wait_ready(client)
+            if args.warmup:
+                await drive(client, args, args.warmup)
+            return await drive(client, args, args.duration)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(recorder: Recorder, args) -> dict:
+    routes = {}
+    for route in sorted(set(recorder.latencies) | set(recorder.errors) | set(recorder.shed)):
+        samples = recorder.latencies.get(route, [])
+        routes[route] = {
+            "count": len(samples),
+            "errors": recorder.errors.get(route, 0),
+            "shed": recorder.shed.get(route, 0),
+            "rps": len(samples) / args.duration,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    total = sum(r["count"] for r in routes.values())
+    return {
+        "meta": {
+            "transport": args.transport,
+            "users": args.users,
+            "duration": args.duration,
+            "vehicles": args.vehicles,
+            "mix": args.mix,
+            "python": platform.python_version(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "total_rps": total / args.duration,
+        "routes": routes,
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"{'route':<24} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'shed':>6}")
+    for route, r in result["routes"].items():
+        print(
+            f"{route:<24} {r['count']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} "
+            f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['errors']:>7} {r['shed']:>6}"
+        )
+    print(f"total: {result['total_rps']:.1f} req/s")
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every regression beyond ``threshold`` (a fraction, 0.2 = 20% worse)."""
+    regressions = []
+    if result["total_rps"] < baseline["total_rps"] * (1 - threshold):
+        regressions.append(f"throughput {baseline['total_rps']:.1f} -> {result['total_rps']:.1f} req/s")
+    for route, before in baseline["routes"].items():
+        after = result["routes"].get(route)
+        if after is None or min(after["count"], before["count"]) < MIN_COMPARE_SAMPLES:
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{route} p95 {before['p95_ms']:.2f} -> {after['p95_ms']:.2f} ms")
+        if after["errors"] > before["errors"] and after["errors"] > after["count"] * 0.01:
+            regressions.append(f"{route} errors {before['errors']} -> {after['errors']}")
+    return regressions
+
+
+def parse_mix(value: str) -> dict:
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, value.split(",")):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"bad mix entry {part!r}; actions: {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    return {name: weight for name, weight in mix.items() if weight}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--vehicles", type=int, default=500)
+    parser.add_argument("--riders", type=int, default=200)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help="override weights, e.g. browse=80,login=0")
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--save", type=Path, help="write the results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to check against")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{(Path(tmp) / 'bench.db').as_posix()}"
+        # Settings are read at import time, so this has to happen before app.* is imported.
+        os.environ["DATABASE_URL"] = db_url
+        from app.core.config import settings
+
+        args.admin_email = settings.ADMIN_EMAIL
+        seed(db_url, args.vehicles, args.riders)
+        runner = run_asgi if args.transport == "asgi" else run_uvicorn
+        recorder = asyncio.run(runner(args))
+
+    result = summarize(recorder, args)
+    print_report(result)
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2))
+        print(f"saved baseline to {args.save}")
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Compare the sync (threadpool) and async (AsyncEngine) request paths.
+
+Starts one uvicorn server per mode against the same seeded SQLite file,
+drives it with concurrent httpx clients and prints requests/sec and latency
+percentiles, e.g.:
+
+    python scripts/bench_async.py --concurrency 200 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+# Admission control would shed part of each burst with 503s; the comparison needs every request to reach the database.
+UNGATED = {"ADMISSION_AUTH_LIMIT": "0", "ADMISSION_READ_LIMIT": "0", "ADMISSION_WRITE_LIMIT": "0"}
+
+
+def seed(db_url: str, vehicles: int) -> None:
+    env = {**os.environ, "DATABASE_URL": db_url}
+    code = (
+        "from sqlalchemy import create_engine, insert\n"
+        "from app.db.base import Base\n"
+        "from app.models import user, vehicle, rental\n"
+        "from app.models.vehicle import Vehicle\n"
+        f"engine = create_engine({db_url!r})\n"
+        "Base.metadata.create_all(bind=engine)\n"
+        "with engine.begin() as conn:\n"
+        "    conn.execute(insert(Vehicle), [\n"
+        "        {'name': f'Vehicle {i}', 'vehicle_type': ('bike', 'scooter')[i % 2],\n"
+        "         'price_per_hour': 5 + i % 20, 'available': i % 3 != 0}\n"
+        f"        for i in range({vehicles})\n"
+        "    ])\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, env=env, check=True)
+
+
+def start_server(db_url: str, port: int, async_mode: bool) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": db_url, **UNGATED, "DB_ASYNC": "true" if async_mode else "false"}
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+    ]
+    return subprocess.Popen(cmd, cwd=ROOT_DIR, env=env)
+
+
+async def wait_ready(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"server at {base_url} did not start")
+
+
+async def drive(base_url: str, concurrency: int, duration: float, vehicles: int) -> tuple[int, list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < stop_at:
+                if random.random() < 0.5:
+                    path = "/vehicles/?limit=50"
+                else:
+                    path = f"/vehicles/{random.randint(1, vehicles)}"
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(latencies), latencies, errors
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_mode(db_url: str, port: int, async_mode: bool, args) -> dict:
+    server = start_server(db_url, port, async_mode)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(base_url))
+        asyncio.run(drive(base_url, args.concurrency, 1.0, args.vehicles))  # warm-up
+        count, latencies, errors = asyncio.run(drive(base_url, args.concurrency, args.duration, args.vehicles))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {
+        "mode": "async" if async_mode else "sync",
+        "rps": count / args.duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else float("nan"),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--vehicles", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{(Path(tmp) / 'bench.db').as_posix()}"
+        seed(db_url, args.vehicles)
+        results = [run_mode(db_url, args.port, mode, args) for mode in (False, True)]
+
+    print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['rps']:>9.1f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['mean_ms']:>9.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
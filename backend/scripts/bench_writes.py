@@ -0,0 +1,151 @@
+"""Measure rental create/end throughput with and without the production SQLite profile.
+
+Each configuration gets a freshly seeded SQLite file and its own uvicorn
+server. Every client owns one vehicle and loops "start a rental, end it"
+for the duration, so all writes succeed and the number reflects commit
+throughput rather than contention on a single row, e.g.:
+
+    python scripts/bench_writes.py --clients 64 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Admission control would shed part of each burst with 503s; the comparison needs every write to reach the database.
+UNGATED = {"ADMISSION_AUTH_LIMIT": "0", "ADMISSION_READ_LIMIT": "0", "ADMISSION_WRITE_LIMIT": "0"}
+
+CONFIGS = {
+    "baseline": {"DB_PROFILE": "development", "GROUP_COMMIT_ENABLED": "false"},
+    "production": {"DB_PROFILE": "production", "GROUP_COMMIT_ENABLED": "false"},
+    "production+group-commit": {"DB_PROFILE": "production", "GROUP_COMMIT_ENABLED": "true"},
+}
+
+
+def seed(db_url: str, clients: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Base
+    from app.models import rental, user, vehicle  # noqa: F401
+    from app.models.user import User
+    from app.models.vehicle import Vehicle
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Vehicle), [
+            {"name": f"Bike {i}", "vehicle_type": "bike", "price_per_hour": 5, "available": True}
+            for i in range(clients)
+        ])
+        conn.execute(insert(User), [
+            {"username": f"rider{i}", "email": f"rider{i}@example.com", "hashed_password": "-", "is_active": True}
+            for i in range(clients)
+        ])
+    engine.dispose()
+
+
+def tokens_for(clients: int) -> list[str]:
+    from app.core.security import create_access_token
+
+    return [
+        create_access_token({"sub": f"rider{i}@example.com"}, expires_delta=timedelta(hours=1))
+        for i in range(clients)
+    ]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def drive(base_url: str, tokens: list[str], duration: float) -> tuple[int, int]:
+    writes = 0
+    errors = 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=len(tokens))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await wait_ready(client)
+
+        async def rider(vehicle_id: int, token: str):
+            nonlocal writes, errors
+            headers = {"Authorization": f"Bearer {token}"}
+            while time.monotonic() < stop_at:
+                now = datetime.utcnow().isoformat()
+                created = await client.post(
+                    "/rentals/",
+                    json={"vehicle_id": vehicle_id, "start_time": now, "user_id": 0},
+                    headers=headers,
+                )
+                if created.status_code != 201:
+                    errors += 1
+                    continue
+                ended = await client.put(
+                    f"/rentals/{created.json()['id']}",
+                    json={"end_time": datetime.utcnow().isoformat()},
+                    headers=headers,
+                )
+                if ended.status_code == 200:
+                    writes += 2
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(rider(i + 1, token) for i, token in enumerate(tokens)))
+    return writes, errors
+
+
+def run_config(name: str, args, tokens: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{(Path(tmp) / 'writes.db').as_posix()}"
+        seed(db_url, args.clients)
+        env = {**os.environ, "DATABASE_URL": db_url, **UNGATED, **CONFIGS[name]}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(args.port), "--log-level", "warning"],
+            cwd=ROOT_DIR,
+            env=env,
+        )
+        try:
+            writes, errors = asyncio.run(drive(f"http://127.0.0.1:{args.port}", tokens, args.duration))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+    return {"config": name, "writes_per_s": writes / args.duration, "errors": errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--config", choices=sorted(CONFIGS), action="append")
+    args = parser.parse_args()
+
+    tokens = tokens_for(args.clients)
+    results = [run_config(name, args, tokens) for name in args.config or CONFIGS]
+
+    print(f"{'config':<24} {'writes/s':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['config']:<24} {r['writes_per_s']:>9.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Bulk-load vehicles or rentals from an NDJSON or CSV file.
+
+    python scripts/import_data.py vehicles fleet.ndjson
+    python scripts/import_data.py rentals history.csv --chunk-size 5000
+
+The file is read line by line and inserted in chunks, one transaction per
+chunk; lines that fail validation are reported and skipped.
+
+Running servers only learn about the import through the shared catalog
+version, so open rentals are refused unless ``CATALOG_VERSION_PATH`` points
+at the same file as the workers'; closed rentals and vehicles always load.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.core.config import settings
+from app.db.schema import migrate
+from app.db.session import SessionLocal, engine
+from app.services.import_service import DEFAULT_CHUNK_SIZE, ImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=["vehicles", "rentals"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", dest="fmt", choices=["ndjson", "csv"])
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.fmt or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    migrate(engine)
+    with args.path.open(encoding="utf-8-sig", newline="") as lines, SessionLocal() as db:
+        service = ImportService(open_rentals=bool(settings.CATALOG_VERSION_PATH))
+        report = service.import_lines(db, args.kind, lines, fmt=fmt, chunk_size=args.chunk_size)
+
+    print(f"inserted {report.inserted}, failed {report.failed}")
+    for error in report.errors:
+        print(f"  line {error.line}: {error.error}")
+    if report.failed > len(report.errors):
+        print(f"  ... and {report.failed - len(report.errors)} more")
+    sys.exit(1 if report.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
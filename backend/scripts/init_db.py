@@ -6,13 +6,12 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.db.base import Base
 from app.core.config import settings
-from app.core.security import hash_password
+from app.core.security import hash_password, password_pool
+from app.db.schema import migrate
+from app.db.session import engine
 
-from app.models import user, vehicle, rental
 from app.models.user import User
 
 
@@ -23,16 +22,11 @@ def _sqlite_path(url: str) -> Path | None:
     return Path(parsed.database) if parsed.database else None
 
 def init_db():
-    db_url = settings.DATABASE_URL
-    db_path = _sqlite_path(db_url)
+    db_path = _sqlite_path(settings.DATABASE_URL)
     if db_path:
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        if db_path.exists():
-            engine = create_engine(db_url)
-            _ensure_admin(engine)
-            return
-    engine = create_engine(db_url)
-    Base.metadata.create_all(bind=engine)
+    # A no-op read when the schema fingerprint already matches.
+    migrate(engine)
     _ensure_admin(engine)
 
 
@@ -59,6 +53,8 @@ def _ensure_admin(engine):
         session.commit()
     finally:
         session.close()
+        # Don't leave idle hashing workers behind in the launcher process.
+        password_pool.shutdown()
 
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""Recompute the hourly and daily rental rollups from the rentals table.
+
+    python scripts/rebuild_rollups.py
+
+The rollups are maintained as rentals close, and a schema migration backfills
+them once on upgrade; run this whenever rentals were changed behind the API's
+back.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.schema import migrate
+from app.db.session import SessionLocal, engine
+from app.services.rollup_service import RollupService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+
+    migrate(engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        counted = RollupService().rebuild(db)
+    print(f"rolled up {counted} closed rentals in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Race many clients for a handful of vehicles through POST /rentals/.
+
+Seeds a throwaway SQLite database, starts uvicorn on it and fires every
+client at the same few scooters at once, in several rounds (each round ends
+the winning rentals so the vehicles can be raced for again). Exits non-zero
+if any vehicle was double-booked or a request failed with something other
+than 201/409. Admission control is switched off so no request is shed, e.g.:
+
+    python scripts/stress_reservations.py --clients 300 --vehicles 3 --rounds 5
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+# Admission control would shed part of each burst with 503s; the race needs every request to reach the database.
+UNGATED = {"ADMISSION_AUTH_LIMIT": "0", "ADMISSION_READ_LIMIT": "0", "ADMISSION_WRITE_LIMIT": "0"}
+
+
+def seed(db_url: str, clients: int, vehicles: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Base
+    from app.models import rental, user, vehicle  # noqa: F401
+    from app.models.user import User
+    from app.models.vehicle import Vehicle
+
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Vehicle), [
+            {"name": f"Scooter {i}", "vehicle_type": "scooter", "price_per_hour": 10, "available": True}
+            for i in range(vehicles)
+        ])
+        # Tokens are minted directly, so the password hash is never checked.
+        conn.execute(insert(User), [
+            {"username": f"rider{i}", "email": f"rider{i}@example.com", "hashed_password": "-", "is_active": True}
+            for i in range(clients)
+        ])
+    engine.dispose()
+
+
+def tokens_for(clients: int) -> list[str]:
+    from app.core.security import create_access_token
+
+    return [
+        create_access_token({"sub": f"rider{i}@example.com"}, expires_delta=timedelta(hours=1))
+        for i in range(clients)
+    ]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def race(client: httpx.AsyncClient, tokens: list[str], vehicles: int) -> tuple[dict, list[dict], float]:
+    start_time = datetime.utcnow().isoformat()
+
+    async def attempt(i: int, token: str):
+        vehicle_id = i % vehicles + 1
+        response = await client.post(
+            "/rentals/",
+            json={"vehicle_id": vehicle_id, "start_time": start_time, "user_id": 0},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return response.status_code, response.json() if response.status_code == 201 else None
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(attempt(i, token) for i, token in enumerate(tokens)))
+    elapsed = time.perf_counter() - started
+    statuses: dict[int, int] = {}
+    for code, _ in results:
+        statuses[code] = statuses.get(code, 0) + 1
+    return statuses, [body for code, body in results if code == 201], elapsed
+
+
+async def run(args, base_url: str) -> bool:
+    tokens = tokens_for(args.clients)
+    limits = httpx.Limits(max_connections=args.clients)
+    ok = True
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        await wait_ready(client)
+        for round_no in range(1, args.rounds + 1):
+            statuses, winners, elapsed = await race(client, tokens, args.vehicles)
+            booked = [w["vehicle_id"] for w in winners]
+            double_booked = len(booked) != len(set(booked))
+            unexpected = {code: n for code, n in statuses.items() if code not in (201, 409)}
+            print(
+                f"round {round_no}: {args.clients} requests in {elapsed:.2f}s "
+                f"({args.clients / elapsed:.0f} req/s) statuses={statuses}"
+                + (" DOUBLE-BOOKED" if double_booked else "")
+            )
+            ok = ok and not double_booked and not unexpected and len(booked) == args.vehicles
+            end_time = datetime.utcnow().isoformat()
+            for winner in winners:
+                await client.put(
+                    f"/rentals/{winner['id']}",
+                    json={"end_time": end_time},
+                    headers={"Authorization": f"Bearer {tokens[0]}"},
+                )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--vehicles", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{(Path(tmp) / 'stress.db').as_posix()}"
+        seed(db_url, args.clients, args.vehicles)
+        env = {**os.environ, "DATABASE_URL": db_url, **UNGATED}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(args.port), "--log-level", "warning"],
+            cwd=ROOT_DIR,
+            env=env,
+        )
+        try:
+            ok = asyncio.run(run(args, f"http://127.0.0.1:{args.port}"))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print("OK: no double-booking" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the test database and inline bcrypt
+# must be configured before anything under app/ is imported.
+_db_dir = tempfile.mkdtemp(prefix="o2w-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from scripts.init_db import init_db
+
+
+@pytest.fixture(scope="session")
+def client():
+    init_db()
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post(
+        "/users/login", data={"username": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def vehicle(client, admin_headers):
+    response = client.post(
+        "/vehicles/",
+        json={"name": "test bike", "vehicle_type": "bike", "price_per_hour": 3.0},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture
+def user(client):
+    """A fresh user, with its id and auth headers."""
+    name = f"rider{os.urandom(4).hex()}"
+    registered = client.post(
+        "/users/register", json={"username": name, "email": f"{name}@example.com", "password": "secret123"}
+    )
+    assert registered.status_code == 201
+    token = client.post("/users/login", data={"username": f"{name}@example.com", "password": "secret123"})
+    return {"id": registered.json()["id"], "headers": {"Authorization": f"Bearer {token.json()['access_token']}"}}
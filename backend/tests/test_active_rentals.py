@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, delete, insert, inspect, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from app.db.schema import migrate, schema_fingerprint, schema_migrations, stored_fingerprint
+from app.db.session import engine
+from app.models.rental import Rental
+from app.models.vehicle import Vehicle
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def _import(client, admin_headers, *records):
+    body = "".join(json.dumps(record) + "\n" for record in records)
+    response = client.post("/rentals/import", content=body, headers={**admin_headers, **NDJSON})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_imported_open_rental_agrees_everywhere(client, admin_headers, vehicle, user):
+    report = _import(
+        client, admin_headers, {"vehicle_id": vehicle["id"], "user_id": user["id"], "start_time": "2025-03-01T08:00:00"}
+    )
+    assert report == {"inserted": 1, "failed": 0, "errors": []}
+
+    active = client.get("/rentals/active", params={"vehicle_id": vehicle["id"]}).json()
+    assert [(entry["vehicle_id"], entry["user_id"]) for entry in active] == [(vehicle["id"], user["id"])]
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["available"] is False
+    assert client.get("/rentals/active/check", headers=admin_headers).json()["consistent"] is True
+
+
+def test_import_rejects_double_booking(client, admin_headers, vehicle, user):
+    other = client.post(
+        "/vehicles/", json={"name": "spare", "vehicle_type": "bike", "price_per_hour": 3.0}, headers=admin_headers
+    ).json()
+    report = _import(
+        client,
+        admin_headers,
+        {"vehicle_id": vehicle["id"], "user_id": user["id"], "start_time": "2025-03-01T08:00:00"},
+        {"vehicle_id": vehicle["id"], "user_id": 1, "start_time": "2025-03-01T08:00:00"},
+        {"vehicle_id": other["id"], "user_id": user["id"], "start_time": "2025-03-01T08:00:00"},
+    )
+    assert report["inserted"] == 1
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+
+    assert client.get("/rentals/active", params={"vehicle_id": other["id"]}).json() == []
+    assert client.get(f"/vehicles/{other['id']}").json()["available"] is True
+    rented = client.post(
+        "/rentals/", json={"vehicle_id": other["id"], "user_id": 0, "start_time": "2025-03-01T09:00:00"},
+        headers=user["headers"],
+    )
+    assert rented.status_code == 409
+    assert rented.json()["detail"] == "User already has an open rental"
+    assert client.get("/rentals/active/check", headers=admin_headers).json()["consistent"] is True
+
+
+def test_database_allows_one_open_rental_per_vehicle_and_user(client, admin_headers, vehicle, user):
+    other = client.post(
+        "/vehicles/", json={"name": "spare", "vehicle_type": "bike", "price_per_hour": 3.0}, headers=admin_headers
+    ).json()
+    rentals = Rental.__table__
+    opened = {"start_time": datetime(2025, 3, 2, 8)}
+    with engine.begin() as conn:
+        conn.execute(insert(rentals).values(vehicle_id=vehicle["id"], user_id=user["id"], **opened))
+    for row in ({"vehicle_id": other["id"], "user_id": user["id"]}, {"vehicle_id": vehicle["id"], "user_id": 1}):
+        with pytest.raises(IntegrityError), engine.begin() as conn:
+            conn.execute(insert(rentals).values(**row, **opened))
+    # A closed rental takes neither slot.
+    closed = {"vehicle_id": other["id"], "user_id": user["id"], "end_time": datetime(2025, 3, 2, 9)}
+    with engine.begin() as conn:
+        conn.execute(insert(rentals).values(**closed, **opened))
+    # The raw insert bypassed the service: take the vehicle back and pick the rental up in the registry.
+    repaired = client.get("/rentals/active/check", headers=admin_headers, params={"repair": True}).json()
+    assert repaired["missing"] and repaired["available_while_rented"] == [vehicle["id"]]
+
+
+def test_check_repairs_vehicle_available_while_rented(client, admin_headers, vehicle, user):
+    rented = client.post(
+        "/rentals/", json={"vehicle_id": vehicle["id"], "user_id": 0, "start_time": "2025-03-03T08:00:00"},
+        headers=user["headers"],
+    )
+    assert rented.status_code == 201
+    with engine.begin() as conn:
+        conn.execute(update(Vehicle.__table__).where(Vehicle.id == vehicle["id"]).values(available=True))
+
+    report = client.get("/rentals/active/check", headers=admin_headers).json()
+    assert report["consistent"] is False
+    assert report["available_while_rented"] == [vehicle["id"]]
+    assert report["duplicate_vehicles"] == report["duplicate_users"] == []
+
+    repaired = client.get("/rentals/active/check", headers=admin_headers, params={"repair": True}).json()
+    assert repaired["repaired"] is True
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["available"] is False
+    assert client.get("/rentals/active/check", headers=admin_headers).json()["consistent"] is True
+
+
+def test_migration_closes_duplicate_open_rentals(tmp_path):
+    scratch = create_engine(f"sqlite:///{tmp_path}/scratch.db")
+    migrate(scratch)
+    rentals, vehicles = Rental.__table__, Vehicle.__table__
+    with scratch.begin() as conn:
+        # Roll back to before migration 4: the old non-unique index and duplicates it allowed.
+        conn.execute(text("DROP INDEX ix_rentals_open_vehicle"))
+        conn.execute(text("DROP INDEX ix_rentals_open_user"))
+        conn.execute(text("CREATE INDEX ix_rentals_open ON rentals (vehicle_id) WHERE end_time IS NULL"))
+        conn.execute(delete(schema_migrations).where(schema_migrations.c.version == 4))
+        conn.execute(update(schema_migrations).values(fingerprint=None))
+        conn.execute(
+            insert(vehicles),
+            [{"id": i, "name": f"v{i}", "vehicle_type": "bike", "price_per_hour": 2.0, "available": False} for i in (1, 2)],
+        )
+        conn.execute(insert(rentals), [
+            {"id": 1, "vehicle_id": 1, "user_id": 10, "start_time": datetime(2025, 1, 1, 8)},
+            {"id": 2, "vehicle_id": 1, "user_id": 11, "start_time": datetime(2025, 1, 1, 9)},
+            {"id": 3, "vehicle_id": 2, "user_id": 10, "start_time": datetime(2025, 1, 1, 10)},
+        ])
+
+    assert migrate(scratch) is True
+    with scratch.connect() as conn:
+        still_open = conn.execute(select(rentals.c.id).where(rentals.c.end_time.is_(None))).scalars().all()
+        available = dict(conn.execute(select(vehicles.c.id, vehicles.c.available)).all())
+    assert still_open == [1]
+    assert available == {1: False, 2: True}
+    indexes = {index["name"]: index["unique"] for index in inspect(scratch).get_indexes("rentals")}
+    assert "ix_rentals_open" not in indexes
+    assert indexes["ix_rentals_open_vehicle"] and indexes["ix_rentals_open_user"]
+    assert stored_fingerprint(scratch) == schema_fingerprint()
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.api import middleware
+from app.api.middleware import AdmissionControlMiddleware, AdmissionGate, admission_gates, route_class
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("POST", "/users/login", "auth"),
+        ("POST", "/users/register/", "auth"),
+        ("GET", "/vehicles/", "reads"),
+        ("POST", "/rentals/", "writes"),
+        ("GET", "/vehicles/feed", None),
+        ("GET", "/metrics", None),
+    ],
+)
+def test_route_classes(method, path, expected):
+    assert route_class({"method": method, "path": path}) == expected
+
+
+def test_released_slot_passes_to_the_oldest_waiter():
+    async def scenario():
+        gate = AdmissionGate(limit=1, target=1.0)
+        assert await gate.acquire() == 0.0
+        first = asyncio.ensure_future(gate.acquire())
+        second = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0.01)
+        assert gate.stats()["queued"] == 2
+
+        gate.release()
+        assert await first >= 0.0
+        assert not second.done()
+        gate.release()
+        await second
+        gate.release()
+        return gate.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+    assert stats["admitted"] == 3 and stats["shed"] == 0
+
+
+def test_queue_older_than_target_sheds_new_arrivals_at_once(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    # Only the gate's clock moves; the event loop keeps real time.
+    monkeypatch.setattr(middleware, "time", SimpleNamespace(monotonic=lambda: clock.now))
+
+    async def scenario():
+        gate = AdmissionGate(limit=1, target=0.05)
+        await gate.acquire()
+        stuck = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        clock.now += 1.0
+        # The oldest waiter is past the target, so the next arrival does not queue.
+        assert await gate.acquire() is None
+        assert gate.stats()["queued"] == 1
+        # The stuck waiter gives up at its own deadline and leaves the queue.
+        assert await stuck is None
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert gate.shed == 2
+    assert gate.in_flight == 1
+    assert gate.stats()["queued"] == 0
+
+
+def test_middleware_answers_503_when_full_and_leaves_other_classes_alone():
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["method"] == "POST":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    gates = admission_gates({"writes": 1, "reads": 0}, target=0.05)
+    gated = AdmissionControlMiddleware(app, gates=gates)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=gated)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            holding = asyncio.ensure_future(http.post("/rentals/"))
+            await asyncio.sleep(0.01)
+            shed = await http.post("/rentals/")
+            read = await http.get("/vehicles/")
+            release.set()
+            return shed, read, await holding
+
+    shed, read, held = asyncio.run(scenario())
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert read.status_code == 200 and "reads" not in gates
+    assert held.status_code == 200
+    assert gates["writes"].stats()["in_flight"] == 0
@@ -0,0 +1,83 @@
+from app.db.session import SessionLocal
+from app.services.rollup_service import RollupService
+
+DAY = {"start": "2032-05-01T00:00:00", "end": "2032-05-02T00:00:00"}
+
+
+def _hourly(client, admin_headers, vehicle):
+    rows = client.get(
+        "/analytics/revenue",
+        params={**DAY, "granularity": "hour", "vehicle_id": vehicle["id"]},
+        headers=admin_headers,
+    ).json()
+    return [
+        (row["bucket_start"][11:16], row["rentals"], row["revenue"], row["rented_hours"])
+        for row in rows
+        if row["rentals"] or row["rented_hours"]
+    ]
+
+
+def test_rollups_follow_every_change_to_a_rental(client, admin_headers, vehicle, user):
+    rental = client.post(
+        "/rentals/",
+        json={
+            "vehicle_id": vehicle["id"],
+            "user_id": 0,
+            "start_time": "2032-05-01T10:30:00",
+            "end_time": "2032-05-01T12:15:00",
+            "total_cost": 5.25,
+        },
+        headers=user["headers"],
+    ).json()
+    # Counted once where it started; its time is split across the hours it spans.
+    assert _hourly(client, admin_headers, vehicle) == [
+        ("10:00", 1, 5.25, 0.5),
+        ("11:00", 0, 0.0, 1.0),
+        ("12:00", 0, 0.0, 0.25),
+    ]
+
+    client.put(f"/rentals/{rental['id']}", json={"end_time": "2032-05-01T11:00:00"}, headers=user["headers"])
+    assert _hourly(client, admin_headers, vehicle) == [("10:00", 1, 1.5, 0.5)]
+
+    daily = client.get(
+        "/analytics/utilization", params={**DAY, "granularity": "day", "vehicle_type": "bike"}, headers=admin_headers
+    ).json()
+    assert daily[0]["rented_hours"] >= 0.5
+    assert 0 < daily[0]["utilization"] <= 1
+
+    client.delete(f"/rentals/{rental['id']}", headers=user["headers"])
+    assert _hourly(client, admin_headers, vehicle) == []
+
+
+def test_incremental_rollups_match_a_rebuild(client, admin_headers, vehicle, user):
+    for start, end in (("09:00", "09:40"), ("13:10", "15:00"), ("23:30", "23:59")):
+        client.post(
+            "/rentals/",
+            json={
+                "vehicle_id": vehicle["id"],
+                "user_id": 0,
+                "start_time": f"2032-05-01T{start}:00",
+                "end_time": f"2032-05-01T{end}:00",
+                "total_cost": 2.0,
+            },
+            headers=user["headers"],
+        )
+    incremental = _hourly(client, admin_headers, vehicle)
+    assert [bucket[0] for bucket in incremental] == ["09:00", "13:00", "14:00", "23:00"]
+
+    with SessionLocal() as db:
+        assert RollupService().rebuild(db) > 0
+    assert _hourly(client, admin_headers, vehicle) == incremental
+
+
+def test_windows_are_validated_and_admin_only(client, admin_headers, user):
+    backwards = client.get("/analytics/revenue", params={"start": DAY["end"], "end": DAY["start"]}, headers=admin_headers)
+    assert backwards.status_code == 400
+    too_long = client.get(
+        "/analytics/utilization",
+        params={"granularity": "hour", "start": "2032-01-01T00:00:00", "end": "2032-03-01T00:00:00"},
+        headers=admin_headers,
+    )
+    assert too_long.status_code == 400
+    assert "max 31 days" in too_long.json()["detail"]
+    assert client.get("/analytics/revenue", params=DAY, headers=user["headers"]).status_code == 403
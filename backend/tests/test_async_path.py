@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.db.async_session import AsyncSessionLocal, async_database_url, async_engine
+from app.schemas.rental import RentalCreate, RentalUpdate
+from app.services.async_rental_service import AsyncRentalService
+from app.services.async_vehicle_service import AsyncVehicleService
+from app.services.rental_service import VehicleUnavailableError
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql://app:s3cret@db/rentals", "postgresql+asyncpg://app:s3cret@db/rentals"),
+        # An explicit driver is the caller's choice and is left alone.
+        ("postgresql+psycopg://db/rentals", "postgresql+psycopg://db/rentals"),
+        ("oracle://db/rentals", "oracle://db/rentals"),
+    ],
+)
+def test_async_database_url_swaps_only_default_drivers(url, expected):
+    assert async_database_url(url) == expected
+
+
+def test_rental_round_trip_through_the_async_services(client, vehicle, user):
+    rentals, vehicles = AsyncRentalService(), AsyncVehicleService()
+    opened = RentalCreate(vehicle_id=vehicle["id"], user_id=user["id"], start_time=datetime(2025, 7, 1, 9))
+
+    async def scenario():
+        try:
+            async with AsyncSessionLocal() as db:
+                rental_id = (await rentals.create_rental(db, opened)).id
+                assert (await vehicles.get_vehicle(db, vehicle["id"])).available is False
+                # The failed create rolls the session back, expiring what it had loaded.
+                with pytest.raises(VehicleUnavailableError):
+                    await rentals.create_rental(db, opened.model_copy(update={"user_id": 1}))
+                closed = await rentals.update_rental(db, rental_id, RentalUpdate(end_time=datetime(2025, 7, 1, 10)))
+                return closed.total_cost, (await vehicles.get_vehicle(db, vehicle["id"])).available
+        finally:
+            # Pooled connections belong to this event loop, which ends with asyncio.run.
+            await async_engine.dispose()
+
+    assert asyncio.run(scenario()) == (3.0, True)
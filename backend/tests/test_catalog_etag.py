@@ -0,0 +1,28 @@
+from app.core.config import settings
+
+
+def test_matching_tag_answers_304_without_touching_the_database(client, vehicle, monkeypatch):
+    first = client.get("/vehicles/")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 0)
+    for if_none_match in (etag, f'"stale", {etag}', "*"):
+        cached = client.get("/vehicles/", headers={"If-None-Match": if_none_match})
+        assert cached.status_code == 304
+        assert cached.headers["ETag"] == etag
+        assert cached.content == b""
+    # One version covers the whole catalog, single-vehicle reads included.
+    assert client.get(f"/vehicles/{vehicle['id']}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_any_catalog_write_retires_the_tag(client, admin_headers, vehicle):
+    etag = client.get(f"/vehicles/{vehicle['id']}").headers["ETag"]
+    assert client.get(f"/vehicles/{vehicle['id']}", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    client.put(f"/vehicles/{vehicle['id']}", json={"description": "new saddle"}, headers=admin_headers)
+    fresh = client.get(f"/vehicles/{vehicle['id']}", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["description"] == "new saddle"
+    assert fresh.headers["ETag"] != etag
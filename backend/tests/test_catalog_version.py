@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+from app.api.feed import relay_other_workers
+from app.core.catalog_version import CatalogVersion
+from app.core.live_feed import LiveFeed
+
+
+def test_workers_mapping_one_file_share_version_and_etag(tmp_path):
+    path = str(tmp_path / "catalog_version")
+    first, second = CatalogVersion(path), CatalogVersion(path)
+    assert first.shared and second.shared
+    assert first.etag() == second.etag()
+
+    first.bump()
+    assert second.value == 1
+    assert first.etag() == second.etag()
+    # A private counter starts its own epoch, so its tags never match a shared one.
+    assert CatalogVersion().etag() != first.etag()
+
+
+def test_concurrent_bumps_from_separate_mappings_are_not_lost(tmp_path):
+    path = str(tmp_path / "catalog_version")
+    versions = [CatalogVersion(path) for _ in range(4)]
+    threads = [threading.Thread(target=lambda v=v: [v.bump() for _ in range(250)]) for v in versions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert versions[0].value == 1000
+    assert [version.local_bumps for version in versions] == [250] * 4
+
+
+def test_relay_resets_only_on_other_workers_changes(tmp_path):
+    path = str(tmp_path / "catalog_version")
+    mine, other = CatalogVersion(path), CatalogVersion(path)
+    feed = LiveFeed(buffer_size=8)
+    resyncs = []
+
+    async def resync():
+        resyncs.append(mine.value)
+
+    async def scenario():
+        relay = asyncio.create_task(relay_other_workers(feed, mine, 0.01, on_change=resync))
+        await asyncio.sleep(0.03)
+        mine.bump()
+        await asyncio.sleep(0.03)
+        assert feed.head == 0 and resyncs == []
+        other.bump()
+        await asyncio.sleep(0.03)
+        relay.cancel()
+
+    asyncio.run(scenario())
+    assert [event.kind for event in feed.since(0, 10)] == ["reset"]
+    assert resyncs == [2]
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.api import exports
+
+
+@pytest.fixture
+def ledger(client, vehicle, user):
+    """Three closed rentals in early January 2031, a window only this module writes to."""
+    ids = []
+    for day in (3, 1, 2):
+        response = client.post(
+            "/rentals/",
+            json={
+                "vehicle_id": vehicle["id"],
+                "user_id": 0,
+                "start_time": f"2031-01-0{day}T08:00:00",
+                "end_time": f"2031-01-0{day}T09:30:00",
+                "total_cost": 4.5,
+            },
+            headers=user["headers"],
+        )
+        ids.append(response.json()["id"])
+    return {"ids": ids, "user": user, "vehicle": vehicle}
+
+
+WINDOW = {"start_from": "2031-01-01T00:00:00", "start_to": "2031-01-03T00:00:00"}
+
+
+def test_csv_and_ndjson_exports_agree(client, admin_headers, ledger):
+    as_csv = client.get("/rentals/export", params={"format": "csv", **WINDOW}, headers=admin_headers)
+    assert as_csv.headers["content-type"].startswith("text/csv")
+    assert as_csv.headers["content-disposition"] == 'attachment; filename="rentals.csv"'
+    rows = [row for row in csv.DictReader(io.StringIO(as_csv.text)) if row["user_id"] == str(ledger["user"]["id"])]
+    # Ordered by id; the January 3rd rental starts on the window's exclusive end.
+    assert [int(row["id"]) for row in rows] == ledger["ids"][1:]
+    assert rows[0] == {
+        "id": str(ledger["ids"][1]),
+        "user_id": str(ledger["user"]["id"]),
+        "vehicle_id": str(ledger["vehicle"]["id"]),
+        "start_time": "2031-01-01T08:00:00",
+        "end_time": "2031-01-01T09:30:00",
+        "total_cost": "4.5",
+    }
+
+    as_ndjson = client.get("/rentals/export", params=WINDOW, headers=admin_headers)
+    records = [
+        record for record in map(json.loads, as_ndjson.text.splitlines()) if record["user_id"] == ledger["user"]["id"]
+    ]
+    assert [{key: str(value) for key, value in record.items()} for record in records] == rows
+
+
+def test_export_streams_in_batches(ledger, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    chunks = list(exports.stream_rental_export("csv", start_from=None, start_to=None))
+    # The header rides with the first batch; every later chunk holds at most two rows.
+    assert len(chunks) >= 2
+    assert all(chunk.count("\n") <= 2 for chunk in chunks[1:])
+
+
+def test_export_is_admin_only(client, ledger):
+    assert client.get("/rentals/export", headers=ledger["user"]["headers"]).status_code == 403
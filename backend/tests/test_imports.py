@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.db.session import SessionLocal, engine
+from app.models.rental import Rental
+from app.services.active_rentals import UserHasOpenRentalError, active_rentals
+from app.services.import_service import ImportService
+from app.services.rental_service import VehicleUnavailableError, open_rental_conflict
+
+
+def test_open_rental_written_outside_the_server_still_blocks_the_user(client, admin_headers, vehicle, user):
+    # As the import CLI would: straight into the database, this process's registry never hears of it.
+    with engine.begin() as conn:
+        conn.execute(insert(Rental.__table__).values(
+            vehicle_id=vehicle["id"], user_id=user["id"], start_time=datetime(2025, 4, 1, 8)
+        ))
+    assert active_rentals.for_user(user["id"]) == []
+    spare = client.post(
+        "/vehicles/", json={"name": "spare", "vehicle_type": "bike", "price_per_hour": 3.0}, headers=admin_headers
+    ).json()
+
+    rented = client.post(
+        "/rentals/", json={"vehicle_id": spare["id"], "user_id": 0, "start_time": "2025-04-01T09:00:00"},
+        headers=user["headers"],
+    )
+    assert rented.status_code == 409
+    assert rented.json()["detail"] == "User already has an open rental"
+    # The failed create left the spare vehicle unclaimed.
+    assert client.get(f"/vehicles/{spare['id']}").json()["available"] is True
+    client.get("/rentals/active/check", headers=admin_headers, params={"repair": True})
+
+
+def test_import_without_open_rentals_keeps_closed_lines(client, vehicle, user):
+    lines = [
+        f'{{"vehicle_id": {vehicle["id"]}, "user_id": {user["id"]}, "start_time": "2025-04-02T08:00:00"}}\n',
+        f'{{"vehicle_id": {vehicle["id"]}, "user_id": {user["id"]}, "start_time": "2025-04-02T08:00:00",'
+        f' "end_time": "2025-04-02T09:00:00", "total_cost": 3.0}}\n',
+    ]
+    with SessionLocal() as db:
+        report = ImportService(open_rentals=False).import_lines(db, "rentals", lines)
+
+    assert report.inserted == 1
+    assert [(error.line, error.error) for error in report.errors] == [
+        (1, "end_time: open rentals cannot be imported here")
+    ]
+    assert active_rentals.for_vehicle(vehicle["id"]) == []
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["available"] is True
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("UNIQUE constraint failed: rentals.user_id", UserHasOpenRentalError),
+        ('duplicate key value violates unique constraint "ix_rentals_open_user"', UserHasOpenRentalError),
+        ("UNIQUE constraint failed: rentals.vehicle_id", VehicleUnavailableError),
+    ],
+)
+def test_open_rental_index_violations_map_to_service_errors(message, expected):
+    error = open_rental_conflict(IntegrityError("INSERT INTO rentals ...", {}, Exception(message)))
+    assert type(error) is expected
+
+
+def test_vehicle_csv_import_reports_bad_lines_and_indexes_positions(client, admin_headers, user):
+    body = "\n".join([
+        "name,vehicle_type,price_per_hour,description,latitude,longitude",
+        'csv bike,bike,2.5,"red, with basket",-41.2901,174.7801',
+        "csv scooter,scooter,not-a-price,,,",
+        "csv spare,scooter,4",
+        "csv scooter,scooter,4.5,,-41.2902,174.7802",
+    ])
+    params = {"chunk_size": 2}
+    assert client.post("/vehicles/import", content=body, params=params, headers=user["headers"]).status_code == 403
+
+    response = client.post(
+        "/vehicles/import", content=body, params=params, headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["inserted"], report["failed"]) == (2, 2)
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert report["errors"][0]["error"].startswith("price_per_hour:")
+    assert report["errors"][1]["error"] == "Expected 6 columns, got 3"
+
+    nearby = client.get("/vehicles/nearby", params={"lat": -41.29, "lng": 174.78, "radius_km": 1}).json()
+    assert [(vehicle["name"], vehicle["description"]) for vehicle in nearby] == [
+        ("csv bike", "red, with basket"),
+        ("csv scooter", None),
+    ]
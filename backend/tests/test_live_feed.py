@@ -0,0 +1,66 @@
+import asyncio
+
+from app.api.feed import parse_event_id, stream_feed
+from app.core.live_feed import LiveFeed
+
+
+def _collect(feed: LiveFeed, last_seq: int | None, chunks: int) -> list[str]:
+    async def pull():
+        stream = stream_feed(feed, last_seq)
+        try:
+            return [await anext(stream) for _ in range(chunks)]
+        finally:
+            await stream.aclose()
+
+    return asyncio.run(pull())
+
+
+def test_resume_replays_only_what_was_missed():
+    feed = LiveFeed(buffer_size=8)
+    for vehicle_id in (1, 2, 3):
+        feed.publish("vehicle", {"id": vehicle_id, "available": False})
+
+    retry, missed = _collect(feed, parse_event_id(feed, f"{feed.epoch}-1"), chunks=2)
+    assert retry.startswith("retry: ")
+    # Everything published since the client's last id, in one write.
+    assert missed == (
+        f"id: {feed.epoch}-2\nevent: vehicle\ndata: {{\"id\":2,\"available\":false}}\n\n"
+        f"id: {feed.epoch}-3\nevent: vehicle\ndata: {{\"id\":3,\"available\":false}}\n\n"
+    )
+    assert feed.subscribers == 0
+
+
+def test_client_behind_the_ring_is_told_to_reset():
+    feed = LiveFeed(buffer_size=2)
+    for vehicle_id in range(5):
+        feed.publish("vehicle", {"id": vehicle_id})
+
+    _, reset = _collect(feed, 1, chunks=2)
+    assert reset == f"id: {feed.epoch}-5\nevent: reset\ndata: {{}}\n\n"
+    assert feed.resets == 1
+    # Ids from another run, or garbage, cannot be resumed either.
+    assert parse_event_id(feed, "deadbeef-3") == -1
+    assert parse_event_id(feed, f"{feed.epoch}-x") == -1
+    assert parse_event_id(feed, None) is None
+
+
+def test_live_subscriber_wakes_on_a_publish_from_another_thread():
+    feed = LiveFeed(buffer_size=8)
+
+    async def scenario():
+        feed.bind(asyncio.get_running_loop())
+        stream = stream_feed(feed, None)
+        try:
+            await anext(stream)
+            ready = await anext(stream)
+            waiting = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            await asyncio.to_thread(feed.publish, "vehicle", {"id": 7})
+            return ready, await asyncio.wait_for(waiting, 1)
+        finally:
+            await stream.aclose()
+
+    ready, delta = asyncio.run(scenario())
+    assert ready == f"id: {feed.epoch}-0\nevent: ready\ndata: {{}}\n\n"
+    assert delta == f"id: {feed.epoch}-1\nevent: vehicle\ndata: {{\"id\":7}}\n\n"
@@ -0,0 +1,47 @@
+from app.core.metrics import Metrics, RequestStats
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        name: float(value)
+        for name, _, value in (line.rpartition(" ") for line in text.splitlines() if not line.startswith("#"))
+    }
+
+
+def test_routes_are_reported_by_template_with_their_sql(client, vehicle):
+    route = 'route="/vehicles/{vehicle_id}"'
+    before = _samples(client.get("/metrics").text)
+    client.get(f"/vehicles/{vehicle['id']}")
+    client.get("/vehicles/987654321")
+    after = _samples(client.get("/metrics").text)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert delta(f'http_request_duration_seconds_count{{method="GET",{route}}}') == 2
+    assert delta(f'http_requests_total{{method="GET",{route},status="200"}}') == 1
+    assert delta(f'http_requests_total{{method="GET",{route},status="404"}}') == 1
+    assert delta(f'http_request_db_queries_total{{method="GET",{route}}}') >= 2
+    # Concrete ids never become series of their own.
+    assert not any("987654321" in name for name in after)
+    assert after["http_requests_in_flight"] == 1
+
+
+def test_histogram_is_cumulative_and_collectors_export_numbers_only():
+    metrics = Metrics()
+    for seconds in (0.003, 0.02, 0.02, 30.0):
+        metrics.request_started()
+        stats = RequestStats()
+        stats.db_queries = 2
+        metrics.request_finished("GET", '/odd "route"', 200, seconds, stats)
+    metrics.register_collector("pool", lambda: {"size": 4, "busy": 1.5, "healthy": True, "name": "bcrypt"})
+
+    samples = _samples(metrics.render())
+    labels = 'method="GET",route="/odd \\"route\\""'
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="0.005"}}'] == 1
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="0.025"}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="10.0"}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'] == 4
+    assert samples[f"http_request_db_queries_total{{{labels}}}"] == 8
+    assert samples["http_requests_in_flight"] == 0
+    assert {name for name in samples if name.startswith("app_pool_")} == {"app_pool_size", "app_pool_busy"}
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text, tuple_
+
+from app.api.pagination import encode_cursor
+from app.db.session import SessionLocal
+from app.models.rental import Rental
+
+
+def test_boolean_keyset_cursor_is_rejected(client):
+    response = client.get("/vehicles/search", params={"cursor": encode_cursor(True, 1)})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_boolean_id_cursor_is_rejected(client):
+    assert client.get("/vehicles/", params={"cursor": encode_cursor(False)}).status_code == 400
+
+
+def _history(user, vehicle, starts):
+    with SessionLocal() as db:
+        db.add_all(
+            Rental(user_id=user["id"], vehicle_id=vehicle["id"], start_time=start, end_time=start + timedelta(hours=1))
+            for start in starts
+        )
+        db.commit()
+
+
+def _walk(client, headers, limit, **params):
+    pages = []
+    while True:
+        response = client.get("/users/me/rentals", params={**params, "limit": limit}, headers=headers)
+        assert response.status_code == 200
+        pages.append([(rental["start_time"], rental["id"]) for rental in response.json()])
+        if "X-Next-Cursor" not in response.headers:
+            return pages
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+def test_my_rentals_pages_newest_first_without_gaps_or_repeats(client, vehicle, user):
+    noon = datetime(2024, 3, 1, 12)
+    # Two rentals share a start time, so only the id can order them across a page boundary.
+    _history(user, vehicle, [noon - timedelta(days=day) for day in range(5)] + [noon - timedelta(days=2)])
+
+    everything = client.get("/users/me/rentals", headers=user["headers"]).json()
+    expected = sorted(((r["start_time"], r["id"]) for r in everything), reverse=True)
+    assert len(expected) == 6
+
+    pages = _walk(client, user["headers"], limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert [row for page in pages for row in page] == expected
+
+    window = _walk(client, user["headers"], limit=1, start_from="2024-02-27T12:00:00", start_to="2024-03-01T12:00:00")
+    assert [row[0] for page in window for row in page] == [
+        "2024-02-29T12:00:00", "2024-02-28T12:00:00", "2024-02-28T12:00:00", "2024-02-27T12:00:00",
+    ]
+
+
+def test_my_rentals_rejects_bad_cursors_and_anonymous_callers(client, user):
+    for cursor in ("%%%", encode_cursor(1, 2), encode_cursor("not a time", 1)):
+        response = client.get("/users/me/rentals", params={"cursor": cursor}, headers=user["headers"])
+        assert response.status_code == 400, cursor
+    assert client.get("/users/me/rentals").status_code == 401
+
+
+def test_my_rentals_page_is_one_index_range(client):
+    with SessionLocal() as db:
+        query = (
+            select(Rental.id)
+            .where(Rental.user_id == 1, Rental.start_time >= datetime(2024, 1, 1))
+            .where(tuple_(Rental.start_time, Rental.id) < (datetime(2024, 6, 1), 10))
+            .order_by(Rental.start_time.desc(), Rental.id.desc())
+            .limit(3)
+        )
+        sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+        plan = " ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+    assert "ix_rentals_user_start" in plan
+    assert "TEMP B-TREE" not in plan
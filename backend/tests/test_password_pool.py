@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.core.password_pool import PasswordHashingBusy, PasswordHashPool
+from app.core.security import password_pool
+
+
+def _hold(pool: PasswordHashPool) -> tuple[threading.Thread, threading.Event]:
+    """Occupy one slot of ``pool`` until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=pool.run, args=(blocking,))
+    holder.start()
+    assert started.wait(5)
+    return holder, release
+
+
+def test_inline_pool_rejects_beyond_its_queue():
+    pool = PasswordHashPool(workers=0, max_queue=1)
+    assert pool.run(pow, 2, 10) == 1024
+
+    holders = [_hold(pool)]
+    # The inline pool can still run one call in place of a worker, plus one queued.
+    holders.append(_hold(pool))
+    with pytest.raises(PasswordHashingBusy):
+        pool.run(pow, 2, 3)
+    for holder, release in holders:
+        release.set()
+        holder.join()
+
+    stats = pool.stats()
+    assert (stats["completed"], stats["rejected"], stats["in_flight"]) == (3, 1, 0)
+    assert pool.run(pow, 2, 3) == 8
+
+
+def test_login_sheds_with_503_while_hashing_is_saturated(client, monkeypatch):
+    monkeypatch.setattr(password_pool, "max_queue", 0)
+    holder, release = _hold(password_pool)
+    try:
+        response = client.post(
+            "/users/login", data={"username": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD}
+        )
+    finally:
+        release.set()
+        holder.join()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    retried = client.post("/users/login", data={"username": settings.ADMIN_EMAIL, "password": settings.ADMIN_PASSWORD})
+    assert retried.status_code == 200
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.schema import migrate
+from app.models.rental import Rental
+from app.models.rental_rollup import RentalHourlyRollup
+from app.models.vehicle import Vehicle
+from app.services.pricing_service import Fleet, PricingEngine
+
+NOW = datetime(2030, 1, 1, 12)
+
+
+def _engine(**overrides) -> PricingEngine:
+    options = dict(
+        window=timedelta(hours=24),
+        interval=60,
+        vehicle_weight=0.5,
+        min_multiplier=0.5,
+        max_multiplier=2.5,
+        max_step=0.5,
+    )
+    options.update(overrides)
+    return PricingEngine({"default": [(0, 1.0), (10, 2.0)], "scooter": [(0, 1.0), (10, 3.0)]}, **options)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pricing.db")
+    migrate(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def test_price_blends_demand_per_type_and_limits_each_step():
+    fleet = Fleet(
+        ids=np.array([1, 2, 3]),
+        type_codes=np.array([0, 0, 1]),
+        types=["bike", "scooter"],
+        base=np.array([2.0, 2.0, 4.0]),
+        current=np.array([2.0, 2.0, 4.0]),
+    )
+    engine = _engine()
+    np.testing.assert_allclose(engine.price(fleet, np.array([4.0, 0.0, 2.0])), [2.6, 2.2, 5.6])
+    # Off the end of the scooter curve: 3x is capped at 2.5x, then at +50% for this run.
+    np.testing.assert_allclose(engine.price(fleet, np.array([4.0, 0.0, 100.0]))[2], 6.0)
+
+
+@pytest.mark.parametrize(
+    "curves", [{"bike": [(0, 1.0)]}, {"default": [(0, 1.0), (0, 2.0)]}, {"default": [(5, 1.0), (1, 2.0)]}]
+)
+def test_curves_must_have_a_default_and_increasing_demand(curves):
+    with pytest.raises(ValueError):
+        PricingEngine(
+            curves,
+            window=timedelta(hours=1),
+            interval=1,
+            vehicle_weight=0.5,
+            min_multiplier=0.5,
+            max_multiplier=2.0,
+            max_step=0.25,
+        )
+
+
+def test_run_counts_recent_rollups_and_open_rentals(db):
+    busy = Vehicle(name="busy", vehicle_type="bike", price_per_hour=2.0)
+    quiet = Vehicle(name="quiet", vehicle_type="bike", price_per_hour=2.0)
+    db.add_all([busy, quiet])
+    db.flush()
+    db.add_all([
+        RentalHourlyRollup(bucket_start=NOW - timedelta(hours=2), vehicle_id=busy.id, vehicle_type="bike", rentals=4),
+        # Outside the window, and for a vehicle that no longer exists.
+        RentalHourlyRollup(bucket_start=NOW - timedelta(days=3), vehicle_id=quiet.id, vehicle_type="bike", rentals=50),
+        RentalHourlyRollup(bucket_start=NOW - timedelta(hours=1), vehicle_id=999, vehicle_type="bike", rentals=50),
+        Rental(vehicle_id=quiet.id, start_time=NOW - timedelta(hours=1)),
+    ])
+    db.commit()
+
+    engine = _engine()
+    assert engine.run_once(db, now=NOW) == 2
+    # Bike demand averages 2.5: busy blends to 3.25, quiet to 1.75.
+    assert db.scalars(select(Vehicle.price_per_hour).order_by(Vehicle.id)).all() == [2.65, 2.35]
+    assert engine.run_once(db, now=NOW) == 0
+    assert engine.stats()["runs"] == 2
+
+
+def test_run_leaves_alone_a_vehicle_whose_base_price_changed_meanwhile(db, monkeypatch):
+    db.add_all([Vehicle(name=name, vehicle_type="bike", price_per_hour=2.0) for name in ("edited", "other")])
+    db.commit()
+    edited_id, other_id = db.scalars(select(Vehicle.id).order_by(Vehicle.id)).all()
+    engine = _engine(min_multiplier=1.5, max_multiplier=1.5)
+    load_fleet = engine.load_fleet
+
+    def fleet_then_admin_edit(session):
+        fleet = load_fleet(session)
+        session.execute(
+            update(Vehicle).where(Vehicle.id == edited_id).values(base_price_per_hour=5.0, price_per_hour=5.0)
+        )
+        return fleet
+
+    monkeypatch.setattr(engine, "load_fleet", fleet_then_admin_edit)
+    assert engine.run_once(db, now=NOW) == 1
+    assert db.get(Vehicle, edited_id).price_per_hour == 5.0
+    assert db.get(Vehicle, other_id).price_per_hour == 3.0
@@ -0,0 +1,37 @@
+import time
+
+from app.core.principal_cache import PrincipalCache, principal_cache
+
+
+def test_entries_expire_evict_and_invalidate_per_user():
+    cache = PrincipalCache(ttl=60, max_size=2)
+    cache.put("a1", {"id": 1})
+    cache.put("a2", {"id": 1})
+    assert cache.get("a1") == {"id": 1}
+    # a2 is now the least recently used, so a third token pushes it out.
+    cache.put("b1", {"id": 2})
+    assert cache.get("a2") is None
+    assert cache.get("b1") == {"id": 2}
+
+    cache.invalidate_user(1)
+    assert cache.get("a1") is None
+    assert cache.get("b1") == {"id": 2}
+
+    # Never outlives the token it was built from.
+    cache.put("c1", {"id": 3}, token_expires_at=time.time() - 1)
+    assert cache.get("c1") is None
+    assert cache.stats()["size"] == 1
+
+
+def test_profile_change_and_deletion_reach_cached_tokens(client, admin_headers, user):
+    assert client.get("/users/me", headers=user["headers"]).status_code == 200
+    hits = principal_cache.hits
+    assert client.get("/users/me", headers=user["headers"]).status_code == 200
+    assert principal_cache.hits == hits + 1
+
+    renamed = client.patch("/users/me", json={"full_name": "Renamed Rider"}, headers=user["headers"])
+    assert renamed.status_code == 200
+    assert client.get("/users/me", headers=user["headers"]).json()["full_name"] == "Renamed Rider"
+
+    assert client.delete(f"/users/{user['id']}", headers=admin_headers).status_code == 204
+    assert client.get("/users/me", headers=user["headers"]).status_code == 401
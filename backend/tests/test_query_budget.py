@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import QueryBudgetExceeded
+
+# One page of rentals plus one IN (...) query per expanded relationship.
+BUDGET = 3
+
+
+@pytest.fixture
+def rider_with_history(client, admin_headers, user):
+    for hour in range(5):
+        vehicle = client.post(
+            "/vehicles/", json={"name": f"budget {hour}", "vehicle_type": "bike", "price_per_hour": 2.0},
+            headers=admin_headers,
+        ).json()
+        created = client.post(
+            "/rentals/",
+            json={
+                "vehicle_id": vehicle["id"],
+                "user_id": 0,
+                "start_time": f"2025-04-01T{hour:02d}:00:00",
+                "end_time": f"2025-04-01T{hour:02d}:30:00",
+            },
+            headers=user["headers"],
+        )
+        assert created.status_code == 201
+    # Authenticate once so the principal cache serves the requests under test.
+    assert client.get("/users/me", headers=user["headers"]).status_code == 200
+    return user
+
+
+def test_rental_reads_stay_within_budget(client, monkeypatch, rider_with_history):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", BUDGET)
+
+    expanded = client.get("/rentals/", params={"user_id": rider_with_history["id"], "expand": "vehicle,user"})
+    assert expanded.status_code == 200
+    assert len(expanded.json()) == 5
+    assert all(rental["vehicle"] and rental["user"] for rental in expanded.json())
+
+    history = client.get("/users/me/rentals", headers=rider_with_history["headers"])
+    assert history.status_code == 200
+    assert len(history.json()) == 5
+
+
+def test_exceeding_budget_raises(client, monkeypatch, rider_with_history):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", BUDGET - 1)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get("/rentals/", params={"user_id": rider_with_history["id"], "expand": "vehicle,user"})
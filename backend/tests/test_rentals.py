@@ -0,0 +1,40 @@
+from app.db.session import SessionLocal
+from app.services.pricing_service import _SET_PRICE
+
+
+def test_closed_rental_cannot_be_reopened(client, admin_headers, vehicle, user):
+    rental = client.post(
+        "/rentals/", json={"vehicle_id": vehicle["id"], "user_id": 0, "start_time": "2025-06-01T10:00:00"},
+        headers=user["headers"],
+    ).json()
+    closed = client.put(f"/rentals/{rental['id']}", json={"end_time": "2025-06-01T12:00:00"}, headers=user["headers"])
+    assert closed.status_code == 200
+    assert closed.json()["total_cost"] == 6.0
+
+    reopened = client.put(f"/rentals/{rental['id']}", json={"end_time": None}, headers=user["headers"])
+    assert reopened.status_code == 400
+    assert reopened.json()["detail"] == "A closed rental cannot be reopened"
+    assert client.get(f"/rentals/{rental['id']}").json()["end_time"] == "2025-06-01T12:00:00"
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["available"] is True
+
+    # Leaving end_time out still edits a closed rental.
+    edited = client.put(f"/rentals/{rental['id']}", json={"total_cost": 5.0}, headers=user["headers"])
+    assert edited.json()["total_cost"] == 5.0
+    assert client.get("/rentals/active/check", headers=admin_headers).json()["consistent"] is True
+
+
+def test_close_charges_the_rate_the_rental_started_at(client, vehicle, user):
+    rental = client.post(
+        "/rentals/", json={"vehicle_id": vehicle["id"], "user_id": 0, "start_time": "2025-06-02T10:00:00"},
+        headers=user["headers"],
+    ).json()
+    assert rental["price_per_hour"] == 3.0
+    # Exactly what a pricing run writes for this vehicle mid-rental.
+    with SessionLocal() as db:
+        db.execute(_SET_PRICE, [{"vehicle_id": vehicle["id"], "base": 3.0, "price": 9.0}])
+        db.commit()
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["price_per_hour"] == 9.0
+
+    closed = client.put(f"/rentals/{rental['id']}", json={"end_time": "2025-06-02T12:00:00"}, headers=user["headers"])
+    assert closed.json()["total_cost"] == 6.0
+    assert closed.json()["price_per_hour"] == 3.0
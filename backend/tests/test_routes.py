@@ -0,0 +1,55 @@
+import heapq
+import math
+
+from app.services.route_service import CITY_EDGES, CITY_NODES, RouteService, fare, haversine_km, route_service
+
+
+def dijkstra(source: str) -> dict[str, float]:
+    best = {source: 0.0}
+    queue = [(0.0, source)]
+    while queue:
+        dist, node = heapq.heappop(queue)
+        if dist > best[node]:
+            continue
+        for neighbour in CITY_EDGES[node]:
+            step = float(haversine_km(*CITY_NODES[node], *CITY_NODES[neighbour]))
+            if dist + step < best.get(neighbour, math.inf):
+                best[neighbour] = dist + step
+                heapq.heappush(queue, (dist + step, neighbour))
+    return best
+
+
+def test_matrix_matches_dijkstra_from_every_node():
+    for source in CITY_NODES:
+        expected = dijkstra(source)
+        for target in CITY_NODES:
+            assert math.isclose(route_service.distance_km(source, target), expected.get(target, math.inf))
+
+
+def test_unconnected_nodes_are_infinitely_far():
+    service = RouteService({"a": (47.0, 21.9), "b": (47.01, 21.9), "c": (47.02, 21.9)}, {"a": ("b",), "b": ("a",)})
+    assert service.distance_km("a", "b") > 0
+    assert math.isinf(service.distance_km("a", "c"))
+
+
+def test_quote_prices_the_road_distance(client, vehicle):
+    response = client.post(
+        "/routes/quote",
+        json={"vehicle_id": vehicle["id"], "from_node": "westPark", "destination": {"lat": 47.0381, "lng": 21.9799}},
+    )
+    assert response.status_code == 200
+    quote = response.json()
+    assert quote["to_node"] == "nufarul"
+    distance = route_service.distance_km("westPark", "nufarul")
+    assert quote["distance_km"] == round(distance, 3)
+    # A bike averages 15 km/h.
+    assert quote["cost"] == fare(3.0, distance / 15.0)
+    assert quote["eta_minutes"] == round(distance / 15.0 * 60, 1)
+
+
+def test_quote_rejects_bad_endpoints(client, vehicle):
+    assert client.post("/routes/quote", json={"vehicle_id": vehicle["id"], "from_node": "central"}).status_code == 422
+    unknown = client.post("/routes/quote", json={"vehicle_id": vehicle["id"], "from_node": "mars", "to_node": "zoo"})
+    assert (unknown.status_code, unknown.json()["detail"]) == (400, "Unknown node: mars")
+    missing = client.post("/routes/quote", json={"vehicle_id": 10**9, "from_node": "central", "to_node": "zoo"})
+    assert missing.status_code == 404
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, select, text
+
+from app.db import schema
+from app.db.schema import MIGRATIONS, Migration, migrate, schema_fingerprint, schema_migrations, stored_fingerprint
+
+
+@pytest.fixture
+def scratch(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/schema.db")
+    yield engine
+    engine.dispose()
+
+
+def _applied(engine) -> list[int]:
+    with engine.connect() as conn:
+        return list(conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+
+def test_second_start_is_a_single_read(scratch):
+    assert migrate(scratch) is True
+    assert _applied(scratch) == [migration.version for migration in MIGRATIONS]
+    assert stored_fingerprint(scratch) == schema_fingerprint()
+
+    statements = []
+    event.listen(scratch, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert migrate(scratch) is False
+    assert len(statements) == 1
+
+
+def test_legacy_database_gains_columns_indexes_and_backfills(scratch):
+    # A vehicles table from before positions and base prices, with no migration history.
+    with scratch.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE vehicles (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, vehicle_type VARCHAR NOT NULL,"
+            " description TEXT, available BOOLEAN, price_per_hour FLOAT NOT NULL)"
+        ))
+        conn.execute(text("INSERT INTO vehicles VALUES (1, 'old', 'bike', NULL, 1, 2.5)"))
+
+    assert stored_fingerprint(scratch) is None
+    assert migrate(scratch) is True
+
+    columns = {column["name"] for column in inspect(scratch).get_columns("vehicles")}
+    assert {"latitude", "longitude", "base_price_per_hour"} <= columns
+    indexes = {index["name"] for index in inspect(scratch).get_indexes("vehicles")}
+    assert "ix_vehicles_available_type_price" in indexes
+    with scratch.connect() as conn:
+        assert conn.execute(text("SELECT base_price_per_hour FROM vehicles WHERE id = 1")).scalar() == 2.5
+
+
+def test_failed_migration_resumes_where_it_stopped(scratch, monkeypatch):
+    *earlier, last = MIGRATIONS
+
+    def broken(engine):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(schema, "MIGRATIONS", [*earlier, Migration(last.version, last.name, broken)])
+    with pytest.raises(RuntimeError):
+        migrate(scratch)
+    assert _applied(scratch) == [migration.version for migration in earlier]
+    assert stored_fingerprint(scratch) is None
+
+    monkeypatch.setattr(schema, "MIGRATIONS", MIGRATIONS)
+    assert migrate(scratch) is True
+    assert _applied(scratch)[-1] == last.version
+    assert stored_fingerprint(scratch) == schema_fingerprint()
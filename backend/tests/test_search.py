@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from app.db.session import SessionLocal
+
+
+@pytest.fixture
+def fleet(client, admin_headers):
+    """A vehicle type of its own, priced 1, 2, 2, 3, 5 and 4 (the last one out of service)."""
+    vehicle_type = f"search-{os.urandom(3).hex()}"
+    ids = []
+    for price in (1.0, 2.0, 2.0, 3.0, 5.0, 4.0):
+        created = client.post(
+            "/vehicles/",
+            json={"name": f"{vehicle_type} {price}", "vehicle_type": vehicle_type, "price_per_hour": price},
+            headers=admin_headers,
+        )
+        ids.append(created.json()["id"])
+    client.put(f"/vehicles/{ids[-1]}", json={"available": False}, headers=admin_headers)
+    return vehicle_type, ids
+
+
+def _search(client, **params):
+    rows, pages = [], 0
+    while True:
+        response = client.get("/vehicles/search", params=params)
+        assert response.status_code == 200
+        rows += [(vehicle["price_per_hour"], vehicle["id"]) for vehicle in response.json()]
+        pages += 1
+        if "X-Next-Cursor" not in response.headers:
+            return rows, pages
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+
+@pytest.mark.parametrize("sort", ["price_asc", "price_desc"])
+def test_price_band_pages_in_price_then_id_order(client, fleet, sort):
+    vehicle_type, ids = fleet
+    rows, pages = _search(client, vehicle_type=vehicle_type, min_price=2, max_price=5, sort=sort, limit=1)
+    expected = [(2.0, ids[1]), (2.0, ids[2]), (3.0, ids[3]), (5.0, ids[4])]
+    assert rows == (expected if sort == "price_asc" else expected[::-1])
+    assert pages == 4
+
+
+def test_search_defaults_to_available_vehicles(client, fleet):
+    vehicle_type, ids = fleet
+    available, _ = _search(client, vehicle_type=vehicle_type)
+    assert [vehicle_id for _, vehicle_id in available] == ids[:5]
+    unavailable, _ = _search(client, vehicle_type=vehicle_type, available=False)
+    assert unavailable == [(4.0, ids[-1])]
+
+
+def test_search_is_one_range_on_the_composite_index(client):
+    with SessionLocal() as db:
+        plan = " ".join(
+            row[-1]
+            for row in db.connection().exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM vehicles WHERE vehicle_type = 'bike' AND available = 1"
+                " AND price_per_hour BETWEEN 1 AND 4 ORDER BY price_per_hour, id"
+            )
+        )
+    assert "ix_vehicles_available_type_price" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,36 @@
+import msgpack
+
+from app.api.serialization import MSGPACK_MEDIA_TYPE
+
+
+def _both(client, url, headers=None):
+    as_json = client.get(url, headers=headers)
+    as_msgpack = client.get(url, headers={**(headers or {}), "Accept": "application/x-msgpack"})
+    return as_json, as_msgpack
+
+
+def test_catalog_page_is_the_same_in_json_and_msgpack(client, admin_headers, vehicle):
+    client.post("/vehicles/", json={"name": "spare", "vehicle_type": "scooter", "price_per_hour": 4.5}, headers=admin_headers)
+    as_json, as_msgpack = _both(client, "/vehicles/?limit=1")
+
+    assert as_msgpack.headers["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+    # Headers set by dependencies and pagination survive the re-encoding.
+    for name in ("ETag", "X-Next-Cursor"):
+        assert as_msgpack.headers[name] == as_json.headers[name]
+    for response in (as_json, as_msgpack):
+        assert "Accept" in response.headers["Vary"].split(", ")
+
+
+def test_rental_datetimes_are_iso_strings_in_msgpack(client, vehicle, user):
+    rental = client.post(
+        "/rentals/", json={"vehicle_id": vehicle["id"], "user_id": 0, "start_time": "2025-07-01T08:30:00"},
+        headers=user["headers"],
+    ).json()
+    client.put(f"/rentals/{rental['id']}", json={"end_time": "2025-07-01T09:30:00"}, headers=user["headers"])
+
+    as_json, as_msgpack = _both(client, "/users/me/rentals", headers=user["headers"])
+    rows = msgpack.unpackb(as_msgpack.content)
+    assert rows == as_json.json()
+    assert (rows[0]["start_time"], rows[0]["end_time"]) == ("2025-07-01T08:30:00", "2025-07-01T09:30:00")
+    assert rows[0]["total_cost"] == 3.0
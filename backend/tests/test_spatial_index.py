@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app.services.spatial_index import GridIndex, haversine_km
+
+
+def brute_force(points, lat, lng, k, radius_km=None, available_only=True):
+    found = sorted(
+        (haversine_km(lat, lng, p_lat, p_lng), item_id)
+        for item_id, (p_lat, p_lng, available) in points.items()
+        if available or not available_only
+    )
+    return [(item_id, d) for d, item_id in found if radius_km is None or d <= radius_km][:k]
+
+
+@pytest.mark.parametrize("spread", [0.05, 5.0])
+def test_nearest_matches_a_full_scan(spread):
+    rng = random.Random(8)
+    points = {
+        i: (44.4 + rng.uniform(-spread, spread), 26.1 + rng.uniform(-spread, spread), rng.random() < 0.8)
+        for i in range(300)
+    }
+    index = GridIndex()
+    index.rebuild((i, lat, lng, available) for i, (lat, lng, available) in points.items())
+
+    for lat, lng in [(44.4, 26.1), (44.4 + spread, 26.1 - spread), (50.0, 20.0)]:
+        assert index.nearest(lat, lng, 5) == brute_force(points, lat, lng, 5)
+        assert index.nearest(lat, lng, 3, radius_km=2.0) == brute_force(points, lat, lng, 3, radius_km=2.0)
+        assert index.nearest(lat, lng, 4, available_only=False) == brute_force(points, lat, lng, 4, available_only=False)
+
+
+def test_bounding_box_follows_inserts_and_removals():
+    index = GridIndex()
+    index.upsert(1, 44.40, 26.10, True)
+    index.upsert(2, 45.40, 27.10, True)
+    index.upsert(3, 44.90, 26.60, True)
+    assert index._bounds == (4440, 4540, 2610, 2710)
+
+    index.remove(2)
+    # The far corner emptied, so the next query sees the box shrink back to what is left.
+    assert [item_id for item_id, _ in index.nearest(46.0, 28.0, 5)] == [3, 1]
+    assert index._bounds == (4440, 4490, 2610, 2660)
+
+    index.upsert(1, 44.95, 26.65, True)
+    assert index.nearest(44.95, 26.65, 1)[0][0] == 1
+    index.remove(1)
+    index.remove(3)
+    assert index.nearest(44.9, 26.6, 1) == []
+
+
+def test_nearby_endpoint_follows_rentals_and_moves(client, admin_headers, user):
+    def place(name, lat, lng):
+        return client.post(
+            "/vehicles/",
+            json={"name": name, "vehicle_type": "scooter", "price_per_hour": 4.0, "latitude": lat, "longitude": lng},
+            headers=admin_headers,
+        ).json()["id"]
+
+    def nearby(**params):
+        response = client.get("/vehicles/nearby", params={"lat": -33.92, "lng": 18.42, "radius_km": 5, **params})
+        return [(vehicle["id"], vehicle["distance_km"]) for vehicle in response.json()]
+
+    near, middle, far = place("near", -33.921, 18.421), place("middle", -33.93, 18.43), place("far", -34.5, 18.9)
+    found = nearby()
+    assert [vehicle_id for vehicle_id, _ in found] == [near, middle]
+    assert found[0][1] < found[1][1]
+
+    client.post(
+        "/rentals/", json={"vehicle_id": near, "user_id": 0, "start_time": "2025-08-01T09:00:00"}, headers=user["headers"]
+    )
+    assert [vehicle_id for vehicle_id, _ in nearby()] == [middle]
+    assert [vehicle_id for vehicle_id, _ in nearby(available=False)] == [near, middle]
+
+    client.put(f"/vehicles/{far}", json={"latitude": -33.9201, "longitude": 18.4201}, headers=admin_headers)
+    assert [vehicle_id for vehicle_id, _ in nearby(k=1)] == [far]
+    client.delete(f"/vehicles/{far}", headers=admin_headers)
+    assert [vehicle_id for vehicle_id, _ in nearby(k=1)] == [middle]
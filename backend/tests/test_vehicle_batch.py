@@ -0,0 +1,46 @@
+def _batch(client, admin_headers, body):
+    response = client.patch("/vehicles/batch", json=body, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_batch_update_by_ids_and_filter(client, admin_headers):
+    created = [
+        client.post(
+            "/vehicles/", json={"name": f"batch {i}", "vehicle_type": "batch-scooter", "price_per_hour": 4.0 + i},
+            headers=admin_headers,
+        ).json()
+        for i in range(3)
+    ]
+    ids = [vehicle["id"] for vehicle in created]
+
+    result = _batch(client, admin_headers, {"ids": ids[:2], "changes": {"available": False}})
+    assert result == {"updated": 2, "ids": ids[:2]}
+    assert [client.get(f"/vehicles/{vid}").json()["available"] for vid in ids] == [False, False, True]
+
+    result = _batch(
+        client, admin_headers, {"filter": {"vehicle_type": "batch-scooter", "min_price": 5}, "changes": {"price_per_hour": 9.0}}
+    )
+    assert result["ids"] == ids[1:]
+    assert client.get(f"/vehicles/{ids[0]}").json()["price_per_hour"] == 4.0
+
+
+def test_batch_never_frees_a_rented_vehicle(client, admin_headers, vehicle, user):
+    rented = client.post(
+        "/rentals/", json={"vehicle_id": vehicle["id"], "user_id": 0, "start_time": "2025-05-01T10:00:00"},
+        headers=user["headers"],
+    )
+    assert rented.status_code == 201
+
+    result = _batch(client, admin_headers, {"ids": [vehicle["id"]], "changes": {"available": True}})
+    assert result == {"updated": 0, "ids": []}
+    assert client.get(f"/vehicles/{vehicle['id']}").json()["available"] is False
+    assert client.get("/rentals/active", params={"vehicle_id": vehicle["id"]}).json()[0]["user_id"] == user["id"]
+
+
+def test_batch_requires_exactly_one_selection(client, admin_headers):
+    response = client.patch(
+        "/vehicles/batch", json={"ids": [1], "filter": {}, "changes": {"available": True}}, headers=admin_headers
+    )
+    assert response.status_code == 422
+    assert client.patch("/vehicles/batch", json={"filter": {}, "changes": {"available": True}}).status_code == 401
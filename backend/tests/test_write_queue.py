@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import SessionLocal, after_commit
+from app.db.write_queue import WriteQueue, WriteQueueTimeout
+from app.models.vehicle import Vehicle
+
+
+@pytest.fixture
+def queue(client):
+    write_queue = WriteQueue(max_batch=8, max_wait=0.2, timeout=5)
+    write_queue.start()
+    yield write_queue
+    write_queue.stop()
+
+
+def _add_vehicle(name, committed, fail=False):
+    def job(session):
+        session.add(Vehicle(name=name, vehicle_type="queued", price_per_hour=1.0))
+        session.flush()
+        after_commit(session, lambda: committed.append(name))
+        if fail:
+            raise ValueError(f"{name} failed")
+        return name
+
+    return job
+
+
+def _queued_names():
+    with SessionLocal() as db:
+        return set(db.scalars(select(Vehicle.name).where(Vehicle.vehicle_type == "queued")))
+
+
+def test_batch_commits_once_and_isolates_a_failing_job(queue):
+    committed = []
+    futures = [
+        queue.submit(_add_vehicle(name, committed, fail=name == "q-bad"))
+        for name in ("q-one", "q-bad", "q-two")
+    ]
+
+    assert futures[0].result(5) == "q-one"
+    with pytest.raises(ValueError, match="q-bad failed"):
+        futures[1].result(5)
+    assert futures[2].result(5) == "q-two"
+    assert queue.stats()["batches"] == 1
+    assert queue.stats()["jobs"] == 2
+    # The failing job's row and its after-commit callback were both dropped with its savepoint.
+    assert _queued_names() >= {"q-one", "q-two"}
+    assert "q-bad" not in _queued_names()
+    assert sorted(committed) == ["q-one", "q-two"]
+
+
+def test_a_job_that_never_starts_times_out_and_is_withdrawn(client):
+    slow = WriteQueue(max_batch=1, max_wait=0, timeout=0.1)
+    slow.start()
+    release = threading.Event()
+    try:
+        blocker = slow.submit(lambda session: release.wait(5))
+        with pytest.raises(WriteQueueTimeout):
+            slow.run(_add_vehicle("q-late", []))
+    finally:
+        release.set()
+        slow.stop()
+    assert blocker.result() is True
+    assert "q-late" not in _queued_names()
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState, useCallback } from 'react';
+import { useEffect, useMemo, useRef, useState, useCallback } from 'react';
 import NavBar from './components/NavBar';
 import MapPanel from './components/MapPanel';
 import VehicleGrid from './components/VehicleGrid';
@@ -6,33 +6,14 @@ import AuthPanel from './components/AuthPanel';
 import AdminPanel from './components/AdminPanel';
 import ProfilePanel from './components/ProfilePanel';
 import { useTranslator } from './i18n';
+import { fetchAllPages } from './pagination';
 
 const apiBase = import.meta.env.VITE_API_BASE_URL || '/api';
 const TOKEN_KEY = 'o2w_token';
 const ADMIN_EMAIL = 'admin@admin.com';
 const THEME_KEY = 'o2w_theme';
 
-const GRAPH_NODES = {
-  central: { lat: 47.0525, lng: 21.93 },
-  university: { lat: 47.0575, lng: 21.93 },
-  oldTown: { lat: 47.0505, lng: 21.921 },
-  station: { lat: 47.0675, lng: 21.917 },
-  nufarul: { lat: 47.038, lng: 21.98 },
-  westPark: { lat: 47.067, lng: 21.888 },
-  zoo: { lat: 47.069, lng: 21.948 },
-  industrial: { lat: 47.03, lng: 21.99 },
-};
-
-const GRAPH_EDGES = {
-  central: [['oldTown'], ['station'], ['university'], ['nufarul']],
-  oldTown: [['central'], ['westPark'], ['zoo']],
-  westPark: [['oldTown'], ['station']],
-  station: [['central'], ['westPark']],
-  university: [['central'], ['zoo'], ['nufarul']],
-  zoo: [['oldTown'], ['university']],
-  nufarul: [['central'], ['university'], ['industrial']],
-  industrial: [['nufarul']],
-};
+const CITY_CENTER = { lat: 47.0525, lng: 21.93 };
 
 const SCOOTER_AREA = [
   { lat: 47.085, lng: 21.85 },
@@ -60,6 +41,8 @@ function App() {
   const t = useTranslator(lang);
 
   const [vehicles, setVehicles] = useState([]);
+  const vehiclesRef = useRef(vehicles);
+  vehiclesRef.current = vehicles;
   const [selectedId, setSelectedId] = useState(null);
   const [rentingId, setRentingId] = useState(null);
   const [rentMessage, setRentMessage] = useState('');
@@ -78,53 +61,6 @@ function App() {
 
   const isAdmin = user?.email === ADMIN_EMAIL;
 
-  const haversineKm = (a, b) => {
-    const R = 6371;
-    const dLat = ((b.lat - a.lat) * Math.PI) / 180;
-    const dLng = ((b.lng - a.lng) * Math.PI) / 180;
-    const lat1 = (a.lat * Math.PI) / 180;
-    const lat2 = (b.lat * Math.PI) / 180;
-    const sinDLat = Math.sin(dLat / 2);
-    const sinDLng = Math.sin(dLng / 2);
-    const h = sinDLat * sinDLat + Math.cos(lat1) * Math.cos(lat2) * sinDLng * sinDLng;
-    return 2 * R * Math.asin(Math.min(1, Math.sqrt(h)));
-  };
-
-  const nearestNode = point => {
-    let best = { id: null, d: Number.POSITIVE_INFINITY };
-    Object.entries(GRAPH_NODES).forEach(([id, p]) => {
-      const d = haversineKm(point, p);
-      if (d < best.d) best = { id, d };
-    });
-    return best.id;
-  };
-
-  const dijkstra = (startId, endId) => {
-    if (!startId || !endId) return 0;
-    const dist = {};
-    const visited = new Set();
-    Object.keys(GRAPH_NODES).forEach(k => (dist[k] = Number.POSITIVE_INFINITY));
-    dist[startId] = 0;
-    while (visited.size < Object.keys(GRAPH_NODES).length) {
-      let u = null;
-      let best = Number.POSITIVE_INFINITY;
-      Object.keys(dist).forEach(k => {
-        if (!visited.has(k) && dist[k] < best) {
-          best = dist[k];
-          u = k;
-        }
-      });
-      if (u === null || u === endId) break;
-      visited.add(u);
-      (GRAPH_EDGES[u] || []).forEach(([v]) => {
-        const w = haversineKm(GRAPH_NODES[u], GRAPH_NODES[v]);
-        const alt = dist[u] + w;
-        if (alt < dist[v]) dist[v] = alt;
-      });
-    }
-    return dist[endId] === Number.POSITIVE_INFINITY ? 0 : dist[endId];
-  };
-
   const randomPointInPolygon = poly => {
     const lats = poly.map(p => p.lat);
     const lngs = poly.map(p => p.lng);
@@ -158,7 +94,9 @@ function App() {
         const next = { ...prev };
         nextVehicles.forEach(v => {
           if (next[v.id]) return;
-          if (v.vehicle_type === 'bike') {
+          if (v.latitude != null && v.longitude != null) {
+            next[v.id] = { lat: v.latitude, lng: v.longitude };
+          } else if (v.vehicle_type === 'bike') {
             const spot = pickParking();
             next[v.id] = { lat: spot.lat, lng: spot.lng };
           } else {
@@ -179,9 +117,9 @@ function App() {
   }, [token]);
 
   const fetchVehicles = useCallback(async () => {
-    const res = await fetch(`${apiRoot}/vehicles/`);
+    const res = await fetchAllPages(`${apiRoot}/vehicles/`);
     if (res.ok) {
-      const data = await res.json();
+      const data = res.items;
       setVehicles(data);
       ensurePositions(data);
     }
@@ -205,6 +143,33 @@ function App() {
     fetchVehicles();
   }, [fetchVehicles]);
 
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+    const source = new EventSource(`${apiRoot}/vehicles/feed`);
+    source.addEventListener('vehicle', event => {
+      const delta = JSON.parse(event.data);
+      if (!vehiclesRef.current.some(v => v.id === delta.id)) {
+        if (!delta.deleted) fetchVehicles();
+        return;
+      }
+      setVehicles(prev =>
+        delta.deleted
+          ? prev.filter(v => v.id !== delta.id)
+          : prev.map(v =>
+              v.id === delta.id
+                ? {
+                    ...v,
+                    ...(delta.available !== undefined && { available: delta.available }),
+                    ...(delta.price !== undefined && { price_per_hour: delta.price }),
+                  }
+                : v,
+            ),
+      );
+    });
+    source.addEventListener('reset', () => fetchVehicles());
+    return () => source.close();
+  }, [apiRoot, fetchVehicles]);
+
   useEffect(() => {
     fetchProfile();
   }, [fetchProfile]);
@@ -312,8 +277,9 @@ function App() {
         const detail = await res.json().catch(() => ({}));
         throw new Error(detail.detail || `Status ${res.status}`);
       }
+      const rental = await res.json();
       setSelectedId(id);
-      simulateRideEnd(id);
+      await simulateRideEnd(id, rental.id);
     } catch (err) {
       setRentMessage(err.message);
     } finally {
@@ -321,17 +287,31 @@ function App() {
     }
   };
 
-  const simulateRideEnd = vehicleId => {
+  const simulateRideEnd = async (vehicleId, rentalId) => {
     const vehicle = vehicles.find(v => v.id === vehicleId);
     if (!vehicle) return;
-    const prevPos = positions[vehicleId];
-    const startNode = nearestNode(prevPos || GRAPH_NODES.central);
+    const prevPos = positions[vehicleId] || CITY_CENTER;
     const nextPos = vehicle.vehicle_type === 'bike' ? pickParking() : randomPointInPolygon(SCOOTER_AREA);
-    const endNode = nearestNode(nextPos);
-    const distanceKm = Math.max(0.2, dijkstra(startNode, endNode));
-    const rate = vehicle.price_per_hour || 1;
-    const cost = (distanceKm * rate).toFixed(2);
+    const quoteRes = await fetch(`${apiRoot}/routes/quote`, {
+      method: 'POST',
+      headers: authorizedHeaders(),
+      body: JSON.stringify({
+        vehicle_id: vehicleId,
+        origin: { lat: prevPos.lat, lng: prevPos.lng },
+        destination: { lat: nextPos.lat, lng: nextPos.lng },
+      }),
+    });
+    const quote = quoteRes.ok ? await quoteRes.json() : { distance_km: 0, cost: 0 };
+    const distanceKm = Math.max(0.2, quote.distance_km);
+    const cost = quote.cost.toFixed(2);
     setPositions(prev => ({ ...prev, [vehicleId]: { lat: nextPos.lat, lng: nextPos.lng } }));
+    // Close the rental so the server hands the vehicle back to the fleet.
+    await fetch(`${apiRoot}/rentals/${rentalId}`, {
+      method: 'PUT',
+      headers: authorizedHeaders(),
+      body: JSON.stringify({ end_time: new Date().toISOString(), total_cost: Number(cost) }),
+    });
+    fetchVehicles();
     setRentMessage(
       t('rentEnded')
         .replace('{distance}', distanceKm.toFixed(1))
@@ -1,4 +1,5 @@
 import { useEffect, useState } from 'react';
+import { fetchAllPages } from '../pagination';
 
 export default function AdminPanel({ t, apiRoot, token, vehicles = [], onSaved, onBack }) {
   const [name, setName] = useState('');
@@ -20,10 +21,9 @@ export default function AdminPanel({ t, apiRoot, token, vehicles = [], onSaved,
     if (!token) return;
     setLoadingUsers(true);
     try {
-      const res = await fetch(`${apiRoot}/users/`, { headers: authHeaders() });
+      const res = await fetchAllPages(`${apiRoot}/users/`, { headers: authHeaders() });
       if (!res.ok) throw new Error(t('loadFailed'));
-      const data = await res.json();
-      setUsers(data);
+      setUsers(res.items);
     } catch (err) {
       setMessage(err.message);
     } finally {
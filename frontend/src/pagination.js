@@ -0,0 +1,15 @@
+const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+export async function fetchAllPages(url, options = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const separator = url.includes('?') ? '&' : '?';
+    const pageUrl = cursor ? `${url}${separator}cursor=${encodeURIComponent(cursor)}` : url;
+    const res = await fetch(pageUrl, options);
+    if (!res.ok) return { ok: false, status: res.status, items };
+    items.push(...(await res.json()));
+    cursor = res.headers.get(NEXT_CURSOR_HEADER);
+  } while (cursor);
+  return { ok: true, status: 200, items };
+}
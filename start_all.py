@@ -1,11 +1,28 @@
 #!/usr/bin/env python3
+"""Run the backend and frontend for development, or the backend alone in production.
+
+    python start_all.py                          # uvicorn --reload + Vite dev server
+    python start_all.py --production --workers 8 # supervised worker processes
+
+In production mode the database is initialised once, then N uvicorn
+workers (default: one per core) serve a single listening socket owned by
+this supervisor. Each worker also gets a private loopback socket for health
+checks. A worker that exits or stops answering is replaced with a backoff,
+and SIGHUP replaces them one at a time without dropping connections.
+"""
+import argparse
 import atexit
+import os
 import signal
+import socket
 import subprocess
 import sys
+import tempfile
 import time
 import shutil
 import platform
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
@@ -13,6 +30,18 @@ BACKEND_DIR = ROOT / "backend"
 FRONTEND_DIR = ROOT / "frontend"
 PROCESSES = []
 
+HEALTH_INTERVAL = 5.0
+HEALTH_TIMEOUT = 2.0
+# Consecutive failed checks before a live worker is replaced.
+HEALTH_FAILURES = 3
+# How long a new worker may take to answer its first health check.
+STARTUP_GRACE = 30.0
+# In-flight requests get this long to finish when a worker is stopped.
+GRACEFUL_TIMEOUT = 20.0
+# A worker that dies sooner than this after starting counts as crash-looping.
+MIN_UPTIME = 10.0
+MAX_BACKOFF = 30.0
+
 def resolve_npm():
     candidates = ["npm"]
     if platform.system().lower().startswith("win"):
@@ -52,7 +81,219 @@ def shutdown(*_):
             except subprocess.TimeoutExpired:
                 proc.kill()
 
+class Worker:
+    def __init__(self, slot: int, proc: subprocess.Popen, health_port: int):
+        self.slot = slot
+        self.proc = proc
+        self.health_port = health_port
+        self.started_at = time.monotonic()
+        self.healthy = False
+        self.failures = 0
+        self.stopping = False
+
+    def check(self) -> bool:
+        try:
+            url = f"http://127.0.0.1:{self.health_port}/"
+            with urllib.request.urlopen(url, timeout=HEALTH_TIMEOUT) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def stop(self) -> None:
+        self.stopping = True
+        if self.proc.poll() is None:
+            # uvicorn stops accepting, drains in-flight requests, then exits.
+            self.proc.send_signal(signal.SIGTERM)
+
+    def reap(self, timeout: float) -> None:
+        try:
+            self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class Supervisor:
+    """Keeps ``workers`` uvicorn processes serving one shared listening socket."""
+
+    def __init__(self, workers: int, host: str, port: int):
+        self.size = workers
+        self.listener = socket.create_server((host, port), backlog=2048)
+        self.listener.set_inheritable(True)
+        self.state_dir = tempfile.mkdtemp(prefix="o2w-")
+        self.env = {
+            **os.environ,
+            "DB_PROFILE": os.environ.get("DB_PROFILE", "production"),
+            # Lets every worker see catalog changes made by the others (ETags, live feed);
+            # set it yourself to share it with scripts/import_data.py as well.
+            "CATALOG_VERSION_PATH": os.environ.get("CATALOG_VERSION_PATH")
+            or os.path.join(self.state_dir, "catalog_version"),
+        }
+        self.workers: dict[int, Worker] = {}
+        self.backoff: dict[int, float] = {}
+        self.respawn_at: dict[int, float] = {}
+        self.running = True
+        self.reload_requested = False
+        self.pool = ThreadPoolExecutor(max_workers=max(4, workers))
+
+    def spawn(self, slot: int) -> Worker:
+        health = socket.create_server(("127.0.0.1", 0))
+        health.set_inheritable(True)
+        try:
+            proc = subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "--worker",
+                 str(self.listener.fileno()), str(health.fileno())],
+                cwd=BACKEND_DIR,
+                # One pricing engine per deployment is enough; the others would only repeat its writes.
+                env=self.env if slot == 0 else {**self.env, "PRICING_ENABLED": "0"},
+                pass_fds=(self.listener.fileno(), health.fileno()),
+            )
+            port = health.getsockname()[1]
+        finally:
+            # The worker holds its own copy of the health socket.
+            health.close()
+        print(f"worker {slot}: started pid {proc.pid}")
+        return Worker(slot, proc, port)
+
+    def run(self) -> None:
+        for slot in range(self.size):
+            self.workers[slot] = self.spawn(slot)
+        next_check = time.monotonic() + 1.0
+        while True:
+            time.sleep(0.2)
+            if not self.running:
+                break
+            self.recover()
+            if self.reload_requested:
+                self.reload_requested = False
+                self.rolling_restart()
+            if time.monotonic() >= next_check:
+                self.health_check()
+                next_check = time.monotonic() + HEALTH_INTERVAL
+        self.shutdown()
+
+    def recover(self) -> None:
+        """Replace workers that exited, backing off if one keeps dying on start."""
+        now = time.monotonic()
+        for slot in range(self.size):
+            worker = self.workers.get(slot)
+            if worker is not None:
+                code = worker.proc.poll()
+                if code is None:
+                    continue
+                del self.workers[slot]
+                if now - worker.started_at < MIN_UPTIME and not worker.stopping:
+                    delay = min(MAX_BACKOFF, self.backoff.get(slot, 0.5) * 2)
+                else:
+                    delay = 0.5
+                self.backoff[slot] = delay
+                reason = "was replaced" if worker.stopping else f"exited with {code}"
+                print(f"worker {slot}: pid {worker.proc.pid} {reason}; restarting in {delay:.1f}s")
+                self.respawn_at[slot] = now + delay
+            if now >= self.respawn_at.get(slot, 0.0):
+                self.workers[slot] = self.spawn(slot)
+
+    def health_check(self) -> None:
+        workers = [w for w in self.workers.values() if w.proc.poll() is None and not w.stopping]
+        for worker, ok in zip(workers, self.pool.map(Worker.check, workers)):
+            if ok:
+                worker.healthy = True
+                worker.failures = 0
+                continue
+            worker.failures += 1
+            starting = not worker.healthy and time.monotonic() - worker.started_at < STARTUP_GRACE
+            if not starting and (not worker.healthy or worker.failures >= HEALTH_FAILURES):
+                print(f"worker {worker.slot}: pid {worker.proc.pid} failed health checks; replacing")
+                worker.stop()
+                self.pool.submit(worker.reap, GRACEFUL_TIMEOUT + 5)
+
+    def rolling_restart(self) -> None:
+        """Swap every worker for a fresh one, waiting for each replacement to pass a health check."""
+        print("rolling restart")
+        for slot in range(self.size):
+            old = self.workers.get(slot)
+            new = self.spawn(slot)
+            deadline = time.monotonic() + STARTUP_GRACE
+            while self.running and time.monotonic() < deadline and new.proc.poll() is None and not new.check():
+                time.sleep(0.2)
+            if not self.running or new.proc.poll() is not None or not new.check():
+                print(f"worker {slot}: replacement failed its health check; keeping pid {old.proc.pid if old else '-'}")
+                new.stop()
+                new.reap(GRACEFUL_TIMEOUT)
+                continue
+            new.healthy = True
+            self.workers[slot] = new
+            if old is not None:
+                old.stop()
+                self.pool.submit(old.reap, GRACEFUL_TIMEOUT + 5)
+
+    def shutdown(self) -> None:
+        workers = list(self.workers.values())
+        for worker in workers:
+            worker.stop()
+        for worker in workers:
+            worker.reap(GRACEFUL_TIMEOUT + 5)
+        self.pool.shutdown(wait=True)
+        self.listener.close()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+
+
+def run_worker(listen_fd: int, health_fd: int) -> None:
+    import uvicorn
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    sockets = [socket.socket(fileno=listen_fd), socket.socket(fileno=health_fd)]
+    config = uvicorn.Config("app.main:app", timeout_graceful_shutdown=GRACEFUL_TIMEOUT, access_log=False)
+    uvicorn.Server(config).run(sockets=sockets)
+
+
+def run_production(args) -> None:
+    if platform.system().lower().startswith("win"):
+        # No listening-socket inheritance here; fall back to uvicorn's own worker manager.
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", args.host,
+                   "--port", str(args.port), "--workers", str(args.workers)]
+        subprocess.run(command, cwd=BACKEND_DIR, check=False)
+        return
+
+    supervisor = Supervisor(args.workers, args.host, args.port)
+
+    def stop(*_):
+        supervisor.running = False
+
+    def reload(*_):
+        supervisor.reload_requested = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGHUP, reload)
+    print(f"Backend: http://{args.host}:{args.port} ({args.workers} workers, supervisor pid {os.getpid()})")
+    print("Send SIGHUP for a rolling restart. Serve the frontend from `npm run build` output.")
+    supervisor.run()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--production", action="store_true", help="run supervised backend workers without reload")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    return parser.parse_args()
+
+
 def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        run_worker(int(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    args = parse_args()
+    if args.production:
+        if not BACKEND_DIR.exists():
+            raise FileNotFoundError(f"Missing required folders: {BACKEND_DIR}")
+        # Migrations and the admin account are handled here, once, before any worker starts.
+        ensure_db()
+        run_production(args)
+        return
+
     check_paths()
     ensure_db()
     